@@ -6,72 +6,24 @@ against ground truth with detailed analysis and visualizations.
 """
 
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from difflib import SequenceMatcher
 from pathlib import Path
 import json
 
+from llm_orchestration_hw6.evaluation.aggregate import DEFAULT_DOMAINS, aggregate, to_long
+from llm_orchestration_hw6.evaluation.grading import grade_matrix
+from llm_orchestration_hw6.evaluation.plot_results import figure_specs, render_figures
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
 TECHNIQUES = ['Baseline', 'FewShot', 'CoT', 'ReACT']
 MODELS = ['GPT', 'Grok', 'Perplexity']
-DOMAINS = {
-    'Arithmetic': (1, 7),
-    'Logic': (16, 30),
-    'Linguistics': (31, 44),
-    'Programming': (45, 58),
-    'General_Knowledge': (59, 72),
-    'Design_Lateral': (73, 86),
-    'Applied_Integration': (87, 100)
-}
+DOMAINS = DEFAULT_DOMAINS
 
-GRADING_METHOD = 'fuzzy'  # Options: 'exact', 'fuzzy', 'semantic'
+GRADING_METHOD = 'fuzzy'  # Options: 'exact', 'fuzzy', 'semantic' (see llm_orchestration_hw6.evaluation.grading)
 FUZZY_THRESHOLD = 0.85  # For fuzzy matching (0-1)
 
-# ============================================================================
-# GRADING FUNCTIONS
-# ============================================================================
-
-def exact_match(ground_truth, predicted):
-    """Exact string matching (case-insensitive)."""
-    gt_clean = str(ground_truth).strip().lower()
-    pred_clean = str(predicted).strip().lower()
-    return 1.0 if gt_clean == pred_clean else 0.0
-
-
-def fuzzy_match(ground_truth, predicted, threshold=0.85):
-    """
-    Fuzzy matching using SequenceMatcher.
-    Returns similarity ratio (0-1), 1.0 if above threshold, else scaled partial credit.
-    """
-    gt_clean = str(ground_truth).strip().lower()
-    pred_clean = str(predicted).strip().lower()
-    
-    if gt_clean == pred_clean:
-        return 1.0
-    
-    similarity = SequenceMatcher(None, gt_clean, pred_clean).ratio()
-    
-    if similarity >= threshold:
-        return 1.0  # Full credit
-    elif similarity >= threshold * 0.5:
-        return similarity  # Partial credit (normalized)
-    else:
-        return 0.0  # No credit
-
-
-def semantic_similarity(ground_truth, predicted):
-    """
-    Placeholder for semantic similarity (would use embeddings in production).
-    For now, uses fuzzy match as proxy.
-    """
-    return fuzzy_match(ground_truth, predicted, threshold=0.80)
-
-
 # ============================================================================
 # DATA LOADING & PROCESSING
 # ============================================================================
@@ -93,6 +45,7 @@ def load_data(results_csv_path, ground_truth_path):
 def grade_responses(df_results, ground_truth_dict, method='fuzzy'):
     """
     Grade all model responses against ground truth.
+    Columns are graded as whole arrays by llm_orchestration_hw6.evaluation.grading.
     
     Args:
         df_results: DataFrame with model responses
@@ -103,34 +56,16 @@ def grade_responses(df_results, ground_truth_dict, method='fuzzy'):
         DataFrame with scores for each model-technique combination
     """
     
-    grader = {
-        'exact': exact_match,
-        'fuzzy': lambda gt, pred: fuzzy_match(gt, pred, FUZZY_THRESHOLD),
-        'semantic': semantic_similarity
-    }[method]
+    columns = [f'{model}_{technique}' for model in MODELS for technique in TECHNIQUES]
+    present = [col for col in columns if col in df_results.columns]
+    score_df = grade_matrix(df_results, ground_truth_dict, columns=present, method=method,
+                            threshold=FUZZY_THRESHOLD if method == 'fuzzy' else None)
     
-    # Create scoring dataframe
-    score_df = df_results[['question_id', 'domain']].copy()
-    
-    # Score each model-technique combination
-    for model in MODELS:
-        for technique in TECHNIQUES:
-            col_name = f'{model}_{technique}'
-            scores = []
-            
-            for _, row in df_results.iterrows():
-                q_id = row['question_id']
-                ground_truth = ground_truth_dict.get(q_id, None)
-                predicted = row.get(col_name, None)
-                
-                if ground_truth is None or predicted is None:
-                    score = 0.0
-                else:
-                    score = grader(ground_truth, predicted)
-                
-                scores.append(score)
-            
-            score_df[col_name] = scores
+    # Combinations without a results column score zero, as before
+    for col in columns:
+        if col not in score_df.columns:
+            score_df[col] = 0.0
+    score_df = score_df[[c for c in ('question_id', 'domain') if c in score_df.columns] + columns]
     
     return score_df
 
@@ -139,39 +74,30 @@ def grade_responses(df_results, ground_truth_dict, method='fuzzy'):
 # ANALYSIS FUNCTIONS
 # ============================================================================
 
+def _aggregates(score_df):
+    """Run the package aggregation engine; domains always come from the DOMAINS ranges."""
+    return aggregate(to_long(score_df.drop(columns='domain', errors='ignore')), domains=DOMAINS)
+
+
 def calculate_aggregate_stats(score_df):
     """Calculate accuracy metrics by model, technique, and domain."""
     
-    stats = {}
-    
-    # Overall accuracy by model
-    stats['by_model'] = {}
-    for model in MODELS:
-        model_cols = [col for col in score_df.columns if col.startswith(model)]
-        stats['by_model'][model] = score_df[model_cols].mean().mean()
-    
-    # Overall accuracy by technique
-    stats['by_technique'] = {}
-    for technique in TECHNIQUES:
-        technique_cols = [col for col in score_df.columns if technique in col]
-        stats['by_technique'][technique] = score_df[technique_cols].mean().mean()
-    
-    # Accuracy by domain
-    stats['by_domain'] = {}
-    for domain, (start, end) in DOMAINS.items():
-        domain_df = score_df[score_df['question_id'].between(start, end)]
-        domain_cols = [col for col in domain_df.columns 
-                      if any(model in col for model in MODELS)]
-        stats['by_domain'][domain] = domain_df[domain_cols].mean().mean()
-    
-    # Model-Technique matrix
-    stats['model_technique_matrix'] = {}
-    for model in MODELS:
-        stats['model_technique_matrix'][model] = {}
-        for technique in TECHNIQUES:
-            col_name = f'{model}_{technique}'
-            if col_name in score_df.columns:
-                stats['model_technique_matrix'][model][technique] = score_df[col_name].mean()
+    agg = _aggregates(score_df)
+    
+    def as_dict(frame, key, order):
+        series = frame.set_index(key)['accuracy']
+        return {k: series[k] for k in order if k in series.index}
+    
+    matrix = agg['model_technique']
+    stats = {
+        'by_model': as_dict(agg['by_model'], 'model', MODELS),
+        'by_technique': as_dict(agg['by_technique'], 'technique', TECHNIQUES),
+        'by_domain': as_dict(agg['by_domain'], 'domain', DOMAINS),
+        'model_technique_matrix': {
+            model: as_dict(matrix[matrix['model'] == model], 'technique', TECHNIQUES)
+            for model in MODELS
+        },
+    }
     
     return stats
 
@@ -179,192 +105,32 @@ def calculate_aggregate_stats(score_df):
 def calculate_detailed_metrics(score_df):
     """Calculate detailed metrics for each model-technique combination."""
     
-    metrics = []
-    
-    for model in MODELS:
-        for technique in TECHNIQUES:
-            col_name = f'{model}_{technique}'
-            if col_name in score_df.columns:
-                scores = score_df[col_name]
-                metrics.append({
-                    'Model': model,
-                    'Technique': technique,
-                    'Accuracy': scores.mean(),
-                    'Std_Dev': scores.std(),
-                    'Min': scores.min(),
-                    'Max': scores.max(),
-                    'Median': scores.median(),
-                    'Total_Questions': len(scores)
-                })
-    
-    return pd.DataFrame(metrics)
+    detailed = _aggregates(score_df)['detailed'].rename(columns={
+        'model': 'Model', 'technique': 'Technique', 'accuracy': 'Accuracy', 'std_dev': 'Std_Dev',
+        'min': 'Min', 'max': 'Max', 'median': 'Median', 'questions': 'Total_Questions'
+    })
+    return _in_config_order(detailed)
 
 
 def domain_performance(score_df):
     """Calculate accuracy by domain for each model-technique combo."""
     
-    results = []
-    
-    for domain, (start, end) in DOMAINS.items():
-        domain_df = score_df[score_df['question_id'].between(start, end)]
-        
-        for model in MODELS:
-            for technique in TECHNIQUES:
-                col_name = f'{model}_{technique}'
-                if col_name in domain_df.columns:
-                    accuracy = domain_df[col_name].mean()
-                    results.append({
-                        'Domain': domain,
-                        'Model': model,
-                        'Technique': technique,
-                        'Accuracy': accuracy
-                    })
-    
-    return pd.DataFrame(results)
-
-
-# ============================================================================
-# VISUALIZATION FUNCTIONS
-# ============================================================================
-
-def plot_accuracy_by_technique(stats):
-    """Plot 1: Accuracy comparison by technique (bar chart)."""
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    techniques = list(stats['by_technique'].keys())
-    accuracies = list(stats['by_technique'].values())
-    
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
-    bars = ax.bar(techniques, accuracies, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
-    
-    ax.set_ylabel('Accuracy', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Technique', fontsize=12, fontweight='bold')
-    ax.set_title('Overall Accuracy by Technique\n(All Models & Domains)', 
-                 fontsize=14, fontweight='bold')
-    ax.set_ylim([0, 1.0])
-    ax.grid(axis='y', alpha=0.3)
-    
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.2%}', ha='center', va='bottom', fontweight='bold')
-    
-    plt.tight_layout()
-    return fig
-
-
-def plot_accuracy_by_model(stats):
-    """Plot 2: Accuracy comparison by model (bar chart)."""
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    models = list(stats['by_model'].keys())
-    accuracies = list(stats['by_model'].values())
-    
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
-    bars = ax.bar(models, accuracies, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
-    
-    ax.set_ylabel('Accuracy', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Model', fontsize=12, fontweight='bold')
-    ax.set_title('Overall Accuracy by Model\n(All Techniques & Domains)', 
-                 fontsize=14, fontweight='bold')
-    ax.set_ylim([0, 1.0])
-    ax.grid(axis='y', alpha=0.3)
-    
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.2%}', ha='center', va='bottom', fontweight='bold')
-    
-    plt.tight_layout()
-    return fig
-
-
-def plot_model_technique_heatmap(stats):
-    """Plot 3: Heatmap of accuracy by model × technique."""
-    
-    # Build matrix from stats
-    matrix_data = []
-    for model in MODELS:
-        row = [stats['model_technique_matrix'][model][tech] 
-               for tech in TECHNIQUES]
-        matrix_data.append(row)
-    
-    matrix = np.array(matrix_data)
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(matrix, annot=True, fmt='.2%', cmap='RdYlGn', 
-                xticklabels=TECHNIQUES, yticklabels=MODELS,
-                cbar_kws={'label': 'Accuracy'}, ax=ax, linewidths=0.5)
-    
-    ax.set_title('Accuracy: Model × Technique Heatmap', 
-                 fontsize=14, fontweight='bold', pad=20)
-    ax.set_xlabel('Technique', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Model', fontsize=12, fontweight='bold')
-    
-    plt.tight_layout()
-    return fig
+    perf = _aggregates(score_df)['domain_model_technique'].rename(columns={
+        'domain': 'Domain', 'model': 'Model', 'technique': 'Technique', 'accuracy': 'Accuracy'
+    })
+    return _in_config_order(perf[['Domain', 'Model', 'Technique', 'Accuracy']])
 
 
-def plot_domain_performance(domain_perf_df):
-    """Plot 4: Accuracy by domain (grouped bar chart)."""
-    
-    fig, ax = plt.subplots(figsize=(14, 7))
-    
-    domains = list(DOMAINS.keys())
-    x = np.arange(len(domains))
-    width = 0.08
-    
-    colors_by_combo = {}
-    color_idx = 0
-    for model in MODELS:
-        for technique in TECHNIQUES:
-            colors_by_combo[f'{model}_{technique}'] = plt.cm.tab20(color_idx)
-            color_idx += 1
-    
-    for i, model in enumerate(MODELS):
-        for j, technique in enumerate(TECHNIQUES):
-            mask = (domain_perf_df['Model'] == model) & (domain_perf_df['Technique'] == technique)
-            values = domain_perf_df[mask].set_index('Domain').reindex(domains)['Accuracy'].values
-            offset = (i * len(TECHNIQUES) + j - len(MODELS) * len(TECHNIQUES) / 2) * width
-            ax.bar(x + offset, values, width, label=f'{model}-{technique}', alpha=0.8)
-    
-    ax.set_ylabel('Accuracy', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Domain', fontsize=12, fontweight='bold')
-    ax.set_title('Accuracy by Domain (All Model-Technique Combinations)', 
-                 fontsize=14, fontweight='bold')
-    ax.set_xticks(x)
-    ax.set_xticklabels(domains, rotation=45, ha='right')
-    ax.set_ylim([0, 1.0])
-    ax.grid(axis='y', alpha=0.3)
-    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', ncol=1, fontsize=8)
-    
-    plt.tight_layout()
-    return fig
-
-
-def plot_domain_aggregate(domain_perf_df):
-    """Plot 5: Average accuracy by domain (simpler view)."""
-    
-    domain_avg = domain_perf_df.groupby('Domain')['Accuracy'].mean().sort_values(ascending=False)
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    colors = plt.cm.viridis(np.linspace(0, 1, len(domain_avg)))
-    bars = ax.barh(domain_avg.index, domain_avg.values, color=colors, edgecolor='black', linewidth=1.5)
-    
-    ax.set_xlabel('Average Accuracy', fontsize=12, fontweight='bold')
-    ax.set_title('Average Accuracy by Domain\n(Across All Models & Techniques)', 
-                 fontsize=14, fontweight='bold')
-    ax.set_xlim([0, 1.0])
-    ax.grid(axis='x', alpha=0.3)
-    
-    for i, bar in enumerate(bars):
-        width = bar.get_width()
-        ax.text(width, bar.get_y() + bar.get_height()/2.,
-                f'{width:.1%}', ha='left', va='center', fontweight='bold', fontsize=10)
-    
-    plt.tight_layout()
-    return fig
+def _in_config_order(frame):
+    """Keep only configured models/techniques and sort rows in DOMAINS/MODELS/TECHNIQUES order."""
+    orders = {'Domain': list(DOMAINS), 'Model': MODELS, 'Technique': TECHNIQUES}
+    orders = {col: order for col, order in orders.items() if col in frame.columns}
+    frame = frame.astype({col: str for col in orders})
+    for col, order in orders.items():
+        frame = frame[frame[col].isin(order)]
+    keys = {col: frame[col].map({name: i for i, name in enumerate(order)}) for col, order in orders.items()}
+    order_index = pd.DataFrame(keys).sort_values(list(orders)).index
+    return frame.loc[order_index].reset_index(drop=True)
 
 
 # ============================================================================
@@ -440,18 +206,10 @@ def main():
     # Generate visualizations
     print("\n[4/5] Generating visualizations...")
     
-    figs = {
-        'accuracy_by_technique.png': plot_accuracy_by_technique(stats),
-        'accuracy_by_model.png': plot_accuracy_by_model(stats),
-        'model_technique_heatmap.png': plot_model_technique_heatmap(stats),
-        'domain_performance.png': plot_domain_performance(domain_perf),
-        'domain_aggregate.png': plot_domain_aggregate(domain_perf),
-    }
-    
-    for filename, fig in figs.items():
-        fig.savefig(filename, dpi=300, bbox_inches='tight')
-        print(f"  ✓ Saved {filename}")
-        plt.close(fig)
+    # Figures are rendered in parallel and skipped when their input data is unchanged
+    specs = figure_specs(_aggregates(score_df), MODELS, TECHNIQUES, list(DOMAINS))
+    for path, state in render_figures(specs, '.', dpi=300).items():
+        print(f"  ✓ {'Saved' if state == 'rendered' else 'Unchanged'} {Path(path).name}")
     
     # Export results to CSV
     print("\n[5/5] Exporting results...")
@@ -5,6 +5,9 @@ import numpy as np
 import os
 from pathlib import Path
 
+from llm_orchestration_hw6.evaluation.extraction import normalize_numeric
+from llm_orchestration_hw6.evaluation.grading import grade_matrix
+
 # ============================================================================
 # CREATE OUTPUT FOLDER
 # ============================================================================
@@ -43,10 +46,10 @@ print(results_df.head(3))
 # ============================================================================
 
 def clean_answer(answer):
-    """Clean answer for comparison (strip spaces, lowercase)"""
+    """Clean answer for comparison (numbers/units normalized, strip spaces, lowercase)"""
     if pd.isna(answer) or answer is None:
         return ""
-    return str(answer).strip().lower()
+    return normalize_numeric(answer).lower()
 
 print("\n" + "="*80)
 print("GRADING RESPONSES")
@@ -66,30 +69,14 @@ graded = pd.DataFrame({
 # Add ground truth
 graded['ground_truth'] = ground_truth_df['ground_truth_answer'].values
 
-# Grade each model-technique combo
-for col in model_cols:
-    scores = []
-    for idx in range(len(results_df)):
-        pred = clean_answer(results_df[col].iloc[idx])
-        true = clean_answer(graded['ground_truth'].iloc[idx])
-        
-        # IMPROVED MATCHING:
-        # 1. Exact match (with cleaning)
-        # 2. Substring match
-        # 3. Partial word match
-        
-        if pred == true:
-            score = 1.0
-        elif pred in true or true in pred:
-            score = 0.8  # Partial match
-        elif any(word in true for word in pred.split() if len(word) > 2):
-            score = 0.5  # Some words match
-        else:
-            score = 0.0
-        
-        scores.append(score)
-    
-    graded[col] = scores
+# Grade each model-technique combo on whole columns:
+# 1. Exact match (with cleaning)
+# 2. Substring match
+# 3. Partial word match
+cleaned = results_df.copy()
+cleaned[model_cols] = results_df[model_cols].map(clean_answer, na_action='ignore')
+graded[model_cols] = grade_matrix(cleaned, graded['ground_truth'].map(clean_answer, na_action='ignore').values,
+                                  columns=model_cols, method='containment')[model_cols]
 
 print(f"\n✓ Graded all responses")
 
@@ -1,64 +1,22 @@
 import pandas as pd
-import os
+
+from llm_orchestration_hw6.data.ingest import ingest, to_wide
+from llm_orchestration_hw6.data.store import write_results
 
 # ============================================================================
 # CONFIG: CHANGE THESE TO YOUR FILENAMES
 # ============================================================================
 
-# Your 12 input files (change these to YOUR actual filenames)
-GPT_FILES = {
-    'Baseline': 'results/GPT/baseline_prompts_GPT.txt',      # ← Change to your filename
-    'FewShot': 'results/GPT/few_shot_prompts_GPT.txt',        # ← Change to your filename
-    'CoT': 'results/GPT/cot_prompts_GPT.txt',                # ← Change to your filename
-    'ReACT': 'results/GPT/react_prompts_GPT.txt'             # ← Change to your filename
-}
-
-GROK_FILES = {
-    'Baseline': 'results/Grok/baseline_prompts_grok.txt',     # ← Change to your filename
-    'FewShot': 'results/Grok/few_shot_prompts_grok.txt',       # ← Change to your filename
-    'CoT': 'results/Grok/cot_prompts_grok.txt',               # ← Change to your filename
-    'ReACT': 'results/Grok/react_prompts_grok.txt'            # ← Change to your filename
-}
-
-PERPLEXITY_FILES = {
-    'Baseline': 'results/Perplexity/baseline_prompts_perplexity.txt',   # ← Change to your filename
-    'FewShot': 'results/Perplexity/few_shot_prompts_perplexity.txt',     # ← Change to your filename
-    'CoT': 'results/Perplexity/cot_prompts_perplexity.txt',             # ← Change to your filename
-    'ReACT': 'results/Perplexity/react_prompts_perplexity.txt'          # ← Change to your filename
-}
+# Directory with one sub-directory per model holding its 4 technique files
+RESULTS_DIR = 'results'                  # ← Change to your results directory
+RESULTS_STORE = 'outputs/results_store'
+MODELS = ['GPT', 'Grok', 'Perplexity']
+TECHNIQUES = ['Baseline', 'FewShot', 'CoT', 'ReACT']
 
 GROUND_TRUTH_FILE = 'ground_truth_dataset.csv'  # ← Change to your filename
 GROUND_TRUTH_Q_COLUMN = 'question'   # ← Your Q ID column name
 GROUND_TRUTH_A_COLUMN = 'ground_truth_answer'        # ← Your answer column name
 
-RESPONSE_COLUMN = 'answer'               # ← Column with LLM responses
-
-# ============================================================================
-# FUNCTION: Load responses from one file
-# ============================================================================
-
-def load_responses(filepath, response_column='answer'):
-    """Load responses from CSV/JSON/TXT file"""
-    try:
-        if filepath.endswith('.json'):
-            df = pd.read_json(filepath)
-        elif filepath.endswith('.csv'):
-            df = pd.read_csv(filepath)
-        elif filepath.endswith('.txt'):
-            df = pd.read_csv(filepath, sep='\t')
-        else:
-            raise ValueError(f"Unsupported format: {filepath}")
-        
-        # Extract just the response column if it exists
-        if response_column in df.columns:
-            return df[response_column].tolist()
-        else:
-            # If no specific column, take the last column
-            return df.iloc[:, -1].tolist()
-    except Exception as e:
-        print(f"❌ Error loading {filepath}: {e}")
-        return None
-
 # ============================================================================
 # MAIN: Combine all 12 files into results.csv
 # ============================================================================
@@ -67,60 +25,29 @@ print("\n" + "="*80)
 print("BUILDING RESULTS.CSV FROM 12 FILES")
 print("="*80)
 
-# Step 1: Load all 12 files
+# Step 1: Load all 12 files (TXT, CSV and JSON are all supported)
 print("\nLoading responses...")
 
-gpt_data = {}
-grok_data = {}
-perplexity_data = {}
-
-# Load GPT
-for technique, filepath in GPT_FILES.items():
-    print(f"  Loading GPT {technique}... ", end='')
-    responses = load_responses(filepath, RESPONSE_COLUMN)
-    if responses:
-        gpt_data[technique] = responses
-        print(f"✓ ({len(responses)} responses)")
-    else:
-        print("❌ FAILED")
+store = ingest(RESULTS_DIR)
+counts = store.groupby(['model', 'technique'], observed=True).size()
+for model in MODELS:
+    for technique in TECHNIQUES:
+        count = counts.get((model, technique), 0)
+        status = f"✓ ({count} responses)" if count else "❌ FAILED"
+        print(f"  Loading {model} {technique}... {status}")
 
-# Load Grok
-for technique, filepath in GROK_FILES.items():
-    print(f"  Loading Grok {technique}... ", end='')
-    responses = load_responses(filepath, RESPONSE_COLUMN)
-    if responses:
-        grok_data[technique] = responses
-        print(f"✓ ({len(responses)} responses)")
-    else:
-        print("❌ FAILED")
-
-# Load Perplexity
-for technique, filepath in PERPLEXITY_FILES.items():
-    print(f"  Loading Perplexity {technique}... ", end='')
-    responses = load_responses(filepath, RESPONSE_COLUMN)
-    if responses:
-        perplexity_data[technique] = responses
-        print(f"✓ ({len(responses)} responses)")
-    else:
-        print("❌ FAILED")
+# Long, columnar copy partitioned by model/technique (the canonical format)
+write_results(store, RESULTS_STORE)
+print(f"✓ {RESULTS_STORE} written ({len(store)} responses)")
 
 # Step 2: Create results DataFrame
 print("\nCombining into results.csv...")
 
-# Base: question_id and domain
-results = pd.DataFrame({
-    'question_id': range(1, 101),  # 1-100
-    'domain': [''] * 100  # You'll need to fill this manually or keep as empty
-})
-
-# Add all responses
-for technique in ['Baseline', 'FewShot', 'CoT', 'ReACT']:
-    if technique in gpt_data:
-        results[f'GPT_{technique}'] = gpt_data[technique]
-    if technique in grok_data:
-        results[f'Grok_{technique}'] = grok_data[technique]
-    if technique in perplexity_data:
-        results[f'Perplexity_{technique}'] = perplexity_data[technique]
+# question_id 1-100, an empty domain column (fill manually or keep as empty) and
+# one column per model-technique combination
+results = to_wide(store, question_ids=range(1, 101))
+columns = [f'{model}_{technique}' for technique in TECHNIQUES for model in MODELS]
+results = results.reindex(columns=['question_id', 'domain'] + columns)
 
 # Save results.csv
 results.to_csv('results.csv', index=False)
@@ -6,9 +6,11 @@ Helps convert raw model outputs and ground truth into the expected CSV format
 
 import pandas as pd
 import json
-import os
 from pathlib import Path
 
+from llm_orchestration_hw6.data.ingest import read_file, to_wide, validate
+from llm_orchestration_hw6.evaluation.aggregate import assign_domains
+
 # ============================================================================
 # HELPER FUNCTION 1: Build results.csv from separate model files
 # ============================================================================
@@ -37,117 +39,35 @@ def build_results_csv_from_files(
     TECHNIQUES = ['Baseline', 'FewShot', 'CoT', 'ReACT']
     MODELS = ['GPT', 'Grok', 'Perplexity']
     
-    # Default domain mapping (7 domains)
-    if domain_mapping is None:
-        domain_mapping = {}
-        domains_ranges = {
-            'Arithmetic': (1, 7),
-            'Logic': (16, 30),
-            'Linguistics': (31, 44),
-            'Programming': (45, 58),
-            'General_Knowledge': (59, 72),
-            'Design_Lateral': (73, 86),
-            'Applied_Integration': (87, 100)
-        }
-        for domain, (start, end) in domains_ranges.items():
-            for q_id in range(start, end + 1):
-                domain_mapping[q_id] = domain
-    
-    # Initialize results dataframe
-    results = {'question_id': [], 'domain': []}
-    for model in MODELS:
-        for technique in TECHNIQUES:
-            results[f'{model}_{technique}'] = []
-    
-    # Load and parse each model's file
-    model_data = {}
-    
+    # Load and parse each model's file with the shared ingestion readers
     print("[Loading Model Files]")
+    frames = []
+    for model, filepath in zip(MODELS, [gpt_file, grok_file, perplexity_file]):
+        print(f"  Loading {filepath}...")
+        frames.append(read_file(str(filepath), model=model))
+    store = validate(pd.concat(frames, ignore_index=True))
     
-    # Load GPT
-    print(f"  Loading {gpt_file}...")
-    gpt_data = _load_responses(gpt_file, TECHNIQUES)
-    model_data['GPT'] = gpt_data
-    
-    # Load Grok
-    print(f"  Loading {grok_file}...")
-    grok_data = _load_responses(grok_file, TECHNIQUES)
-    model_data['Grok'] = grok_data
-    
-    # Load Perplexity
-    print(f"  Loading {perplexity_file}...")
-    perplexity_data = _load_responses(perplexity_file, TECHNIQUES)
-    model_data['Perplexity'] = perplexity_data
-    
-    # Combine into single dataframe
+    # Combine into single dataframe, one row per question 1-100
     print("\n[Combining Data]")
-    for q_id in range(1, 101):
-        results['question_id'].append(q_id)
-        results['domain'].append(domain_mapping.get(q_id, 'Unknown'))
-        
-        for model in MODELS:
-            for technique in TECHNIQUES:
-                answer = model_data[model].get(q_id, {}).get(technique, '')
-                results[f'{model}_{technique}'].append(answer)
+    df_results = to_wide(store, value='raw', question_ids=range(1, 101))
+    columns = [f'{model}_{technique}' for model in MODELS for technique in TECHNIQUES]
+    df_results = df_results.reindex(columns=['question_id', 'domain'] + columns)
+    df_results[columns] = df_results[columns].fillna('')
+    
+    # Default domain mapping: the 7 benchmark domains
+    if domain_mapping is None:
+        domains = assign_domains(df_results['question_id']).astype(object)
+    else:
+        domains = df_results['question_id'].map(domain_mapping)
+    df_results['domain'] = domains.fillna('Unknown')
     
     # Save to CSV
-    df_results = pd.DataFrame(results)
     df_results.to_csv(output_path, index=False)
     print(f"  ✓ Saved to {output_path}")
     
     return df_results
 
 
-def _load_responses(filepath, techniques):
-    """
-    Parse response file into dict format {question_id: {technique: answer}}
-    Supports JSON, CSV, and TXT formats
-    """
-    
-    filepath = Path(filepath)
-    data = {}
-    
-    if filepath.suffix.lower() == '.json':
-        # JSON format: {"Q1": {"Baseline": "answer", ...}, ...}
-        with open(filepath, 'r') as f:
-            raw = json.load(f)
-        
-        for q_str, techniques_dict in raw.items():
-            q_id = int(q_str.replace('Q', ''))
-            data[q_id] = {}
-            for tech in techniques:
-                data[q_id][tech] = techniques_dict.get(tech, '')
-    
-    elif filepath.suffix.lower() == '.csv':
-        # CSV format: question_id, Baseline, FewShot, CoT, ReACT
-        df = pd.read_csv(filepath)
-        for _, row in df.iterrows():
-            q_id = int(row['question_id'])
-            data[q_id] = {}
-            for tech in techniques:
-                data[q_id][tech] = row.get(tech, '')
-    
-    elif filepath.suffix.lower() == '.txt':
-        # TXT format: Q1_Baseline: answer\nQ1_FewShot: answer\n...
-        with open(filepath, 'r') as f:
-            for line in f:
-                if ':' not in line:
-                    continue
-                label, answer = line.split(':', 1)
-                parts = label.strip().split('_')
-                q_id = int(parts[0].replace('Q', ''))
-                tech = parts[1] if len(parts) > 1 else ''
-                
-                if q_id not in data:
-                    data[q_id] = {}
-                data[q_id][tech] = answer.strip()
-    
-    else:
-        raise ValueError(f"Unsupported file format: {filepath.suffix}")
-    
-    return data
-
-
 # ============================================================================
 # HELPER FUNCTION 2: Build ground_truth.csv from various formats
 # ============================================================================
@@ -1,18 +1,23 @@
+import dataclasses
 import typer
+from typing import List
 from typing_extensions import Annotated
+import datetime
 import os
-import logging.config
-import yaml
-
-# Load logging configuration from file
-config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'logging.yaml')
-with open(config_path, 'r') as f:
-    config = yaml.safe_load(f)
-logging.config.dictConfig(config)
+import logging
+import pandas as pd
 
+from llm_orchestration_hw6.config.logging_setup import setup_logging
+from llm_orchestration_hw6.config.settings import configure, get_settings, parse_overrides
 from llm_orchestration_hw6.__version__ import __version__
+from llm_orchestration_hw6.data.store import is_results_store, write_results
+from llm_orchestration_hw6.evaluation.aggregate import aggregate, load_question_metadata, load_scores, to_long, write_aggregates
+from llm_orchestration_hw6.evaluation.dashboard import load_dashboard_frame, write_dashboard
+from llm_orchestration_hw6.evaluation.metrics.encoders import BucketedEncoder, OnnxEncoder, SentenceTransformerEncoder, compare_encoders
+from llm_orchestration_hw6.evaluation.registry import DEFAULT_REGISTRY_PATH, RunRegistry, config_hash, file_hash, parse_versions
 from llm_orchestration_hw6.evaluation.orchestrator import analyze, generate_prompts
-from llm_orchestration_hw6.evaluation.plot_results import plot_results_function
+from llm_orchestration_hw6.evaluation.stats import summarize
+from llm_orchestration_hw6.evaluation.plot_results import default_output_dir, plot_results_function
 
 app = typer.Typer(help="LLM Agent Orchestration CLI for evaluating prompt engineering techniques.")
 
@@ -33,11 +38,22 @@ def enable_check(
             is_eager=True,
         ),
     ] = False,
+    settings_path: Annotated[str, typer.Option(help="Settings YAML to use instead of the packaged defaults.")] = "",
+    set_: Annotated[
+        List[str],
+        typer.Option("--set", help="Override a setting, e.g. --set evaluation.batch_size=20. Repeatable."),
+    ] = [],
 ):
     """
     Assistant for Software Development.
     """
-    pass
+    try:
+        settings = configure(settings_path or None, parse_overrides(set_))
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(str(e))
+    # Load the logging configuration shipped with the package
+    setup_logging(request_sample_rate=settings.logging.request_sample_rate, use_queue=settings.logging.use_queue)
+    logging.getLogger("llm_orchestration_hw6").setLevel(settings.log_level.upper())
 
 @app.command()
 def analyze_results(
@@ -106,12 +122,147 @@ def run_evaluation(
 
 @app.command()
 def generate_plot(
-    results_path: Annotated[str, typer.Option(help="Path to the evaluation results.")] = "results",
+    results_path: Annotated[str, typer.Option(help="Path to the evaluation results, aggregate CSVs or a Parquet results store.")] = "results",
+    output_dir: Annotated[str, typer.Option(help="Directory to write the figures or dashboard to. Defaults to the results path, or the parent directory of a Parquet results store.")] = "",
+    workers: Annotated[int, typer.Option(help="Number of rendering processes (0 uses every CPU).")] = 0,
+    force: Annotated[bool, typer.Option(help="Redraw figures even if their data is unchanged.")] = False,
+    dashboard: Annotated[bool, typer.Option(help="Write a self-contained dashboard.html of per-question results instead of PNG figures.")] = False,
 ):
     """
     Generate a plot from the analysis results.
     """
-    plot_results_function(results_path)
-    
+    if dashboard:
+        output_dir = output_dir or default_output_dir(results_path)
+        if is_results_store(output_dir):
+            raise typer.BadParameter(f"Refusing to write into the results store {output_dir}.", param_hint="--output-dir")
+        path = write_dashboard(load_dashboard_frame(results_path), os.path.join(output_dir, "dashboard.html"))
+        print(f"Dashboard saved to {path}")
+        return
+    plot_results_function(results_path, output_dir or None, workers or None, force)
+
+@app.command()
+def aggregate_results(
+    scores_path: Annotated[str, typer.Option(help="Path to the graded score table (wide or long CSV, or a Parquet results store).")] = "outputs/graded_scores.csv",
+    output_dir: Annotated[str, typer.Option(help="Directory to write the aggregate CSVs to.")] = "outputs",
+    metadata_path: Annotated[str, typer.Option(help="Optional dataset (CSV/JSON) with per-question difficulty/category.")] = "",
+    with_stats: Annotated[bool, typer.Option(help="Also compute bootstrap CIs and pairwise significance tests.")] = False,
+    registry_path: Annotated[str, typer.Option(help="Record this run in the SQLite run registry at this path (empty to skip).")] = DEFAULT_REGISTRY_PATH,
+    run_label: Annotated[str, typer.Option(help="Label stored with the recorded run.")] = "",
+    versions: Annotated[str, typer.Option(help="Provider/model versions to record, e.g. 'GPT=gpt-4o-2024-08-06,Grok=grok-2'.")] = "",
+    config_path: Annotated[str, typer.Option(help="Configuration file whose hash is recorded with the run. Defaults to the effective settings.")] = "",
+):
+    """
+    Aggregate graded scores by model, technique, domain, difficulty and model x technique.
+    """
+    long_df = load_scores(scores_path)
+    metadata = load_question_metadata(metadata_path) if metadata_path else None
+    results = aggregate(long_df, metadata)
+    if with_stats:
+        results.update({f"stats_{name}": frame for name, frame in summarize(long_df).items()})
+
+    for name, frame in results.items():
+        print(f"\n[{name}]")
+        print(frame.to_string(index=False))
+
+    for path in write_aggregates(results, output_dir):
+        print(f"Saved {path}")
+
+    if registry_path:
+        model_technique = results["model_technique"]
+        if "latency_ms" in long_df.columns:
+            latency = long_df.groupby(["model", "technique"], observed=True)["latency_ms"].mean().reset_index()
+            model_technique = model_technique.merge(latency, on=["model", "technique"], how="left")
+        run_id = RunRegistry(registry_path).record_run(
+            model_technique,
+            config_hash=file_hash(config_path) if config_path else config_hash(dataclasses.asdict(get_settings())),
+            dataset_hash=file_hash(metadata_path) if metadata_path else None,
+            versions={"package": __version__, **parse_versions(versions)},
+            label=run_label or None,
+        )
+        print(f"Recorded run {run_id} in {registry_path}")
+
+@app.command()
+def compare_runs(
+    registry_path: Annotated[str, typer.Option(help="Path to the SQLite run registry.")] = DEFAULT_REGISTRY_PATH,
+    candidate: Annotated[str, typer.Option(help="Run to check. Defaults to the latest run.")] = "",
+    baseline: Annotated[str, typer.Option(help="Reference run. Defaults to the latest run at least --days older than now.")] = "",
+    days: Annotated[int, typer.Option(help="Age of the default reference run in days; falls back to the previous run.")] = 7,
+    accuracy_tolerance: Annotated[float, typer.Option(help="Absolute accuracy drop tolerated before flagging a regression, e.g. 0.02.")] = 0.0,
+    latency_tolerance: Annotated[float, typer.Option(help="Latency increase, as a fraction of the baseline latency, tolerated before flagging a regression, e.g. 0.2.")] = 0.0,
+    fail_on_regression: Annotated[bool, typer.Option(help="Exit with code 1 if any combination regressed.")] = False,
+):
+    """
+    Compare the aggregates of two recorded runs and flag regressions.
+    """
+    registry = RunRegistry(registry_path)
+    candidate = candidate or registry.latest_run()
+    if candidate is None:
+        print(f"No runs recorded in {registry_path}.")
+        raise typer.Exit(code=1)
+    if not baseline:
+        cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)).isoformat(timespec="seconds")
+        baseline = registry.latest_run(before=cutoff, exclude=candidate) or registry.latest_run(exclude=candidate)
+    if baseline is None:
+        print("Only one run is recorded; nothing to compare against.")
+        raise typer.Exit(code=1)
+
+    comparison = registry.compare(baseline, candidate, accuracy_tolerance, latency_tolerance)
+    print(f"Baseline run:  {baseline}")
+    print(f"Candidate run: {candidate}\n")
+    print(comparison.to_string(index=False))
+    regressed = comparison[comparison["regressed"]]
+    if regressed.empty:
+        print("\nNo regressions.")
+        return
+    print(f"\n{len(regressed)} combination(s) regressed:")
+    for row in regressed.itertuples():
+        latency = "" if pd.isna(row.latency_delta) else f", latency {row.latency_delta:+.0f} ms"
+        print(f"  - {row.model} {row.technique}: accuracy {row.accuracy_delta:+.3f}{latency}")
+    if fail_on_regression:
+        raise typer.Exit(code=1)
+
+@app.command()
+def convert_results(
+    results_path: Annotated[str, typer.Option(help="Path to a wide results or score CSV (one Model_Technique column per combination).")] = "results.csv",
+    output_dir: Annotated[str, typer.Option(help="Directory of the partitioned Parquet results store.")] = "outputs/results_store",
+    value_name: Annotated[str, typer.Option(help="Name of the value column in the store, e.g. 'extracted' or 'score'.")] = "extracted",
+):
+    """
+    Convert a wide results CSV into the long Parquet store partitioned by model and technique.
+    """
+    wide = pd.read_csv(results_path, dtype={"domain": str})
+    long_df = to_long(wide, value_name=value_name)
+    write_results(long_df, output_dir)
+    combinations = long_df.groupby(["model", "technique"], observed=True).ngroups
+    print(f"Saved {len(long_df)} rows ({combinations} model-technique partitions) to {output_dir}")
+
+@app.command()
+def check_encoder(
+    dataset_path: Annotated[str, typer.Option(help="CSV whose questions and ground truth answers are the sample texts.")] = "ground_truth_dataset.csv",
+    limit: Annotated[int, typer.Option(help="Maximum number of sample texts.")] = 500,
+    quantize: Annotated[bool, typer.Option(help="Check the int8 quantized ONNX model.")] = True,
+    threads: Annotated[int, typer.Option(help="ONNX Runtime intra-op threads (0 uses the settings).")] = 0,
+    min_agreement: Annotated[float, typer.Option(help="Share of similarity decisions that must match the PyTorch backend.")] = 0.99,
+):
+    """
+    Check the ONNX encoder backend against the PyTorch one for accuracy and speed.
+    """
+    df = pd.read_csv(dataset_path)
+    texts = pd.concat([df["question"], df["ground_truth_answer"]]).dropna().astype(str).tolist()[:limit]
+    reference = BucketedEncoder(SentenceTransformerEncoder(get_settings().encoder.model))
+    candidate = BucketedEncoder(OnnxEncoder(quantize=quantize, intra_op_threads=threads or None))
+    for name, encoder in (("torch", reference), ("onnx", candidate)):
+        encoder.load()
+        encoder.encode(texts)
+        stats = encoder.last_stats
+        print(f"{name:>5}: {stats['texts']} texts in {stats['seconds']:.2f}s ({stats['tokens_per_second']:.0f} tokens/s)")
+
+    report = compare_encoders(reference, candidate, texts)
+    for key, value in report.items():
+        print(f"{key}: {value:.4f}")
+    if report["decision_agreement"] < min_agreement:
+        print(f"Decision agreement is below {min_agreement}.")
+        raise typer.Exit(code=1)
+
 if __name__ == "__main__":
     app()
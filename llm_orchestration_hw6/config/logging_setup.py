@@ -0,0 +1,129 @@
+import atexit
+import itertools
+import json
+import logging
+import logging.config
+import logging.handlers
+import queue
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from llm_orchestration_hw6.config.settings import packaged_config
+
+# Per-request records (one per result, request or sample) go to this logger, which is
+# sampled; everything else is logged in full.
+REQUEST_LOGGER = "llm_orchestration_hw6.requests"
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line, including the fields passed through
+    ``extra=`` so per-request records stay machine-readable.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a deterministic fraction of records below WARNING; warnings and errors always pass.
+    """
+
+    def __init__(self, rate: float = 1.0, name: str = ""):
+        """
+        Initializes the filter.
+
+        Args:
+            rate: The fraction of records to keep, between 0 and 1.
+            name: Passed to ``logging.Filter``.
+        """
+        super().__init__(name)
+        self.rate = min(max(float(rate), 0.0), 1.0)
+        self._counter = itertools.count(1)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        n = next(self._counter)
+        # Keeps records 1/rate apart: with rate 0.1, the 10th, 20th, 30th, ...
+        return int(n * self.rate) != int((n - 1) * self.rate)
+
+
+def _install_queue(logger: logging.Logger, log_queue: queue.SimpleQueue) -> List[logging.Handler]:
+    handlers = list(logger.handlers)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    if handlers:
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return handlers
+
+
+def stop_logging():
+    """
+    Stops the background listener, flushing every queued record. Registered with atexit.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(
+    config: Optional[Dict[str, Any]] = None,
+    request_sample_rate: Optional[float] = None,
+    use_queue: bool = True,
+) -> Optional[logging.handlers.QueueListener]:
+    """
+    Configures logging from the packaged logging.yaml.
+
+    With ``use_queue`` the configured handlers are moved behind a single
+    ``QueueHandler``: worker threads only enqueue records, and a background
+    ``QueueListener`` formats and writes them to the console and log file.
+
+    Args:
+        config: A ``logging.config.dictConfig`` mapping. Defaults to the packaged logging.yaml.
+        request_sample_rate: Overrides the fraction of per-request records that are kept.
+        use_queue: Write records from a background thread.
+
+    Returns:
+        The started listener, or None when ``use_queue`` is False.
+    """
+    global _listener
+    stop_logging()
+    logging.config.dictConfig(config or yaml.safe_load(packaged_config("logging.yaml")))
+    if request_sample_rate is not None:
+        request_logger = logging.getLogger(REQUEST_LOGGER)
+        for existing in [f for f in request_logger.filters if isinstance(f, SamplingFilter)]:
+            request_logger.removeFilter(existing)
+        request_logger.addFilter(SamplingFilter(request_sample_rate))
+    if not use_queue:
+        return None
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handlers: List[logging.Handler] = []
+    for logger in (logging.getLogger(), logging.getLogger("llm_orchestration_hw6")):
+        handlers += [h for h in _install_queue(logger, log_queue) if h not in handlers]
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,261 @@
+import dataclasses
+import functools
+import os
+import typing
+from importlib import resources
+from typing import Any, Dict, List, Mapping, Optional
+
+import yaml
+
+# Environment overrides use this prefix and "__" between keys:
+# LLM_HW6__EVALUATION__BATCH_SIZE=20 sets evaluation.batch_size.
+ENV_PREFIX = "LLM_HW6__"
+# Points the loader at a settings file other than the packaged default.
+SETTINGS_PATH_ENV = "LLM_HW6_SETTINGS"
+
+
+@dataclasses.dataclass(frozen=True)
+class ProviderSettings:
+    base_url: str = ""
+    default_model: str = ""
+    default_temperature: float = 0.1
+    default_max_tokens: int = 500
+    timeout_seconds: float = 60
+    api_key_env_var: Optional[str] = None
+    max_concurrency: int = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class OllamaSettings(ProviderSettings):
+    keep_alive: str = "5m"
+    preload: bool = False
+
+
+@dataclasses.dataclass(frozen=True)
+class MockSettings:
+    response_delay_seconds: float = 0.1
+    default_response: str = "This is a mock LLM response."
+
+
+@dataclasses.dataclass(frozen=True)
+class EvaluationSettings:
+    batch_size: int = 10
+    num_retries: int = 3
+    retry_delay_seconds: float = 5
+    metrics: List[str] = dataclasses.field(default_factory=lambda: ["accuracy"])
+    temperature_for_consistency: float = 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class PromptTemplateSettings:
+    base_dir: str = ""
+    baseline_template: str = "baseline.txt"
+    cot_template: str = "cot.txt"
+    fewshot_template: str = "fewshot.txt"
+
+
+@dataclasses.dataclass(frozen=True)
+class PlottingSettings:
+    output_format: str = "png"
+    dpi: int = 300
+    figsize: List[float] = dataclasses.field(default_factory=lambda: [12, 8])
+    color_palette: str = "viridis"
+
+
+@dataclasses.dataclass(frozen=True)
+class PerformanceSettings:
+    max_workers: Optional[int] = None
+    process_workers: Optional[int] = None
+    extraction_chunk_size: int = 50_000
+    grading_chunk_rows: int = 100_000
+    bootstrap_resamples: int = 10_000
+
+
+@dataclasses.dataclass(frozen=True)
+class ResilienceSettings:
+    error_threshold: float = 0.5
+    window: int = 20
+    min_requests: int = 5
+    reset_timeout_seconds: float = 30
+    bulkhead_size: int = 8
+    bulkhead_wait_seconds: float = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class EncoderSettings:
+    backend: str = "torch"
+    model: str = "all-MiniLM-L6-v2"
+    onnx_dir: Optional[str] = None
+    quantize: bool = True
+    intra_op_threads: Optional[int] = None
+    max_length: int = 256
+    max_batch_tokens: int = 16_384
+    max_batch_size: int = 256
+
+
+@dataclasses.dataclass(frozen=True)
+class SemanticCacheSettings:
+    encoder: str = "all-MiniLM-L6-v2"
+    threshold: float = 0.95
+    max_entries: int = 100_000
+    audit_rate: float = 0.05
+
+
+@dataclasses.dataclass(frozen=True)
+class LoggingSettings:
+    use_queue: bool = True
+    request_sample_rate: Optional[float] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class Settings:
+    """
+    Typed view of settings.yaml. Every section is a frozen dataclass, so a loaded
+    configuration can be shared freely between threads.
+    """
+
+    app_name: str = "LLM Agent Orchestration Framework"
+    version: str = "0.1.0"
+    cache_dir: str = "cache/"
+    log_level: str = "INFO"
+    default_llm_provider: str = "ollama"
+    ollama: OllamaSettings = dataclasses.field(default_factory=OllamaSettings)
+    openai: ProviderSettings = dataclasses.field(default_factory=ProviderSettings)
+    openai_compatible: ProviderSettings = dataclasses.field(default_factory=ProviderSettings)
+    gemini: ProviderSettings = dataclasses.field(default_factory=ProviderSettings)
+    mock: MockSettings = dataclasses.field(default_factory=MockSettings)
+    data_path: str = "data/ground_truth_dataset.csv"
+    results_dir: str = "results/"
+    evaluation: EvaluationSettings = dataclasses.field(default_factory=EvaluationSettings)
+    prompt_templates: PromptTemplateSettings = dataclasses.field(default_factory=PromptTemplateSettings)
+    plotting: PlottingSettings = dataclasses.field(default_factory=PlottingSettings)
+    performance: PerformanceSettings = dataclasses.field(default_factory=PerformanceSettings)
+    resilience: ResilienceSettings = dataclasses.field(default_factory=ResilienceSettings)
+    encoder: EncoderSettings = dataclasses.field(default_factory=EncoderSettings)
+    semantic_cache: SemanticCacheSettings = dataclasses.field(default_factory=SemanticCacheSettings)
+    logging: LoggingSettings = dataclasses.field(default_factory=LoggingSettings)
+
+
+def packaged_config(name: str) -> str:
+    """
+    Reads a configuration file shipped inside the installed package (e.g. "logging.yaml").
+    """
+    return resources.files("llm_orchestration_hw6.config").joinpath(name).read_text(encoding="utf-8")
+
+
+def _set_path(data: Dict[str, Any], keys: List[str], value: Any):
+    for key in keys[:-1]:
+        data = data.setdefault(key, {})
+    data[keys[-1]] = value
+
+
+def _env_overrides(environ: Mapping[str, str]) -> Dict[str, Any]:
+    overrides = {}
+    for name, raw in environ.items():
+        if name.startswith(ENV_PREFIX):
+            key = ".".join(part.lower() for part in name[len(ENV_PREFIX):].split("__"))
+            overrides[key] = raw
+    return overrides
+
+
+def _coerce(value: Any, hint: Any) -> Any:
+    # Override values arrive as strings; YAML parsing turns "20", "0.5", "null" and
+    # "[1, 2]" into the matching Python values.
+    if isinstance(value, str) and hint is not str:
+        value = yaml.safe_load(value)
+    args = [a for a in typing.get_args(hint) if a is not type(None)]
+    target = args[0] if typing.get_origin(hint) is typing.Union and len(args) == 1 else hint
+    if value is None or target in (Any,) or typing.get_origin(target) is not None:
+        return value
+    if target is float and isinstance(value, int):
+        return float(value)
+    if target in (int, float, str, bool) and not isinstance(value, target):
+        raise ValueError(f"Expected {target.__name__}, got {value!r}")
+    return value
+
+
+def _build(cls, data: Mapping[str, Any], prefix: str = ""):
+    hints = typing.get_type_hints(cls)
+    names = {f.name for f in dataclasses.fields(cls)}
+    unknown = set(data) - names
+    if unknown:
+        raise ValueError(f"Unknown setting(s): {', '.join(prefix + k for k in sorted(unknown))}")
+    values = {}
+    for name, value in data.items():
+        hint = hints[name]
+        if dataclasses.is_dataclass(hint):
+            values[name] = _build(hint, value or {}, f"{prefix}{name}.")
+        else:
+            try:
+                values[name] = _coerce(value, hint)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for {prefix}{name}: {e}") from None
+    return cls(**values)
+
+
+def load_settings(
+    path: Optional[str] = None,
+    overrides: Optional[Mapping[str, Any]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> Settings:
+    """
+    Loads settings from YAML and applies overrides.
+
+    Precedence, lowest to highest: the packaged settings.yaml (or ``path``), environment
+    variables (``LLM_HW6__SECTION__KEY``), then ``overrides``.
+
+    Args:
+        path: A settings file to use instead of the packaged default.
+        overrides: {"section.key": value} overrides, e.g. from the command line.
+        environ: The environment to read overrides from. Defaults to ``os.environ``.
+
+    Returns:
+        The validated settings.
+    """
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(SETTINGS_PATH_ENV)
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+    else:
+        data = yaml.safe_load(packaged_config("settings.yaml")) or {}
+
+    for key, value in {**_env_overrides(environ), **(overrides or {})}.items():
+        _set_path(data, key.split("."), value)
+    return _build(Settings, data)
+
+
+_cli_path: Optional[str] = None
+_cli_overrides: Dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Returns the process-wide settings, parsed once and memoized.
+    """
+    return load_settings(_cli_path, _cli_overrides)
+
+
+def configure(path: Optional[str] = None, overrides: Optional[Mapping[str, Any]] = None) -> Settings:
+    """
+    Sets the settings file and overrides used by ``get_settings`` (e.g. from CLI options)
+    and reloads the memoized settings.
+    """
+    global _cli_path, _cli_overrides
+    _cli_path, _cli_overrides = path, dict(overrides or {})
+    get_settings.cache_clear()
+    return get_settings()
+
+
+def parse_overrides(items: List[str]) -> Dict[str, str]:
+    """
+    Parses ["evaluation.batch_size=20", ...] into {"evaluation.batch_size": "20"}.
+    """
+    overrides = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected KEY=VALUE, got '{item}'")
+        overrides[key.strip()] = value.strip()
+    return overrides
@@ -0,0 +1,248 @@
+import concurrent.futures
+import glob
+import json
+import os
+import re
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from llm_orchestration_hw6.config.settings import get_settings
+from llm_orchestration_hw6.evaluation.extraction import extract, extract_many
+
+CANONICAL_COLUMNS = ["question_id", "model", "technique", "raw", "extracted"]
+
+# Technique names as they appear in file names, mapped to the names used in results.csv.
+TECHNIQUE_ALIASES = {
+    "baseline": "Baseline",
+    "few_shot": "FewShot",
+    "fewshot": "FewShot",
+    "cot": "CoT",
+    "react": "ReACT",
+}
+
+Reader = Callable[[str], Iterator[Dict]]
+READERS: Dict[str, Reader] = {}
+
+_BLOCK_MARKER = re.compile(r"^\s*-+\s*Prompt for Question\s+(\d+)\s*-+\s*$", re.IGNORECASE)
+_NUMBERED = re.compile(r"^\s*[-*]?\s*(?:Q|A)?(\d+)\s*[.):]\s*(.*)$", re.IGNORECASE)
+_LABELED = re.compile(r"^\s*Q(\d+)_(\w+)\s*:\s*(.*)$", re.IGNORECASE)
+
+
+def register_reader(*suffixes: str):
+    """
+    Registers a reader for one or more file suffixes (e.g. ".txt").
+
+    A reader takes a file path and yields dicts with ``question_id`` and ``raw`` and,
+    optionally, ``technique`` or ``model`` when the file itself labels them.
+    """
+    def decorator(func: Reader) -> Reader:
+        for suffix in suffixes:
+            READERS[suffix.lower()] = func
+        return func
+    return decorator
+
+
+def extract_answer(raw: str, technique: Optional[str] = None, model: Optional[str] = None) -> str:
+    """
+    Pulls the answer out of a raw response segment with the shared extraction engine.
+    """
+    return extract(raw, technique, model)[0]
+
+
+def _segments(lines: List[str]) -> Iterator[Dict]:
+    # Files with "----- Prompt for Question N -----" blocks are split on those markers only,
+    # so numbered reasoning steps inside a block do not start a new question.
+    use_markers = any(_BLOCK_MARKER.match(line) for line in lines)
+    question_id, current = None, []
+    for line in lines:
+        marker = _BLOCK_MARKER.match(line) if use_markers else _NUMBERED.match(line)
+        if marker and int(marker.group(1)) != question_id:
+            if question_id is not None:
+                yield {"question_id": question_id, "raw": "\n".join(current).strip()}
+            question_id, current = int(marker.group(1)), []
+            if use_markers:
+                continue
+        if question_id is not None and line.strip():
+            current.append(line.rstrip())
+    if question_id is not None:
+        yield {"question_id": question_id, "raw": "\n".join(current).strip()}
+
+
+@register_reader(".txt")
+def read_text(file_path: str) -> Iterator[Dict]:
+    """
+    Reads free-form response files: numbered answers, Q<n>/A<n> pairs, "Prompt for
+    Question N" blocks, or "Q<n>_<Technique>: answer" lines.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    labeled = [_LABELED.match(line) for line in lines]
+    if any(labeled):
+        for match in filter(None, labeled):
+            yield {"question_id": int(match.group(1)), "technique": match.group(2), "raw": match.group(3).strip()}
+        return
+    yield from _segments(lines)
+
+
+@register_reader(".csv")
+def read_csv(file_path: str) -> Iterator[Dict]:
+    """
+    Reads CSV responses: either question_id plus one column per technique, or a single
+    answer/response column (the last column if neither name is present).
+    """
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    ids = pd.to_numeric(df["question_id"]) if "question_id" in df.columns else pd.Series(range(1, len(df) + 1))
+    techniques = [c for c in df.columns if c.lower() in TECHNIQUE_ALIASES or c in TECHNIQUE_ALIASES.values()]
+    if techniques:
+        long_df = df.assign(question_id=ids).melt(id_vars="question_id", value_vars=techniques,
+                                                   var_name="technique", value_name="raw")
+        yield from long_df.to_dict("records")
+        return
+    column = next((c for c in ("answer", "response") if c in df.columns), df.columns[-1])
+    for question_id, raw in zip(ids, df[column]):
+        yield {"question_id": int(question_id), "raw": raw}
+
+
+@register_reader(".json")
+def read_json(file_path: str) -> Iterator[Dict]:
+    """
+    Reads JSON responses: {"Q1": {"Baseline": "...", ...}}, {"Q1": "..."} or a list of
+    records with question_id/id and answer/response.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        for key, value in data.items():
+            question_id = int(str(key).lstrip("Qq"))
+            if isinstance(value, dict):
+                for technique, raw in value.items():
+                    yield {"question_id": question_id, "technique": technique, "raw": raw}
+            else:
+                yield {"question_id": question_id, "raw": value}
+        return
+    for i, record in enumerate(data, start=1):
+        question_id = record.get("question_id", record.get("id", i))
+        yield {"question_id": int(question_id), "raw": record.get("answer", record.get("response", ""))}
+
+
+def infer_labels(file_path: str) -> Dict[str, Optional[str]]:
+    """
+    Infers model and technique from a ``<results>/<Model>/<technique>_prompts_<model>.txt`` path.
+    """
+    model = os.path.basename(os.path.dirname(os.path.abspath(file_path))) or None
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    technique = stem.split("_prompts")[0] if "_prompts" in stem else None
+    return {"model": model, "technique": technique}
+
+
+def canonical_technique(name: str) -> str:
+    return TECHNIQUE_ALIASES.get(str(name).lower(), name)
+
+
+def read_file(file_path: str, model: Optional[str] = None, technique: Optional[str] = None) -> pd.DataFrame:
+    """
+    Reads one response file into canonical long-format records.
+
+    Args:
+        file_path: The file to read.
+        model: Model label; inferred from the parent directory when omitted.
+        technique: Technique label; taken from the file contents or name when omitted.
+
+    Returns:
+        A frame with the canonical columns plus the extraction ``rule`` that fired
+        (not yet validated).
+    """
+    suffix = os.path.splitext(file_path)[1].lower()
+    reader = READERS.get(suffix)
+    if reader is None:
+        raise ValueError(f"Unsupported file format: {suffix}")
+    labels = infer_labels(file_path)
+    records = pd.DataFrame(list(reader(file_path)), columns=["question_id", "raw", "technique", "model"])
+    records["model"] = model or records["model"].where(records["model"].notna(), labels["model"])
+    records["technique"] = technique or records["technique"].where(records["technique"].notna(), labels["technique"])
+    records["raw"] = records["raw"].fillna("").astype(str)
+    records["extracted"], records["rule"] = "", ""
+    for (tech, model_name), group in records.groupby(["technique", "model"], dropna=False):
+        extracted = extract_many(group["raw"], tech, model_name, max_workers=1)
+        records.loc[group.index, ["extracted", "rule"]] = extracted.to_numpy()
+    return records[CANONICAL_COLUMNS + ["rule"]]
+
+
+def validate(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Checks the canonical schema once for the whole store and normalizes dtypes.
+
+    Rows without a model or technique are rejected, technique names are canonicalized,
+    and duplicate (model, technique, question_id) rows keep their first occurrence.
+    """
+    missing = set(CANONICAL_COLUMNS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Response store is missing columns: {sorted(missing)}")
+    unlabeled = df["model"].isna() | df["technique"].isna()
+    if unlabeled.any():
+        raise ValueError(f"{int(unlabeled.sum())} responses have no model or technique label.")
+    df = df.assign(
+        question_id=pd.to_numeric(df["question_id"]).astype("int64"),
+        model=df["model"].astype(str).astype("category"),
+        technique=df["technique"].map(canonical_technique).astype("category"),
+    )
+    df = df.drop_duplicates(subset=["model", "technique", "question_id"], keep="first")
+    return df.sort_values(["model", "technique", "question_id"], ignore_index=True)
+
+
+def discover(root: str, patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    Finds response files under ``root`` for every registered reader. By default only the
+    per-model sub-directories (``<root>/<Model>/*``) are searched.
+    """
+    patterns = patterns or [f"*/*{suffix}" for suffix in READERS]
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(os.path.join(root, pattern), recursive=True))
+    return sorted(p for p in paths if os.path.splitext(p)[1].lower() in READERS)
+
+
+def ingest(root: str, patterns: Optional[List[str]] = None, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Discovers and reads every response file under ``root`` in parallel into one
+    validated long-format store (question_id, model, technique, raw, extracted).
+
+    Args:
+        root: The results directory, e.g. "results" with one sub-directory per model.
+        patterns: Glob patterns relative to ``root``. Defaults to every registered suffix.
+        max_workers: The number of reader threads. Defaults to ``performance.max_workers``.
+
+    Returns:
+        The validated response store.
+    """
+    paths = discover(root, patterns)
+    if not paths:
+        return pd.DataFrame(columns=CANONICAL_COLUMNS)
+    max_workers = max_workers or get_settings().performance.max_workers
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(read_file, paths))
+    return validate(pd.concat(frames, ignore_index=True))
+
+
+def to_wide(store: pd.DataFrame, value: str = "extracted", question_ids: Optional[range] = None) -> pd.DataFrame:
+    """
+    Pivots the long store into the wide results.csv layout (one ``<Model>_<Technique>``
+    column per combination).
+
+    Args:
+        store: The validated response store.
+        value: The store column to place in the cells ("extracted" or "raw").
+        question_ids: The question ids to include as rows. Defaults to the ids in the store.
+
+    Returns:
+        A frame with question_id, domain and one column per combination.
+    """
+    wide = store.assign(combination=store["model"].astype(str) + "_" + store["technique"].astype(str)).pivot(
+        index="question_id", columns="combination", values=value
+    )
+    if question_ids is not None:
+        wide = wide.reindex(list(question_ids))
+    wide.columns.name = None
+    wide.insert(0, "domain", "")
+    return wide.reset_index()
@@ -1,15 +1,51 @@
 import pandas as pd
-from typing import List, Dict
+from typing import Any, List, Dict, Tuple
 
-def load_dataset(file_path: str) -> List[Dict]:
+def question_text(question: Any, key: str = "question") -> str:
+    """
+    Returns the text of a question given as a string or as a dataset row, with runs of
+    whitespace collapsed so formatting differences do not hide duplicates.
+    """
+    text = question.get(key, "") if isinstance(question, dict) else question
+    return " ".join(str(text).split())
+
+def dedupe_questions(questions: List[Any], key: str = "question") -> Tuple[List[Any], List[int]]:
+    """
+    Drops exact duplicate questions, keeping the first occurrence.
+
+    Args:
+        questions: Question strings or dataset rows.
+        key: The field holding the question text when rows are dictionaries.
+
+    Returns:
+        (unique questions in first-seen order, for every input question the position of
+        its unique question). ``[results[i] for i in positions]`` fans results for the
+        unique questions back out to the input order.
+    """
+    seen: Dict[str, int] = {}
+    unique: List[Any] = []
+    positions: List[int] = []
+    for question in questions:
+        text = question_text(question, key)
+        if text not in seen:
+            seen[text] = len(unique)
+            unique.append(question)
+        positions.append(seen[text])
+    return unique, positions
+
+def load_dataset(file_path: str, dedupe: bool = False) -> List[Dict]:
     """
     Loads the ground truth dataset from a CSV file.
 
     Args:
         file_path: The path to the CSV file.
+        dedupe: Drop rows whose question repeats an earlier row.
 
     Returns:
         A list of dictionaries, where each dictionary represents a question.
     """
     df = pd.read_csv(file_path)
-    return df.to_dict('records')
+    records = df.to_dict('records')
+    if dedupe:
+        records, _ = dedupe_questions(records)
+    return records
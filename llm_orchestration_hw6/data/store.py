@@ -0,0 +1,112 @@
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# The long results layout is partitioned into <root>/model=<Model>/technique=<Technique>/.
+PARTITION_COLUMNS = ["model", "technique"]
+# Low-cardinality columns stored as pandas categoricals (Parquet dictionary columns).
+CATEGORICAL_COLUMNS = ["model", "technique", "domain", "difficulty", "category", "rule"]
+
+
+def write_results(df: pd.DataFrame, root: str, partition_cols: Optional[List[str]] = None) -> str:
+    """
+    Writes long-format results to a Parquet dataset partitioned by model and technique.
+
+    Partitions present in ``df`` are replaced; other partitions already under ``root``
+    are kept, so new models or techniques can be added without rewriting the store.
+
+    Args:
+        df: Long results with question_id, model, technique and any value columns.
+        root: The dataset directory.
+        partition_cols: The partition columns. Defaults to model and technique.
+
+    Returns:
+        The dataset directory.
+    """
+    partition_cols = partition_cols or PARTITION_COLUMNS
+    missing = set(partition_cols) - set(df.columns)
+    if missing:
+        raise ValueError(f"Results are missing partition columns: {sorted(missing)}")
+    categoricals = {c: df[c].astype("category") for c in CATEGORICAL_COLUMNS if c in df.columns}
+    table = pa.Table.from_pandas(df.assign(**categoricals), preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root,
+        partition_cols=partition_cols,
+        existing_data_behavior="delete_matching",
+        use_dictionary=True,
+    )
+    return root
+
+
+def _filters(models: Optional[Sequence[str]], techniques: Optional[Sequence[str]]) -> Optional[List[Tuple]]:
+    filters = []
+    if models is not None:
+        filters.append(("model", "in", list(models)))
+    if techniques is not None:
+        filters.append(("technique", "in", list(techniques)))
+    return filters or None
+
+
+def read_results(
+    root: str,
+    models: Optional[Sequence[str]] = None,
+    techniques: Optional[Sequence[str]] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Reads long-format results, touching only the partitions and columns that are needed.
+
+    The model/technique selection is pushed down to the partition directories, so reading
+    one combination only opens that combination's files, and ``columns`` prunes the rest.
+
+    Args:
+        root: The dataset directory.
+        models: The models to read. Defaults to all.
+        techniques: The techniques to read. Defaults to all.
+        columns: The columns to read. Defaults to all.
+
+    Returns:
+        The selected results with model and technique as categoricals.
+    """
+    table = pq.read_table(root, columns=columns, filters=_filters(models, techniques), partitioning="hive")
+    return table.to_pandas()
+
+
+def store_columns(root: str) -> List[str]:
+    """
+    Returns the column names of a results dataset (partition columns included) from its schema.
+    """
+    return ds.dataset(root, format="parquet", partitioning="hive").schema.names
+
+
+def list_combinations(root: str) -> List[Tuple[str, str]]:
+    """
+    Lists the (model, technique) partitions in a results dataset without reading any data.
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    combinations = set()
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        combinations.add((str(keys.get("model")), str(keys.get("technique"))))
+    return sorted(combinations)
+
+
+def iter_combinations(root: str, columns: Optional[List[str]] = None) -> Iterator[Tuple[Tuple[str, str], pd.DataFrame]]:
+    """
+    Yields ((model, technique), results) one partition at a time, so memory use stays at
+    one combination regardless of how many models the store holds.
+    """
+    for model, technique in list_combinations(root):
+        yield (model, technique), read_results(root, [model], [technique], columns)
+
+
+def is_results_store(path: str) -> bool:
+    """
+    Returns True if ``path`` is a partitioned results dataset directory.
+    """
+    return os.path.isdir(path) and any(name.startswith("model=") for name in os.listdir(path))
@@ -0,0 +1,179 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from llm_orchestration_hw6.data.store import is_results_store, read_results
+
+# Question-number ranges of the seven domains in the 100-question benchmark.
+# Questions 8-15 are not assigned to a domain.
+DEFAULT_DOMAINS: Dict[str, Tuple[int, int]] = {
+    'Arithmetic': (1, 7),
+    'Logic': (16, 30),
+    'Linguistics': (31, 44),
+    'Programming': (45, 58),
+    'General_Knowledge': (59, 72),
+    'Design_Lateral': (73, 86),
+    'Applied_Integration': (87, 100),
+}
+
+LONG_COLUMNS = ["question_id", "model", "technique", "score"]
+GROUPINGS = {
+    "by_model": ["model"],
+    "by_technique": ["technique"],
+    "by_domain": ["domain"],
+    "by_difficulty": ["difficulty"],
+    "model_technique": ["model", "technique"],
+    "domain_model_technique": ["domain", "model", "technique"],
+}
+
+
+def assign_domains(question_ids: pd.Series, domains: Optional[Dict[str, Tuple[int, int]]] = None) -> pd.Series:
+    """
+    Maps numeric question ids to domain names using inclusive id ranges.
+
+    Args:
+        question_ids: Numeric question ids.
+        domains: {domain: (first_id, last_id)}. Defaults to DEFAULT_DOMAINS.
+
+    Returns:
+        A categorical series of domain names; ids outside every range are NaN.
+    """
+    domains = domains or DEFAULT_DOMAINS
+    names = list(domains)
+    bins = pd.IntervalIndex.from_tuples([domains[name] for name in names], closed="both")
+    codes = bins.get_indexer(pd.to_numeric(question_ids, errors="coerce"))
+    return pd.Series(pd.Categorical.from_codes(codes, categories=names), index=question_ids.index)
+
+
+def to_long(
+    score_df: pd.DataFrame,
+    id_column: str = "question_id",
+    separator: str = "_",
+    value_name: str = "score",
+) -> pd.DataFrame:
+    """
+    Reshapes a wide score table (one ``<Model>_<Technique>`` column per combination) into
+    the long format used by the aggregation engine.
+
+    Args:
+        score_df: Wide scores with an id column and optional ``domain``/``difficulty`` columns.
+        id_column: The question id column.
+        separator: Separator between model and technique in column names.
+        value_name: The name of the value column (e.g. "score" or "extracted").
+
+    Returns:
+        A frame with question_id, model, technique, the value column and any metadata columns, with
+        model and technique stored as categoricals.
+    """
+    meta = [c for c in (id_column, "domain", "difficulty", "ground_truth") if c in score_df.columns]
+    value_columns = [c for c in score_df.columns if c not in meta and separator in c]
+    long_df = score_df.melt(id_vars=meta, value_vars=value_columns, var_name="combination", value_name=value_name)
+    parts = long_df["combination"].str.split(separator, n=1, expand=True)
+    long_df["model"] = parts[0].astype("category")
+    long_df["technique"] = parts[1].astype("category")
+    long_df = long_df.drop(columns="combination").rename(columns={id_column: "question_id"})
+    return long_df
+
+
+def load_scores(path: str) -> pd.DataFrame:
+    """
+    Loads a score table (wide CSV, long CSV or a partitioned Parquet results store) and
+    returns it in long format.
+    """
+    if is_results_store(path):
+        return read_results(path)
+    df = pd.read_csv(path)
+    if set(LONG_COLUMNS).issubset(df.columns):
+        return df
+    return to_long(df)
+
+
+def load_question_metadata(path: str) -> pd.DataFrame:
+    """
+    Loads per-question metadata (category, difficulty, ...) from a CSV or JSON dataset.
+
+    Datasets without a numeric ``question_id`` column are numbered from 1 in file order,
+    which is how the score tables number questions.
+    """
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            metadata = pd.DataFrame(json.load(f))
+    else:
+        metadata = pd.read_csv(path)
+    if "question_id" not in metadata.columns:
+        metadata.insert(0, "question_id", np.arange(1, len(metadata) + 1))
+    keep = [c for c in ("question_id", "domain", "category", "difficulty") if c in metadata.columns]
+    return metadata[keep]
+
+
+def aggregate(
+    long_df: pd.DataFrame,
+    metadata: Optional[pd.DataFrame] = None,
+    domains: Optional[Dict[str, Tuple[int, int]]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Computes model, technique, domain, difficulty and model x technique aggregates.
+
+    The score table is grouped once at the finest grain (model, technique, domain,
+    difficulty); every coarser aggregate is rolled up from those partial sums, so the cost
+    does not grow with the number of aggregates and any number of models or techniques
+    is supported.
+
+    Args:
+        long_df: Long-format scores with question_id, model, technique and score.
+        metadata: Optional per-question metadata joined on question_id.
+        domains: Domain id ranges used when the scores carry no domain column.
+
+    Returns:
+        A dict of DataFrames keyed by ``by_model``, ``by_technique``, ``by_domain``,
+        ``by_difficulty``, ``model_technique``, ``domain_model_technique`` (accuracy and
+        question counts) and ``detailed`` (accuracy, std, min, max and median per
+        model x technique).
+    """
+    df = long_df
+    if metadata is not None:
+        extra = [c for c in metadata.columns if c != "question_id" and c not in df.columns]
+        df = df.merge(metadata[["question_id"] + extra], on="question_id", how="left")
+    if "domain" not in df.columns or df["domain"].isna().all():
+        df = df.assign(domain=assign_domains(df["question_id"], domains))
+    if "difficulty" not in df.columns:
+        df = df.assign(difficulty=np.nan)
+
+    keys = ["model", "technique", "domain", "difficulty"]
+    partial = (
+        df.groupby(keys, observed=True, dropna=False)["score"]
+        .agg(["sum", "count"])
+        .reset_index()
+    )
+
+    results = {}
+    for name, by in GROUPINGS.items():
+        rolled = partial.dropna(subset=by).groupby(by, observed=True)[["sum", "count"]].sum()
+        rolled["accuracy"] = rolled["sum"] / rolled["count"]
+        results[name] = rolled.rename(columns={"count": "questions"})[["accuracy", "questions"]].reset_index()
+
+    results["detailed"] = (
+        df.groupby(["model", "technique"], observed=True)["score"]
+        .agg(accuracy="mean", std_dev="std", min="min", max="max", median="median", questions="count")
+        .reset_index()
+    )
+    return results
+
+
+def write_aggregates(results: Dict[str, pd.DataFrame], output_dir: str) -> List[str]:
+    """
+    Writes each aggregate to ``<output_dir>/aggregate_<name>.csv``.
+
+    Returns:
+        The paths written.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, frame in results.items():
+        path = os.path.join(output_dir, f"aggregate_{name}.csv")
+        frame.to_csv(path, index=False)
+        paths.append(path)
+    return paths
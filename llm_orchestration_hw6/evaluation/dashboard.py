@@ -0,0 +1,243 @@
+import html
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from llm_orchestration_hw6.data.store import is_results_store, read_results
+from llm_orchestration_hw6.evaluation.aggregate import assign_domains, load_scores
+
+# Columns shown by default; long free-text columns such as ``raw`` are left out unless asked for.
+DASHBOARD_COLUMNS = ["question_id", "domain", "model", "technique", "score", "extracted", "rule"]
+PAGE_SIZE = 200
+
+
+def encode_column(series: pd.Series) -> Dict:
+    """
+    Encodes one column for the dashboard payload.
+
+    Numeric columns are stored as a plain array (NaN as null); everything else is
+    dictionary-encoded as the list of distinct values plus one integer code per row,
+    which keeps repeated model/technique/domain labels from being written per row.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.astype(float).to_numpy()
+        return {"type": "number", "values": [None if np.isnan(v) else round(float(v), 6) for v in values]}
+    categorical = series.astype("category")
+    return {
+        "type": "dict",
+        "dict": [str(v) for v in categorical.cat.categories],
+        "codes": categorical.cat.codes.astype(int).tolist(),
+    }
+
+
+def columnar_payload(df: pd.DataFrame) -> Dict:
+    """
+    Encodes a frame as columnar JSON-ready data: {"rows": n, "columns": {name: column}}.
+    """
+    return {"rows": len(df), "columns": {str(c): encode_column(df[c]) for c in df.columns}}
+
+
+def load_dashboard_frame(results_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Loads per-question results for the dashboard from a Parquet results store or a wide or
+    long score CSV, adding domains from the question ids when they are missing.
+    """
+    columns = columns or DASHBOARD_COLUMNS
+    df = read_results(results_path) if is_results_store(results_path) else load_scores(results_path)
+    if "domain" not in df.columns or df["domain"].isna().all():
+        df = df.assign(domain=assign_domains(df["question_id"]))
+    return df[[c for c in columns if c in df.columns]]
+
+
+def render_dashboard(df: pd.DataFrame, title: str = "LLM Evaluation Dashboard") -> str:
+    """
+    Renders a self-contained HTML report of per-question results.
+
+    The data is embedded once as columnar JSON; filtering, sorting, paging and the
+    model x technique summary are computed in the browser, so no server or Python run is
+    needed to explore a view.
+
+    Args:
+        df: Per-question results in long format.
+        title: The page title, as plain text.
+
+    Returns:
+        The HTML document.
+    """
+    payload = json.dumps(columnar_payload(df), separators=(",", ":"))
+    # Keep "</script>" inside answers from closing the data block.
+    payload = payload.replace("</", "<\\/")
+    # The title goes in last so placeholders in it are left alone.
+    return (
+        _TEMPLATE.replace("__PAGE_SIZE__", str(PAGE_SIZE))
+        .replace("__DATA__", payload)
+        .replace("__TITLE__", html.escape(title))
+    )
+
+
+def write_dashboard(df: pd.DataFrame, path: str, title: str = "LLM Evaluation Dashboard") -> str:
+    """
+    Writes the dashboard HTML to ``path`` and returns the path.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_dashboard(df, title))
+    return path
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { font-family: sans-serif; margin: 1.5em; color: #222; }
+h1 { font-size: 1.4em; }
+#filters { display: flex; flex-wrap: wrap; gap: 1em; margin-bottom: 1em; }
+#filters label { display: flex; flex-direction: column; font-size: 0.85em; }
+table { border-collapse: collapse; margin-bottom: 1.5em; font-size: 0.9em; }
+th, td { border: 1px solid #ccc; padding: 0.3em 0.6em; text-align: left; }
+th { background: #f0f0f0; cursor: pointer; user-select: none; }
+td.num { text-align: right; }
+#pager button { margin: 0 0.3em; }
+</style>
+</head>
+<body>
+<h1>__TITLE__</h1>
+<div id="filters"></div>
+<h2>Accuracy by model &times; technique</h2>
+<div id="summary"></div>
+<h2>Per-question results <span id="count"></span></h2>
+<div id="pager"></div>
+<div id="rows"></div>
+<script type="application/json" id="data">__DATA__</script>
+<script>
+(function () {
+  const PAGE_SIZE = __PAGE_SIZE__;
+  const data = JSON.parse(document.getElementById("data").textContent);
+  const names = Object.keys(data.columns);
+  const cols = data.columns;
+  const value = (name, i) => {
+    const c = cols[name];
+    return c.type === "dict" ? (c.codes[i] < 0 ? null : c.dict[c.codes[i]]) : c.values[i];
+  };
+  const filters = {};
+  let text = "";
+  let sortBy = null, sortDir = 1, page = 0;
+
+  const box = document.getElementById("filters");
+  names.filter(n => cols[n].type === "dict" && cols[n].dict.length <= 200).forEach(name => {
+    const label = document.createElement("label");
+    label.textContent = name;
+    const select = document.createElement("select");
+    select.multiple = true;
+    select.size = Math.min(6, cols[name].dict.length);
+    cols[name].dict.forEach((v, code) => select.add(new Option(v, code)));
+    select.onchange = () => {
+      const chosen = Array.from(select.selectedOptions).map(o => +o.value);
+      if (chosen.length) filters[name] = new Set(chosen); else delete filters[name];
+      page = 0; update();
+    };
+    label.appendChild(select);
+    box.appendChild(label);
+  });
+  const search = document.createElement("label");
+  search.textContent = "search";
+  const input = document.createElement("input");
+  input.oninput = () => { text = input.value.toLowerCase(); page = 0; update(); };
+  search.appendChild(input);
+  box.appendChild(search);
+
+  function selected() {
+    const rows = [];
+    for (let i = 0; i < data.rows; i++) {
+      let keep = true;
+      for (const name in filters) {
+        if (!filters[name].has(cols[name].codes[i])) { keep = false; break; }
+      }
+      if (keep && text) {
+        keep = names.some(n => String(value(n, i)).toLowerCase().includes(text));
+      }
+      if (keep) rows.push(i);
+    }
+    if (sortBy !== null) {
+      rows.sort((a, b) => {
+        const x = value(sortBy, a), y = value(sortBy, b);
+        if (x === y) return 0;
+        if (x === null) return 1;
+        if (y === null) return -1;
+        return (x < y ? -1 : 1) * sortDir;
+      });
+    }
+    return rows;
+  }
+
+  function table(headers, body, sortable) {
+    const t = document.createElement("table");
+    const head = t.createTHead().insertRow();
+    headers.forEach(h => {
+      const th = document.createElement("th");
+      th.textContent = h + (sortable && sortBy === h ? (sortDir > 0 ? " \\u25b2" : " \\u25bc") : "");
+      if (sortable) th.onclick = () => {
+        sortDir = sortBy === h ? -sortDir : 1; sortBy = h; update();
+      };
+      head.appendChild(th);
+    });
+    const tbody = t.createTBody();
+    body.forEach(row => {
+      const tr = tbody.insertRow();
+      row.forEach(v => {
+        const td = tr.insertCell();
+        if (typeof v === "number") { td.className = "num"; td.textContent = Number.isInteger(v) ? v : v.toFixed(3); }
+        else td.textContent = v === null ? "" : v;
+      });
+    });
+    return t;
+  }
+
+  function summary(rows) {
+    if (!cols.score || !cols.model || !cols.technique) return document.createTextNode("");
+    const sums = new Map();
+    rows.forEach(i => {
+      const s = value("score", i);
+      if (s === null) return;
+      const key = value("model", i) + "\\u0000" + value("technique", i);
+      const e = sums.get(key) || [0, 0];
+      e[0] += s; e[1] += 1; sums.set(key, e);
+    });
+    const body = Array.from(sums.entries()).sort().map(([k, e]) => {
+      const [m, t] = k.split("\\u0000");
+      return [m, t, e[0] / e[1], e[1]];
+    });
+    return table(["model", "technique", "accuracy", "questions"], body, false);
+  }
+
+  function update() {
+    const rows = selected();
+    const pages = Math.max(1, Math.ceil(rows.length / PAGE_SIZE));
+    page = Math.min(page, pages - 1);
+    document.getElementById("count").textContent = "(" + rows.length + " of " + data.rows + ")";
+    document.getElementById("summary").replaceChildren(summary(rows));
+    const shown = rows.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE);
+    document.getElementById("rows").replaceChildren(
+      table(names, shown.map(i => names.map(n => value(n, i))), true));
+    const pager = document.getElementById("pager");
+    pager.replaceChildren();
+    const prev = document.createElement("button");
+    prev.textContent = "previous"; prev.disabled = page === 0;
+    prev.onclick = () => { page--; update(); };
+    const next = document.createElement("button");
+    next.textContent = "next"; next.disabled = page >= pages - 1;
+    next.onclick = () => { page++; update(); };
+    pager.append(prev, "page " + (page + 1) + " / " + pages, next);
+  }
+
+  update();
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,223 @@
+import concurrent.futures
+import functools
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+import pandas as pd
+
+from llm_orchestration_hw6.config.settings import get_settings
+
+Rule = Tuple[str, Pattern]
+
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Fast path: a well-formed "Answer:" / "Final Answer:" line. The last one wins.
+ANSWER_LINE = re.compile(r"^[\s>*-]*(?:final\s+answer|answer)\s*[:：]\s*(.+?)\s*$", _FLAGS)
+
+# Rules tried after the fast path, in order, for every technique and provider.
+COMMON_RULES: List[Rule] = [
+    ("a_label", re.compile(r"^\s*A\d+\s*:\s*(.+?)\s*$", _FLAGS)),
+    ("numbered", re.compile(r"^\s*[-*]?\s*(?:Q\d+\s*:|\d+\s*[.)])\s*(.+?)\s*$", _FLAGS)),
+]
+
+# Rules tried before the common ones for a technique, keyed by technique.
+TECHNIQUE_RULES = {
+    "cot": [
+        ("conclusion", re.compile(r"(?:the\s+(?:final\s+)?answer\s+is|therefore,?|thus,?)\s*:?\s*(.+?)\s*$", _FLAGS)),
+    ],
+    "react": [
+        ("observation", re.compile(r"^\s*Observ(?:e|ation)\s*:\s*(.+?)\s*$", _FLAGS)),
+    ],
+}
+
+# Rules tried first for a (provider, technique) pair; None matches every technique.
+PROVIDER_RULES = {
+    # Perplexity writes CoT answers as worked equations: "Q6: 2x + 5 = 13 ⇒ x = 4."
+    ("perplexity", "cot"): [
+        ("equation", re.compile(r"(?:=|⇒|→)\s*([^=⇒→\n]+?)\s*$", _FLAGS)),
+    ],
+}
+
+PROVIDER_ALIASES = {"peplexity": "perplexity", "openai": "gpt", "xai": "grok"}
+
+UNIT_ALIASES = {
+    "hr": "hours", "hrs": "hours", "hour": "hours", "h": "hours",
+    "min": "minutes", "mins": "minutes", "minute": "minutes",
+    "sec": "seconds", "secs": "seconds", "second": "seconds", "s": "seconds",
+    "kilometers": "km", "kilometres": "km", "meters": "m", "metres": "m",
+    "kilograms": "kg", "grams": "g", "dollars": "$", "usd": "$",
+    "percent": "%",
+}
+KNOWN_UNITS = set(UNIT_ALIASES.values()) | {
+    "days", "weeks", "years", "cm", "mm", "mph", "kmh", "units", "degrees", "°", "°c", "°f", "l", "ml",
+}
+
+_NUMBER = re.compile(
+    r"^(?P<currency>[$€£])?\s*(?P<number>[-−]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)\s*(?P<unit>%|[a-zA-Z°]+)?$"
+)
+# A single-variable solution such as "x = 4".
+_ASSIGNMENT = re.compile(r"^[a-zA-Z]\s*=\s*(.+)$")
+# Sequence-aware item marker for answers flattened onto one line: "1. 38 2. 55 3. 56".
+_ITEM_MARKER = re.compile(r"(?<![\w.])(\d+)\.(?!\d)")
+
+
+def _key(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    key = re.sub(r"[^a-z]", "", str(name).lower())
+    return PROVIDER_ALIASES.get(key, key)
+
+
+def rules_for(technique: Optional[str] = None, provider: Optional[str] = None) -> Tuple[Rule, ...]:
+    """
+    Returns the ordered rule chain for a technique and provider.
+
+    Technique and provider names are matched case- and punctuation-insensitively, so
+    "few_shot", "FewShot" and "fewshot" share one chain.
+    """
+    return _rule_chain(_key(technique), _key(provider))
+
+
+@functools.lru_cache(maxsize=None)
+def _rule_chain(technique: Optional[str], provider: Optional[str]) -> Tuple[Rule, ...]:
+    rules = list(PROVIDER_RULES.get((provider, technique), [])) + list(PROVIDER_RULES.get((provider, None), []))
+    rules += TECHNIQUE_RULES.get(technique, [])
+    return tuple(rules + COMMON_RULES)
+
+
+def _canonical_number(text: str) -> Optional[str]:
+    match = _NUMBER.match(text)
+    if not match:
+        return None
+    unit = match.group("unit")
+    unit = UNIT_ALIASES.get(unit.lower(), unit.lower()) if unit else ""
+    if unit and unit not in KNOWN_UNITS:
+        return None
+    number = match.group("number").replace(",", "").replace("−", "-")
+    if "." in number:
+        number = number.rstrip("0").rstrip(".")
+    currency = match.group("currency") or ""
+    if unit == "$":
+        currency, unit = "$", ""
+    if unit in ("", "%"):
+        return f"{currency}{number}{unit}"
+    return f"{currency}{number} {unit}"
+
+
+def normalize_numeric(answer: str) -> str:
+    """
+    Normalizes an extracted answer: strips markdown emphasis, quotes and trailing
+    punctuation, and writes numbers canonically ("1,200.50 USD" -> "$1200.5",
+    "5 hrs" -> "5 hours", "x = 4" -> "4", "38." -> "38"). Anything else is only stripped.
+    """
+    answer = str(answer).strip().strip("*`\"'").strip()
+    answer = answer.rstrip(".;,!").strip()
+    assignment = _ASSIGNMENT.match(answer)
+    if assignment and _canonical_number(assignment.group(1).strip()) is not None:
+        answer = assignment.group(1).strip()
+    canonical = _canonical_number(answer)
+    return answer if canonical is None else canonical
+
+
+def extract(text: str, technique: Optional[str] = None, provider: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Extracts the answer from one raw response.
+
+    Args:
+        text: The raw response.
+        technique: The prompting technique that produced it (selects technique rules).
+        provider: The model/provider that produced it (selects provider rules).
+
+    Returns:
+        (normalized answer, name of the rule that fired). The rule is "answer_line" for
+        the fast path, a rule name from the chain, "last_line" for the fallback or
+        "empty" for blank input.
+    """
+    text = "" if text is None else str(text)
+    if not text.strip():
+        return "", "empty"
+    if "answer" in text.lower():
+        matches = ANSWER_LINE.findall(text)
+        if matches:
+            return normalize_numeric(matches[-1]), "answer_line"
+    for name, pattern in rules_for(technique, provider):
+        matches = pattern.findall(text)
+        if matches:
+            return normalize_numeric(matches[-1]), name
+    lines = [line for line in text.splitlines() if line.strip()]
+    return normalize_numeric(lines[-1]), "last_line"
+
+
+def _extract_chunk(texts: List[str], technique: Optional[str], provider: Optional[str]) -> List[Tuple[str, str]]:
+    return [extract(text, technique, provider) for text in texts]
+
+
+def extract_many(
+    texts: Iterable[str],
+    technique: Optional[str] = None,
+    provider: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Extracts answers from many responses of one technique and provider.
+
+    Well-formed "Answer:" lines are handled in one vectorized pass over the whole column;
+    the remaining responses go through the rule chain, split across processes once there
+    are more than ``chunk_size`` of them.
+
+    Args:
+        texts: The raw responses.
+        technique: The prompting technique.
+        provider: The model/provider.
+        max_workers: The number of worker processes; 1 keeps everything in-process.
+            Defaults to ``performance.process_workers``.
+        chunk_size: Responses per worker task. Defaults to ``performance.extraction_chunk_size``.
+
+    Returns:
+        A frame aligned with the input with ``answer`` and ``rule`` columns.
+    """
+    performance = get_settings().performance
+    max_workers = max_workers or performance.process_workers
+    chunk_size = chunk_size or performance.extraction_chunk_size
+    series = pd.Series(list(texts) if not isinstance(texts, pd.Series) else texts, dtype=object)
+    series = series.where(series.notna(), "").astype(str)
+    answers = pd.Series("", index=series.index, dtype=object)
+    rules = pd.Series("empty", index=series.index, dtype=object)
+
+    found = series.str.findall(ANSWER_LINE)
+    fast = found.str.len().fillna(0).astype(bool).to_numpy()
+    answers[fast] = found[fast].str[-1].map(normalize_numeric)
+    rules[fast] = "answer_line"
+
+    rest = series[~fast]
+    chunks = [rest.iloc[i:i + chunk_size].tolist() for i in range(0, len(rest), chunk_size)]
+    if len(chunks) > 1 and max_workers != 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parts = executor.map(_extract_chunk, chunks, [technique] * len(chunks), [provider] * len(chunks))
+            extracted = [item for part in parts for item in part]
+    else:
+        extracted = [item for chunk in chunks for item in _extract_chunk(chunk, technique, provider)]
+    if extracted:
+        answers[~fast] = [answer for answer, _ in extracted]
+        rules[~fast] = [rule for _, rule in extracted]
+    return pd.DataFrame({"answer": answers, "rule": rules})
+
+
+def split_numbered(text: str) -> List[str]:
+    """
+    Splits answers flattened onto one line ("1. 38 2. 55 3. Yes") into items.
+
+    Only markers continuing the sequence (1., 2., 3., ...) start a new item, so numbers
+    inside answers, such as "2. 55" following "1. 38", never swallow or split an item.
+    """
+    items, expected, start = [], 1, None
+    for match in _ITEM_MARKER.finditer(text):
+        if int(match.group(1)) != expected:
+            continue
+        if start is not None:
+            items.append(text[start:match.start()].strip())
+        start, expected = match.end(), expected + 1
+    if start is not None:
+        items.append(text[start:].strip())
+    return items
@@ -0,0 +1,147 @@
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from llm_orchestration_hw6.config.settings import get_settings
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover - exercised only without rapidfuzz installed
+    fuzz = process = None
+
+GRADING_METHODS = ("exact", "fuzzy", "semantic", "containment")
+FUZZY_THRESHOLD = 0.85
+SEMANTIC_THRESHOLD = 0.80
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lowercases and strips every cell of a frame of answers in one vectorized pass.
+    Missing values become empty strings.
+    """
+    return df.fillna("").astype(str).apply(lambda col: col.str.strip().str.lower())
+
+
+def fuzzy_ratios(truth: np.ndarray, predicted: np.ndarray, workers: int = -1, floor: float = 0.0) -> np.ndarray:
+    """
+    Computes element-wise similarity ratios (0-1) between two equally long string arrays.
+
+    The ratios are exactly ``difflib.SequenceMatcher.ratio``. rapidfuzz's Indel ratio
+    (2 * LCS / total length) is an upper bound of it, computed in compiled threads when
+    rapidfuzz is installed: pairs whose bound is below ``floor`` are reported as 0
+    without running SequenceMatcher, and the rest are scored once per distinct pair.
+
+    Args:
+        truth: Normalized ground truth strings.
+        predicted: Normalized predicted strings.
+        workers: Threads used by rapidfuzz; -1 uses all cores.
+        floor: Ratios below this are reported as 0.
+
+    Returns:
+        A float array of similarity ratios.
+    """
+    if len(truth) == 0:
+        return np.zeros(0)
+    if process is not None and hasattr(process, "cpdist"):
+        bounds = process.cpdist(truth, predicted, scorer=fuzz.ratio, workers=workers, dtype=np.float32) / 100.0
+    elif fuzz is not None:
+        bounds = np.array([fuzz.ratio(t, p) for t, p in zip(truth, predicted)]) / 100.0
+    else:
+        bounds = np.ones(len(truth))
+    # Float32 bounds are compared with a little slack so no candidate is lost to rounding.
+    candidates = np.flatnonzero(bounds >= floor - 1e-6)
+    cache: Dict[tuple, float] = {}
+    ratios = np.zeros(len(truth))
+    for i in candidates:
+        pair = (truth[i], predicted[i])
+        if pair not in cache:
+            cache[pair] = SequenceMatcher(None, *pair).ratio()
+        ratios[i] = cache[pair]
+    ratios[ratios < floor] = 0.0
+    return ratios
+
+
+def _score_block(truth: np.ndarray, predicted: np.ndarray, method: str, threshold: float, workers: int) -> np.ndarray:
+    exact = truth == predicted
+    if method == "exact":
+        return exact.astype(float)
+
+    if method == "containment":
+        # Substring either way earns 0.8, a shared word longer than two characters 0.5.
+        contains = np.array([p in t or t in p for t, p in zip(truth, predicted)], dtype=bool)
+        shares_word = np.array(
+            [any(w in t for w in p.split() if len(w) > 2) for t, p in zip(truth, predicted)], dtype=bool
+        )
+        return np.select([exact, contains, shares_word], [1.0, 0.8, 0.5], default=0.0)
+
+    # Ratios below half the threshold earn no credit, so they need not be computed exactly.
+    ratios = fuzzy_ratios(truth, predicted, workers, floor=threshold * 0.5)
+    return np.select(
+        [exact | (ratios >= threshold), ratios >= threshold * 0.5],
+        [1.0, ratios],
+        default=0.0,
+    )
+
+
+def grade_matrix(
+    df_results: pd.DataFrame,
+    ground_truth: Union[Dict, pd.Series, Sequence],
+    columns: Optional[List[str]] = None,
+    method: str = "fuzzy",
+    threshold: Optional[float] = None,
+    id_column: str = "question_id",
+    workers: int = -1,
+) -> pd.DataFrame:
+    """
+    Grades every model-technique column against the ground truth on whole columns at once.
+
+    Args:
+        df_results: Wide results with one row per question and one column per combination.
+        ground_truth: Either a mapping {question_id: answer} (aligned through ``id_column``)
+            or a sequence of answers aligned with the rows of ``df_results``.
+        columns: The columns to grade. Defaults to every column except the id and ``domain``.
+        method: 'exact', 'fuzzy', 'semantic' (fuzzy with a 0.80 threshold) or 'containment'
+            (exact / substring / shared-word partial credit).
+        threshold: Full-credit similarity threshold for fuzzy grading.
+        id_column: The question id column.
+        workers: Threads used by the fuzzy scorer; -1 uses all cores.
+
+    Returns:
+        A frame with the id column (and ``domain`` if present) plus one score column per
+        graded column.
+    """
+    if method not in GRADING_METHODS:
+        raise ValueError(f"Unknown grading method '{method}'. Choose from {GRADING_METHODS}.")
+    if threshold is None:
+        threshold = SEMANTIC_THRESHOLD if method == "semantic" else FUZZY_THRESHOLD
+    if columns is None:
+        columns = [c for c in df_results.columns if c not in (id_column, "domain")]
+
+    if isinstance(ground_truth, (dict, pd.Series)):
+        truth = df_results[id_column].map(ground_truth)
+    else:
+        truth = pd.Series(list(ground_truth), index=df_results.index)
+    missing_truth = truth.isna().to_numpy()
+    truth_norm = normalize_frame(truth.to_frame()).iloc[:, 0].to_numpy()
+
+    answers = df_results[columns]
+    missing_pred = answers.isna().to_numpy()
+    predicted = normalize_frame(answers).to_numpy()
+
+    scores = np.empty(predicted.shape, dtype=float)
+    n_cols = len(columns)
+    chunk_rows = get_settings().performance.grading_chunk_rows
+    for start in range(0, len(df_results), chunk_rows):
+        block = slice(start, start + chunk_rows)
+        pred_flat = predicted[block].ravel()
+        truth_flat = np.repeat(truth_norm[block], n_cols)
+        scores[block] = _score_block(truth_flat, pred_flat, method, threshold, workers).reshape(-1, n_cols)
+
+    scores[missing_pred | missing_truth[:, None]] = 0.0
+
+    keep = [c for c in (id_column, "domain") if c in df_results.columns]
+    score_df = df_results[keep].copy()
+    score_df[columns] = scores
+    return score_df
@@ -1,30 +1,53 @@
 from typing import List, Dict
-from sentence_transformers import SentenceTransformer, util
 
-# Load a pre-trained sentence transformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+import numpy as np
+
+from .encoders import get_encoder
+
+def _encoder():
+    """
+    Returns the sentence encoder of the configured backend (``encoder`` settings), loaded
+    on first use. Its embeddings are unit vectors, so dot products are cosine similarities.
+    """
+    return get_encoder(fallback=False)
+
+def _matches(ground_truth: List[Dict], responses: List[str], similarity_threshold: float) -> np.ndarray:
+    """
+    Returns, for each question that has a response, whether the response is similar to
+    any of its ground truth answers (alternatives separated by "or").
+
+    All responses and all answers are encoded in one call each, so the encoder can batch
+    texts of similar length together.
+    """
+    encoder = _encoder()
+    answered = min(len(ground_truth), len(responses))
+    if answered == 0:
+        return np.zeros(0, dtype=bool)
+    response_texts = [str(responses[i]).strip() for i in range(answered)]
+    gt_answers, owners = [], []
+    for i, gt in enumerate(ground_truth[:answered]):
+        answers = [ans.strip() for ans in str(gt["ground_truth_answer"]).split("or")]
+        gt_answers.extend(answers)
+        owners.extend([i] * len(answers))
+    owners = np.asarray(owners)
+
+    response_embeddings = encoder.encode(response_texts)
+    gt_embeddings = encoder.encode(gt_answers)
+
+    # Cosine similarity between every ground truth answer and its question's response
+    cosine_scores = np.einsum("ij,ij->i", gt_embeddings, response_embeddings[owners])
+
+    # A response is correct if any of its ground truth answers is above the threshold
+    matches = np.zeros(answered, dtype=bool)
+    np.logical_or.at(matches, owners, cosine_scores > similarity_threshold)
+    return matches
 
 def calculate_accuracy(ground_truth: List[Dict], responses: List[str]) -> float:
     """
     Calculates the accuracy of the responses compared to the ground truth using sentence similarity.
     """
-    correct = 0
     similarity_threshold = 0.8  # Threshold for considering a response as correct
-
-    for i, gt in enumerate(ground_truth):
-        if i < len(responses):
-            response = str(responses[i]).strip()
-            gt_answers = [ans.strip() for ans in str(gt["ground_truth_answer"]).split("or")]
-            
-            response_embedding = model.encode(response, convert_to_tensor=True)
-            gt_embeddings = model.encode(gt_answers, convert_to_tensor=True)
-            
-            # Calculate cosine similarity between the response and all ground truth answers
-            cosine_scores = util.pytorch_cos_sim(response_embedding, gt_embeddings)
-            
-            # Check if any of the ground truth answers has a similarity score above the threshold
-            if any(score > similarity_threshold for score in cosine_scores[0]):
-                correct += 1
+    correct = int(_matches(ground_truth, responses, similarity_threshold).sum())
 
     return correct / len(ground_truth) if ground_truth else 0
 
@@ -35,28 +58,13 @@ def calculate_f1_score(ground_truth: List[Dict], responses: List[str]) -> float:
     if not ground_truth or not responses:
         return 0.0
 
-    true_positives = 0
-    false_positives = 0
-    false_negatives = 0
     similarity_threshold = 0.8
+    matches = _matches(ground_truth, responses, similarity_threshold)
 
-    for i, gt in enumerate(ground_truth):
-        if i < len(responses):
-            response = str(responses[i]).strip()
-            gt_answers = [ans.strip() for ans in str(gt["ground_truth_answer"]).split("or")]
-
-            response_embedding = model.encode(response, convert_to_tensor=True)
-            gt_embeddings = model.encode(gt_answers, convert_to_tensor=True)
-            
-            cosine_scores = util.pytorch_cos_sim(response_embedding, gt_embeddings)
+    true_positives = int(matches.sum())
+    # Wrong responses and missing responses are both false negatives
+    false_negatives = len(ground_truth) - true_positives
 
-            if any(score > similarity_threshold for score in cosine_scores[0]):
-                true_positives += 1
-            else:
-                false_negatives += 1
-        else:
-            false_negatives += 1 # Response is missing
-            
     # This is a simplified calculation of F1 score, not a standard one.
     # We are considering each question as a binary classification task (correct/incorrect)
     # A more standard approach would be to calculate precision and recall on a token/word level.
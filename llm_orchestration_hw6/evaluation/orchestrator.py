@@ -1,23 +1,28 @@
 import os
-import re
 import concurrent.futures
+import logging
 
+from llm_orchestration_hw6.config.logging_setup import REQUEST_LOGGER
+from llm_orchestration_hw6.config.settings import get_settings
 from llm_orchestration_hw6.data.loader import load_dataset
+from llm_orchestration_hw6.evaluation.extraction import extract, split_numbered
 from llm_orchestration_hw6.evaluation.metrics import calculate_accuracy, calculate_f1_score # Added calculate_f1_score
 from llm_orchestration_hw6.evaluation.techniques.baseline import BaselineEvaluator
 from llm_orchestration_hw6.evaluation.techniques.few_shot import FewShotEvaluator
 from llm_orchestration_hw6.evaluation.techniques.cot import CoTEvaluator
 from llm_orchestration_hw6.evaluation.techniques.react import ReActEvaluator
+from llm_orchestration_hw6.evaluation.techniques.react_agent import ReActAgentEvaluator
+from llm_orchestration_hw6.evaluation.techniques.self_consistency import SelfConsistencyEvaluator
 from llm_orchestration_hw6.llms.providers.openai_client import OpenAIClient
 from llm_orchestration_hw6.llms.providers.gemini_client import GeminiClient
 
+# Per-result records are sampled (see logging.yaml), so large sweeps do not flood the log.
+request_logger = logging.getLogger(REQUEST_LOGGER)
 
-def clean_response(response: str) -> str:
-    # remove the question number and dot from the beginning of the string
-    response = re.sub(r"^\d+\.\s*", "", response, flags=re.MULTILINE).strip()
-    # remove "Answer:" prefix, case-insensitive
-    response = re.sub(r"^(answer:)\s*", "", response, flags=re.IGNORECASE | re.MULTILINE).strip()
-    return response
+
+def clean_response(response: str, technique: str = None, llm_name: str = None) -> str:
+    # strip the question number / "Answer:" prefix and normalize numbers via the extraction engine
+    return extract(response, technique, llm_name)[0]
 
 def _analyze_single_llm_technique(llm_name, technique, questions, results_path):
     responses = []
@@ -39,19 +44,17 @@ def _analyze_single_llm_technique(llm_name, technique, questions, results_path):
             if technique == "cot" and llm_name == "GPT":
                 # Special parsing for the single-line format in cot_prompts_GPT.txt
                 full_text = " ".join(lines)
-                # This regex will find all occurrences of a number followed by a dot and then the answer
-                matches = re.findall(r'\d+\.\s*([^\d]+)', full_text)
-                responses = [match.strip() for match in matches]
+                # Split on the running item numbers so numeric answers are kept intact
+                responses = [clean_response(item, technique, llm_name) for item in split_numbered(full_text)]
             elif technique == "react":
                 for line in lines:
-                    if line.lower().startswith("answer:"):
-                        responses.append(line[len("answer:"):].strip())
-                    elif re.match(r"A\d+:", line):
-                        responses.append(line.split(":", 1)[1].strip())
+                    answer, rule = extract(line, technique, llm_name)
+                    if rule in ("answer_line", "a_label"):
+                        responses.append(answer)
             else:
                 if lines and "Answers to 100 Questions" in lines[0]:
                     lines = lines[1:]
-                responses = [clean_response(line) for line in lines if line.strip() != ""]
+                responses = [clean_response(line, technique, llm_name) for line in lines if line.strip() != ""]
         
         accuracy = calculate_accuracy(questions, responses)
         f1_score = calculate_f1_score(questions, responses)
@@ -79,7 +82,7 @@ def analyze(dataset_path: str, results_path: str, llms: str, techniques: str) ->
     llm_list = llms.split(',')
     technique_list = techniques.split(',')
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=get_settings().performance.max_workers) as executor:
         futures = []
         for llm_name in llm_list:
             results[llm_name] = {}
@@ -92,9 +95,12 @@ def analyze(dataset_path: str, results_path: str, llms: str, techniques: str) ->
                 "accuracy": result["accuracy"],
                 "f1_score": result["f1_score"],
             }
-            accuracy_str = f"{result['accuracy']:.2f}" if isinstance(result['accuracy'], float) else str(result['accuracy'])
-            f1_score_str = f"{result['f1_score']:.2f}" if isinstance(result['f1_score'], float) else str(result['f1_score'])
-            print(f"  - {result['llm']} - {result['technique']}: Accuracy={accuracy_str}, F1-score={f1_score_str}")
+            request_logger.info(
+                "%s - %s analyzed",
+                result["llm"],
+                result["technique"],
+                extra={key: result[key] for key in ("llm", "technique", "accuracy", "f1_score")},
+            )
 
     return results
 
@@ -141,9 +147,11 @@ def generate_prompts(dataset_path: str, results_path: str, techniques: str):
         "few_shot": FewShotEvaluator(),
         "cot": CoTEvaluator(),
         "react": ReActEvaluator(),
+        "self_consistency": SelfConsistencyEvaluator(),
+        "react_agent": ReActAgentEvaluator(),
     }
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=get_settings().performance.max_workers) as executor:
         futures = [executor.submit(_generate_single_technique_prompts, technique, questions, prompts_dir, evaluator_map) for technique in technique_list]
         for future in concurrent.futures.as_completed(futures):
             future.result() # Wait for all futures to complete
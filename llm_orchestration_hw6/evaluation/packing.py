@@ -0,0 +1,165 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from llm_orchestration_hw6.data.loader import dedupe_questions
+from llm_orchestration_hw6.evaluation.techniques.base import BaseEvaluator
+from llm_orchestration_hw6.evaluation.techniques.baseline import BaselineEvaluator
+from llm_orchestration_hw6.llms.tokens import count_tokens
+
+PACKED_PROMPT_HEADER = (
+    "Answer each of the following questions. Reply with exactly one line per question, "
+    "in the same order, formatted as \"<number>. <answer>\". Do not add anything else.\n\n"
+)
+
+# Matches "3. answer", "3) answer", "A3: answer" and "Q3 - answer" style lines.
+_ANSWER_LINE = re.compile(r"^\s*(?:[AQ])?(\d+)\s*[.):\-]\s*(.*?)\s*$", re.IGNORECASE)
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Token count of a text, from the model's tokenizer when available (see ``llms.tokens``)
+    and otherwise estimated at about four characters per token.
+    """
+    return count_tokens(text, model)
+
+
+def build_packed_prompt(questions: List[str]) -> str:
+    """
+    Builds one prompt that asks for numbered answers to several questions.
+
+    Args:
+        questions: The questions to pack, numbered from 1 in the prompt.
+
+    Returns:
+        The packed prompt.
+    """
+    lines = [f"{i}. {question}" for i, question in enumerate(questions, start=1)]
+    return PACKED_PROMPT_HEADER + "\n".join(lines) + "\n\nAnswers:\n"
+
+
+def unpack_answers(text: str, count: int) -> List[Optional[str]]:
+    """
+    Splits a packed response back into one answer per question.
+
+    Lines that do not follow the numbered-answer contract are ignored, and the first
+    answer seen for a number wins.
+
+    Args:
+        text: The raw packed response.
+        count: The number of questions in the packed prompt.
+
+    Returns:
+        A list with one entry per question; entries that could not be parsed are None.
+    """
+    answers: List[Optional[str]] = [None] * count
+    for line in text.splitlines():
+        match = _ANSWER_LINE.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        answer = match.group(2)
+        if 0 <= index < count and answers[index] is None and answer:
+            answers[index] = answer
+    return answers
+
+
+def plan_packs(
+    questions: List[str],
+    context_window: int = 4096,
+    answer_tokens: int = 16,
+    max_pack_size: int = 100,
+) -> List[List[int]]:
+    """
+    Greedily groups questions into packs that fit the context window.
+
+    Each pack is sized so that the prompt plus the expected numbered answers stay within
+    ``context_window`` tokens, so N adapts to question length.
+
+    Args:
+        questions: The questions to pack.
+        context_window: The model's context window in tokens.
+        answer_tokens: The expected output tokens per answer line.
+        max_pack_size: The upper bound on questions per request.
+
+    Returns:
+        A list of packs, each a list of question indices.
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    used = estimate_tokens(PACKED_PROMPT_HEADER)
+    for i, question in enumerate(questions):
+        cost = estimate_tokens(question) + 2 + answer_tokens
+        if current and (used + cost > context_window or len(current) >= max_pack_size):
+            packs.append(current)
+            current = []
+            used = estimate_tokens(PACKED_PROMPT_HEADER)
+        current.append(i)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+class PackedEvaluator:
+    """
+    Evaluates many questions per request using a numbered-answer contract.
+
+    Questions whose answers cannot be recovered from the packed response are re-asked
+    one at a time with the fallback evaluator.
+    """
+
+    def __init__(
+        self,
+        fallback: Optional[BaseEvaluator] = None,
+        context_window: int = 4096,
+        answer_tokens: int = 16,
+        max_pack_size: int = 100,
+    ):
+        """
+        Initializes the packed evaluator.
+
+        Args:
+            fallback: The evaluator used for single-question retries. Defaults to baseline.
+            context_window: The model's context window in tokens.
+            answer_tokens: The expected output tokens per answer line.
+            max_pack_size: The upper bound on questions per request.
+        """
+        self.fallback = fallback or BaselineEvaluator()
+        self.context_window = context_window
+        self.answer_tokens = answer_tokens
+        self.max_pack_size = max_pack_size
+
+    def evaluate_many(self, questions: List[str], llm_client: Optional[Any] = None) -> List[Dict]:
+        """
+        Evaluates a list of questions with as few requests as the context window allows.
+
+        Args:
+            questions: The questions to evaluate.
+            llm_client: The LLM client to use for the evaluation.
+
+        Returns:
+            One result dictionary per question, in input order. ``packed`` is False for
+            questions that had to fall back to a single-question request. Repeated
+            questions are asked once and share the result.
+        """
+        questions, positions = dedupe_questions(questions)
+        results: List[Optional[Dict]] = [None] * len(questions)
+        packs = plan_packs(questions, self.context_window, self.answer_tokens, self.max_pack_size)
+        for pack in packs:
+            prompt = build_packed_prompt([questions[i] for i in pack])
+            kwargs = {}
+            if getattr(llm_client, "supports_max_tokens", False):
+                # plan_packs reserved answer_tokens per question; a smaller cap would
+                # truncate the pack and send the cut-off items to single requests.
+                kwargs["max_tokens"] = len(pack) * self.answer_tokens
+            response = llm_client.query(prompt, **kwargs) if llm_client else ""
+            answers = unpack_answers(response, len(pack))
+            for i, answer in zip(pack, answers):
+                if answer is not None:
+                    results[i] = {"prompt": prompt, "response": answer, "packed": True}
+
+        for i, result in enumerate(results):
+            if result is None:
+                single = self.fallback.evaluate(questions[i], llm_client)
+                results[i] = {**single, "packed": False}
+        return [dict(results[i]) for i in positions]
@@ -1,92 +1,396 @@
+import concurrent.futures
+import glob
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import matplotlib
+
+# Figures are only ever written to files, so always use the non-interactive raster backend.
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
-import os
 import typer
-from typing_extensions import Annotated
+
+from llm_orchestration_hw6.config.settings import get_settings
+from llm_orchestration_hw6.data.store import is_results_store, read_results, store_columns
+from llm_orchestration_hw6.evaluation.aggregate import aggregate
+
+MANIFEST_NAME = ".plot_manifest.json"
+PALETTE = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
+REPORT_TECHNIQUES = ["baseline", "few_shot", "cot", "react"]  # Order of techniques in the report
+
+Spec = Dict[str, Any]
 
 app = typer.Typer(help="LLM Agent Orchestration plot generator.")
 
-def plot_results_function(results_path: str):
-    report_path = os.path.join(results_path, 'ANALYSIS_REPORT.md')
+
+def _draw_bar(spec: Spec):
+    data, options = spec["data"], spec["options"]
+    fig, ax = plt.subplots(figsize=options.get("figsize", (10, 6)))
+    colors = [PALETTE[i % len(PALETTE)] for i in range(len(data["labels"]))]
+    bars = ax.bar(data["labels"], np.array(data["values"], dtype=float), color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
+    ax.set_ylabel(options.get("ylabel", "Accuracy"), fontsize=12, fontweight='bold')
+    ax.set_xlabel(options.get("xlabel", ""), fontsize=12, fontweight='bold')
+    ax.set_title(options.get("title", ""), fontsize=14, fontweight='bold')
+    ax.set_ylim([0, 1.0])
+    ax.grid(axis='y', alpha=0.3)
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+                f'{height:.2%}', ha='center', va='bottom', fontweight='bold')
+    plt.tight_layout()
+    return fig
+
+
+def _draw_grouped_bar(spec: Spec):
+    data, options = spec["data"], spec["options"]
+    fig, ax = plt.subplots(figsize=options.get("figsize", (14, 7)))
+    groups, series = data["groups"], data["series"]
+    x = np.arange(len(groups))
+    width = options.get("width", 0.8 / max(len(series), 1))
+    for i, (name, values) in enumerate(series.items()):
+        offset = (i - len(series) / 2) * width
+        ax.bar(x + offset, np.array(values, dtype=float), width, label=name, alpha=0.8)
+    ax.set_ylabel(options.get("ylabel", "Accuracy"), fontsize=12, fontweight='bold')
+    ax.set_xlabel(options.get("xlabel", ""), fontsize=12, fontweight='bold')
+    ax.set_title(options.get("title", ""), fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(groups, rotation=options.get("rotation", 0), ha='right' if options.get("rotation") else 'center')
+    ax.set_ylim([0, 1.0])
+    ax.grid(axis='y', alpha=0.3)
+    if options.get("legend_outside"):
+        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', ncol=1, fontsize=8)
+    else:
+        ax.legend(title=options.get("legend_title"))
+    plt.tight_layout()
+    return fig
+
+
+def _draw_heatmap(spec: Spec):
+    data, options = spec["data"], spec["options"]
+    fig, ax = plt.subplots(figsize=options.get("figsize", (10, 6)))
+    matrix = np.array(data["values"], dtype=float)
+    sns.heatmap(matrix, annot=True, fmt='.2%', cmap='RdYlGn',
+                xticklabels=data["columns"], yticklabels=data["rows"],
+                cbar_kws={'label': 'Accuracy'}, ax=ax, linewidths=0.5)
+    ax.set_title(options.get("title", ""), fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel(options.get("xlabel", ""), fontsize=12, fontweight='bold')
+    ax.set_ylabel(options.get("ylabel", ""), fontsize=12, fontweight='bold')
+    plt.tight_layout()
+    return fig
+
+
+def _draw_barh(spec: Spec):
+    data, options = spec["data"], spec["options"]
+    fig, ax = plt.subplots(figsize=options.get("figsize", (12, 6)))
+    colors = plt.cm.viridis(np.linspace(0, 1, len(data["labels"])))
+    bars = ax.barh(data["labels"], np.array(data["values"], dtype=float), color=colors, edgecolor='black', linewidth=1.5)
+    ax.set_xlabel(options.get("xlabel", "Average Accuracy"), fontsize=12, fontweight='bold')
+    ax.set_title(options.get("title", ""), fontsize=14, fontweight='bold')
+    ax.set_xlim([0, 1.0])
+    ax.grid(axis='x', alpha=0.3)
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width, bar.get_y() + bar.get_height() / 2.,
+                f'{width:.1%}', ha='left', va='center', fontweight='bold', fontsize=10)
+    plt.tight_layout()
+    return fig
+
+
+RENDERERS = {
+    "bar": _draw_bar,
+    "grouped_bar": _draw_grouped_bar,
+    "heatmap": _draw_heatmap,
+    "barh": _draw_barh,
+}
+
+
+def draw(spec: Spec):
+    """
+    Draws one figure spec and returns the matplotlib figure.
+    """
+    return RENDERERS[spec["kind"]](spec)
+
+
+def _ordered(values: pd.Series, order: Optional[List[str]]) -> List[str]:
+    present = [str(v) for v in pd.unique(values.astype(str))]
+    if order is None:
+        return sorted(present)
+    return [name for name in order if name in present]
+
+
+def _floats(values) -> List[Optional[float]]:
+    return [None if pd.isna(v) else float(v) for v in values]
+
+
+def figure_specs(
+    aggregates: Dict[str, pd.DataFrame],
+    models: Optional[List[str]] = None,
+    techniques: Optional[List[str]] = None,
+    domains: Optional[List[str]] = None,
+) -> Dict[str, Spec]:
+    """
+    Builds the standard figure specs from the output of ``aggregate``.
+
+    A spec is plain data ({"kind", "data", "options"}), so it can be hashed to detect
+    unchanged figures and sent to worker processes.
+
+    Args:
+        aggregates: The aggregates returned by ``aggregate``.
+        models: Model order. Defaults to the models present, sorted.
+        techniques: Technique order. Defaults to the techniques present, sorted.
+        domains: Domain order. Defaults to the domains present, sorted.
+
+    Returns:
+        {file name: spec}.
+    """
+    by_model = aggregates["by_model"].assign(model=lambda d: d["model"].astype(str)).set_index("model")
+    by_technique = aggregates["by_technique"].assign(technique=lambda d: d["technique"].astype(str)).set_index("technique")
+    matrix = aggregates["model_technique"].astype({"model": str, "technique": str})
+    models = _ordered(matrix["model"], models)
+    techniques = _ordered(matrix["technique"], techniques)
+    specs = {
+        "accuracy_by_technique.png": {
+            "kind": "bar",
+            "data": {"labels": techniques, "values": _floats(by_technique["accuracy"].reindex(techniques))},
+            "options": {"xlabel": "Technique", "title": "Overall Accuracy by Technique\n(All Models & Domains)"},
+        },
+        "accuracy_by_model.png": {
+            "kind": "bar",
+            "data": {"labels": models, "values": _floats(by_model["accuracy"].reindex(models))},
+            "options": {"xlabel": "Model", "title": "Overall Accuracy by Model\n(All Techniques & Domains)"},
+        },
+        "model_technique_heatmap.png": {
+            "kind": "heatmap",
+            "data": {
+                "rows": models,
+                "columns": techniques,
+                "values": [
+                    _floats(row) for row in
+                    matrix.pivot(index="model", columns="technique", values="accuracy")
+                    .reindex(index=models, columns=techniques).to_numpy()
+                ],
+            },
+            "options": {"title": "Accuracy: Model × Technique Heatmap", "xlabel": "Technique", "ylabel": "Model"},
+        },
+    }
+
+    per_domain = aggregates.get("domain_model_technique")
+    if per_domain is not None and len(per_domain):
+        per_domain = per_domain.astype({"domain": str, "model": str, "technique": str})
+        domains = _ordered(per_domain["domain"], domains)
+        table = per_domain.pivot_table(index="domain", columns=["model", "technique"], values="accuracy", observed=True)
+        table = table.reindex(domains)
+        specs["domain_performance.png"] = {
+            "kind": "grouped_bar",
+            "data": {
+                "groups": domains,
+                "series": {
+                    f"{model}-{technique}": _floats(table[(model, technique)])
+                    for model in models for technique in techniques if (model, technique) in table.columns
+                },
+            },
+            "options": {"xlabel": "Domain", "title": "Accuracy by Domain (All Model-Technique Combinations)",
+                        "rotation": 45, "legend_outside": True},
+        }
+        domain_avg = per_domain.groupby("domain")["accuracy"].mean().sort_values(ascending=False)
+        specs["domain_aggregate.png"] = {
+            "kind": "barh",
+            "data": {"labels": list(domain_avg.index), "values": _floats(domain_avg)},
+            "options": {"title": "Average Accuracy by Domain\n(Across All Models & Techniques)"},
+        }
+    return specs
+
+
+def spec_hash(spec: Spec, dpi: int) -> str:
+    """
+    Hashes a figure spec and its resolution; equal hashes mean an identical image.
+    """
+    payload = json.dumps({"spec": spec, "dpi": dpi}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _render(spec: Spec, path: str, dpi: int) -> str:
+    fig = draw(spec)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def render_figures(
+    specs: Dict[str, Spec],
+    output_dir: str,
+    dpi: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, str]:
+    """
+    Renders figure specs to PNG files, skipping figures whose input data is unchanged.
+
+    A manifest of spec hashes is kept in ``output_dir``; a figure is redrawn only when its
+    hash changed or its file is missing. Independent figures are rendered in a process pool.
+
+    Args:
+        specs: {file name: spec}.
+        output_dir: Directory to write the PNG files to.
+        dpi: Output resolution. Defaults to ``plotting.dpi``.
+        max_workers: The number of rendering processes; 1 renders in-process. Defaults to
+            ``performance.process_workers``.
+        force: Redraw every figure.
+
+    Returns:
+        {path: "rendered" or "unchanged"}.
+    """
+    settings = get_settings()
+    dpi = dpi or settings.plotting.dpi
+    max_workers = max_workers or settings.performance.process_workers
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+    hashes = {name: spec_hash(spec, dpi) for name, spec in specs.items()}
+    todo = [
+        name for name in specs
+        if force or manifest.get(name) != hashes[name] or not os.path.exists(os.path.join(output_dir, name))
+    ]
+    status = {os.path.join(output_dir, name): "unchanged" for name in specs}
+
+    paths = [os.path.join(output_dir, name) for name in todo]
+    if len(todo) > 1 and max_workers != 1:
+        workers = min(len(todo), max_workers or os.cpu_count() or 1)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_render, [specs[name] for name in todo], paths, [dpi] * len(todo)))
+    else:
+        for name, path in zip(todo, paths):
+            _render(specs[name], path, dpi)
+
+    for name, path in zip(todo, paths):
+        manifest[name] = hashes[name]
+        status[path] = "rendered"
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return status
+
+
+def load_aggregates(results_path: str) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Loads aggregates from structured results: a Parquet results store with a ``score``
+    column, or the ``aggregate_<name>.csv`` files written by ``aggregate-results``.
+
+    Returns:
+        The aggregates, or None if ``results_path`` holds neither.
+    """
+    if is_results_store(results_path) and "score" in store_columns(results_path):
+        return aggregate(read_results(results_path, columns=["question_id", "model", "technique", "score"]))
+    paths = glob.glob(os.path.join(results_path, "aggregate_*.csv"))
+    if not any(p.endswith("aggregate_model_technique.csv") for p in paths):
+        return None
+    return {
+        os.path.basename(p)[len("aggregate_"):-len(".csv")]: pd.read_csv(p)
+        for p in paths
+    }
+
+
+def parse_report(report_path: str) -> Dict[str, pd.DataFrame]:
+    """
+    Parses the accuracy/F1 table of ANALYSIS_REPORT.md into long frames.
+
+    Returns:
+        {"Accuracy": frame, "F1-Score": frame}, each with LLM, Technique and the metric.
+    """
     with open(report_path, 'r') as f:
         lines = f.readlines()
 
-    accuracy_data = []
-    f1_data = []
-    
+    rows = {"Accuracy": [], "F1-Score": []}
     # Flag to indicate when we are in the data table
     in_data_section = False
-    
-    for line_num, line in enumerate(lines):
-        if "| LLM | Metric |" in line: # Found the header for the new format
+    for line in lines:
+        if "| LLM | Metric |" in line:  # Found the header for the new format
             in_data_section = True
             continue
-        if in_data_section and "|---|" in line: # Skip the separator line
+        if in_data_section and "|---|" in line:  # Skip the separator line
             continue
-        if in_data_section and line.strip() == "": # End of data section
+        if in_data_section and line.strip() == "":  # End of data section
             in_data_section = False
             continue
-        
         if in_data_section:
             parts = [p.strip() for p in line.split('|') if p.strip() != '']
-            if len(parts) >= 6: # Expecting LLM, Metric, and 4 technique scores
-                llm = parts[0]
-                metric_type = parts[1]
-                
-                row_scores = {}
-                techniques_list = ["baseline", "few_shot", "cot", "react"] # Order of techniques in the report
-                
-                for i, technique in enumerate(techniques_list):
-                    score_str = parts[2 + i]
+            if len(parts) >= 6 and parts[1] in rows:  # Expecting LLM, Metric, and 4 technique scores
+                for i, technique in enumerate(REPORT_TECHNIQUES):
                     try:
-                        score = float(score_str)
+                        score = float(parts[2 + i])
                     except ValueError:
-                        score = None # Use None for "N/A" or other non-float values
-                    row_scores[technique] = score
-                
-                if metric_type == "Accuracy":
-                    for technique, score in row_scores.items():
-                        if score is not None:
-                            accuracy_data.append({'LLM': llm, 'Technique': technique, 'Accuracy': score})
-                elif metric_type == "F1-Score":
-                    for technique, score in row_scores.items():
-                        if score is not None:
-                            f1_data.append({'LLM': llm, 'Technique': technique, 'F1-Score': score})
-    
-    if not accuracy_data:
-        print("No valid accuracy data found in ANALYSIS_REPORT.md for plotting.")
-        return
-
-    df_accuracy = pd.DataFrame(accuracy_data)
-
-    plt.figure(figsize=(12, 6))
-    sns.barplot(x='LLM', y='Accuracy', hue='Technique', data=df_accuracy)
-    plt.title('Accuracy of Prompt Engineering Techniques by LLM')
-    plt.ylim(0, 1)
-    plt.ylabel('Accuracy')
-    plt.xlabel('LLM')
-    plt.legend(title='Technique')
-    plt.grid(axis='y', linestyle='--')
-    plt.tight_layout()
+                        continue  # "N/A" or other non-float values
+                    rows[parts[1]].append({'LLM': parts[0], 'Technique': technique, parts[1]: score})
+    return {metric: pd.DataFrame(data) for metric, data in rows.items()}
+
+
+def _report_spec(df: pd.DataFrame, metric: str) -> Spec:
+    llms = list(pd.unique(df['LLM']))
+    table = df.pivot(index='LLM', columns='Technique', values=metric).reindex(llms)
+    return {
+        "kind": "grouped_bar",
+        "data": {
+            "groups": llms,
+            "series": {t: _floats(table[t]) for t in REPORT_TECHNIQUES if t in table.columns},
+        },
+        "options": {"figsize": (12, 6), "xlabel": "LLM", "ylabel": metric, "legend_title": "Technique",
+                    "title": f"{metric} of Prompt Engineering Techniques by LLM"},
+    }
+
+
+def default_output_dir(results_path: str) -> str:
+    """
+    Returns where figures of ``results_path`` go by default: the results directory itself,
+    or the directory containing a results file or a Parquet results store, whose
+    directory must hold only partitions.
+    """
+    if is_results_store(results_path) or os.path.isfile(results_path):
+        return os.path.dirname(os.path.normpath(results_path)) or "."
+    return results_path
+
+
+def plot_results_function(
+    results_path: str,
+    output_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+):
+    """
+    Generates plots from the evaluation results.
+
+    Aggregates are read from the structured results when ``results_path`` holds them
+    (see ``load_aggregates``); otherwise the table in ANALYSIS_REPORT.md is plotted.
+
+    Args:
+        results_path: The results directory or Parquet results store.
+        output_dir: Where to write the figures. Defaults to ``default_output_dir``.
+        max_workers: The number of rendering processes.
+        force: Redraw figures even if their data is unchanged.
+    """
+    output_dir = output_dir or default_output_dir(results_path)
+    if is_results_store(output_dir):
+        raise ValueError(f"Refusing to write figures into the results store {output_dir}.")
+    aggregates = load_aggregates(results_path)
+    if aggregates is not None:
+        specs = figure_specs(aggregates)
+    else:
+        report_path = os.path.join(results_path, 'ANALYSIS_REPORT.md')
+        metrics = parse_report(report_path)
+        if metrics["Accuracy"].empty:
+            print("No valid accuracy data found in ANALYSIS_REPORT.md for plotting.")
+            return
+        specs = {'accuracy_comparison.png': _report_spec(metrics["Accuracy"], "Accuracy")}
+        if not metrics["F1-Score"].empty:
+            specs['f1_score_comparison.png'] = _report_spec(metrics["F1-Score"], "F1-Score")
 
-    # Save the plot
-    output_path = os.path.join(results_path, 'accuracy_comparison.png')
-    plt.savefig(output_path)
-    print(f'Plot saved to {output_path}')
-
-    # Optionally, you can generate a plot for F1-Score as well
-    if f1_data:
-        df_f1 = pd.DataFrame(f1_data)
-        plt.figure(figsize=(12, 6))
-        sns.barplot(x='LLM', y='F1-Score', hue='Technique', data=df_f1)
-        plt.title('F1-Score of Prompt Engineering Techniques by LLM')
-        plt.ylim(0, 1)
-        plt.ylabel('F1-Score')
-        plt.xlabel('LLM')
-        plt.legend(title='Technique')
-        plt.grid(axis='y', linestyle='--')
-        plt.tight_layout()
-        output_path_f1 = os.path.join(results_path, 'f1_score_comparison.png')
-        plt.savefig(output_path_f1)
-        print(f'F1-Score Plot saved to {output_path_f1}')
\ No newline at end of file
+    for path, state in render_figures(specs, output_dir, max_workers=max_workers, force=force).items():
+        print(f'Plot {"saved to" if state == "rendered" else "unchanged:"} {path}')
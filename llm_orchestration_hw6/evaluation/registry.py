@@ -0,0 +1,247 @@
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import uuid
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+DEFAULT_REGISTRY_PATH = "outputs/runs.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    config_hash TEXT,
+    dataset_hash TEXT,
+    versions TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at);
+CREATE INDEX IF NOT EXISTS runs_config_hash ON runs (config_hash);
+CREATE TABLE IF NOT EXISTS aggregates (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    model TEXT NOT NULL,
+    technique TEXT NOT NULL,
+    accuracy REAL,
+    questions INTEGER,
+    latency_ms REAL,
+    PRIMARY KEY (run_id, model, technique)
+);
+CREATE INDEX IF NOT EXISTS aggregates_combination ON aggregates (model, technique);
+"""
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> Optional[str]:
+    """
+    Returns the SHA-256 of a file read in chunks, or None if it does not exist.
+
+    A directory (e.g. a Parquet results store) is hashed as the sorted relative paths
+    of the files under it together with their contents.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.relpath(os.path.join(root, name), path).replace(os.sep, "/")
+            for root, _, names in os.walk(path)
+            for name in names
+        )
+    else:
+        files = [None]
+    digest = hashlib.sha256()
+    for relative in files:
+        if relative is not None:
+            digest.update(relative.encode("utf-8") + b"\0")
+        with open(path if relative is None else os.path.join(path, relative), "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_hash(config: Dict) -> str:
+    """
+    Returns a stable SHA-256 of a configuration mapping.
+    """
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class RunRegistry:
+    """
+    SQLite index of evaluation runs and their per model x technique aggregates.
+    """
+
+    def __init__(self, path: str = DEFAULT_REGISTRY_PATH):
+        """
+        Opens (and creates, if needed) the registry database.
+
+        Args:
+            path: The SQLite file.
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation, committed on success and always closed.
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record_run(
+        self,
+        model_technique: pd.DataFrame,
+        config_hash: Optional[str] = None,
+        dataset_hash: Optional[str] = None,
+        versions: Optional[Dict[str, str]] = None,
+        label: Optional[str] = None,
+        run_id: Optional[str] = None,
+        created_at: Optional[str] = None,
+    ) -> str:
+        """
+        Records one run and its aggregates.
+
+        Args:
+            model_technique: One row per combination with model, technique, accuracy and
+                optionally questions and latency_ms (e.g. ``aggregate(...)["model_technique"]``).
+            config_hash: Hash of the configuration used for the run.
+            dataset_hash: Hash of the dataset the run was graded against.
+            versions: Provider/model versions, e.g. {"GPT": "gpt-4o-2024-08-06"}.
+            label: A free-form label.
+            run_id: The run id. Defaults to a timestamped random id.
+            created_at: ISO timestamp of the run. Defaults to now (UTC).
+
+        Returns:
+            The run id.
+        """
+        created_at = created_at or datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        run_id = run_id or f"{created_at[:10].replace('-', '')}-{uuid.uuid4().hex[:8]}"
+        rows = [
+            (
+                run_id,
+                str(row["model"]),
+                str(row["technique"]),
+                _float(row.get("accuracy")),
+                None if pd.isna(row.get("questions")) else int(row.get("questions")),
+                _float(row.get("latency_ms")),
+            )
+            for row in model_technique.to_dict("records")
+        ]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, created_at, label, config_hash, dataset_hash, versions) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, created_at, label, config_hash, dataset_hash, json.dumps(versions or {}, sort_keys=True)),
+            )
+            conn.executemany(
+                "INSERT INTO aggregates (run_id, model, technique, accuracy, questions, latency_ms) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return run_id
+
+    def list_runs(self, limit: int = 20) -> pd.DataFrame:
+        """
+        Returns the most recent runs, newest first.
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT run_id, created_at, label, config_hash, dataset_hash, versions FROM runs "
+                "ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                conn,
+                params=(limit,),
+            )
+
+    def latest_run(self, before: Optional[str] = None, exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the id of the newest run, optionally created at or before ``before`` (ISO
+        timestamp) and other than ``exclude``.
+        """
+        query = "SELECT run_id FROM runs WHERE (? IS NULL OR created_at <= ?) AND (? IS NULL OR run_id != ?) "
+        query += "ORDER BY created_at DESC, rowid DESC LIMIT 1"
+        with self._connect() as conn:
+            row = conn.execute(query, (before, before, exclude, exclude)).fetchone()
+        return row[0] if row else None
+
+    def run_aggregates(self, run_id: str) -> pd.DataFrame:
+        """
+        Returns the aggregates of one run.
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT model, technique, accuracy, questions, latency_ms FROM aggregates WHERE run_id = ? "
+                "ORDER BY model, technique",
+                conn,
+                params=(run_id,),
+            )
+
+    def history(self, model: str, technique: str, limit: int = 50) -> pd.DataFrame:
+        """
+        Returns the accuracy and latency of one combination across runs, newest first.
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT r.run_id, r.created_at, a.accuracy, a.latency_ms FROM aggregates a "
+                "JOIN runs r ON r.run_id = a.run_id WHERE a.model = ? AND a.technique = ? "
+                "ORDER BY r.created_at DESC LIMIT ?",
+                conn,
+                params=(model, technique, limit),
+            )
+
+    def compare(
+        self,
+        baseline_run: str,
+        candidate_run: str,
+        accuracy_tolerance: float = 0.0,
+        latency_tolerance: float = 0.0,
+    ) -> pd.DataFrame:
+        """
+        Compares the aggregates of two runs combination by combination.
+
+        Args:
+            baseline_run: The earlier (reference) run.
+            candidate_run: The run being checked.
+            accuracy_tolerance: Absolute accuracy drops up to this size are not flagged.
+            latency_tolerance: Latency increases up to this fraction of the baseline
+                latency are not flagged.
+
+        Returns:
+            A frame with model, technique, accuracy/latency of both runs, their deltas and a
+            ``regressed`` flag.
+        """
+        with self._connect() as conn:
+            df = pd.read_sql_query(
+                "SELECT b.model, b.technique, b.accuracy AS accuracy_baseline, c.accuracy AS accuracy_candidate, "
+                "b.latency_ms AS latency_baseline, c.latency_ms AS latency_candidate "
+                "FROM aggregates b JOIN aggregates c ON c.model = b.model AND c.technique = b.technique "
+                "WHERE b.run_id = ? AND c.run_id = ? ORDER BY b.model, b.technique",
+                conn,
+                params=(baseline_run, candidate_run),
+            )
+        numeric = ["accuracy_baseline", "accuracy_candidate", "latency_baseline", "latency_candidate"]
+        df[numeric] = df[numeric].apply(pd.to_numeric)
+        df["accuracy_delta"] = df["accuracy_candidate"] - df["accuracy_baseline"]
+        df["latency_delta"] = df["latency_candidate"] - df["latency_baseline"]
+        slower = df["latency_delta"] > df["latency_baseline"].abs() * latency_tolerance
+        df["regressed"] = (df["accuracy_delta"] < -accuracy_tolerance) | slower.fillna(False)
+        return df
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def parse_versions(text: str) -> Dict[str, str]:
+    """
+    Parses "GPT=gpt-4o,Grok=grok-2" into {"GPT": "gpt-4o", "Grok": "grok-2"}.
+    """
+    pairs = [item.split("=", 1) for item in text.split(",") if "=" in item]
+    return {key.strip(): value.strip() for key, value in pairs}
@@ -0,0 +1,199 @@
+import concurrent.futures
+import itertools
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from llm_orchestration_hw6.config.settings import get_settings
+
+N_RESAMPLES = 10_000
+# Resamples are drawn in blocks so each gathered block stays around this many values.
+_MAX_BLOCK_ENTRIES = 5_000_000
+
+
+def _score_matrix(long_df: pd.DataFrame, by: Tuple[str, ...] = ("model", "technique")) -> pd.DataFrame:
+    """
+    Pivots long scores into a questions x combinations matrix.
+    """
+    return long_df.pivot_table(index="question_id", columns=list(by), values="score", observed=True)
+
+
+def bootstrap_ci(
+    scores: np.ndarray,
+    n_resamples: int = N_RESAMPLES,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0,
+) -> np.ndarray:
+    """
+    Percentile bootstrap confidence intervals for the mean of each column.
+
+    All columns share one resampling index matrix (n_resamples x n_questions), so
+    questions stay paired across columns and the work is a single gather and mean.
+
+    Args:
+        scores: A (n_questions,) or (n_questions, n_columns) array of per-question scores.
+        n_resamples: The number of bootstrap resamples.
+        confidence: The confidence level of the interval.
+        seed: Seed for the random generator.
+
+    Returns:
+        An (n_columns, 3) array of [mean, lower, upper]; a (3,) array for 1-D input.
+    """
+    scores = np.asarray(scores, dtype=float)
+    squeeze = scores.ndim == 1
+    if squeeze:
+        scores = scores[:, None]
+    n = scores.shape[0]
+    rng = np.random.default_rng(seed)
+
+    block = max(1, _MAX_BLOCK_ENTRIES // max(n * scores.shape[1], 1))
+    means = []
+    for start in range(0, n_resamples, block):
+        size = min(block, n_resamples - start)
+        index = rng.integers(0, n, size=(size, n))
+        means.append(np.nanmean(scores[index], axis=1))
+    means = np.concatenate(means)
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(means, [alpha, 1 - alpha], axis=0)
+    result = np.column_stack([np.nanmean(scores, axis=0), lower, upper])
+    return result[0] if squeeze else result
+
+
+def paired_permutation_test(
+    a: np.ndarray,
+    b: np.ndarray,
+    n_permutations: int = N_RESAMPLES,
+    seed: Optional[int] = 0,
+) -> float:
+    """
+    Two-sided paired permutation (sign-flip) test for a difference in mean score.
+
+    Args:
+        a: Per-question scores of the first combination.
+        b: Per-question scores of the second combination, aligned with ``a``.
+        n_permutations: The number of random sign flips.
+        seed: Seed for the random generator.
+
+    Returns:
+        The p-value.
+    """
+    diff = np.asarray(a, dtype=float) - np.asarray(b, dtype=float)
+    diff = diff[~np.isnan(diff)]
+    if diff.size == 0 or not diff.any():
+        return 1.0
+    observed = abs(diff.mean())
+    rng = np.random.default_rng(seed)
+    signs = rng.choice(np.array([-1.0, 1.0]), size=(n_permutations, diff.size))
+    permuted = np.abs(signs @ diff) / diff.size
+    return float((np.count_nonzero(permuted >= observed - 1e-12) + 1) / (n_permutations + 1))
+
+
+def mcnemar_test(a: np.ndarray, b: np.ndarray, threshold: float = 1.0) -> Tuple[int, int, float]:
+    """
+    Exact McNemar test on paired correct/incorrect outcomes.
+
+    Args:
+        a: Per-question scores of the first combination.
+        b: Per-question scores of the second combination, aligned with ``a``.
+        threshold: Scores at or above this value count as correct.
+
+    Returns:
+        (questions only ``a`` got right, questions only ``b`` got right, p-value).
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    valid = ~(np.isnan(a) | np.isnan(b))
+    correct_a = a[valid] >= threshold
+    correct_b = b[valid] >= threshold
+    only_a = int(np.count_nonzero(correct_a & ~correct_b))
+    only_b = int(np.count_nonzero(correct_b & ~correct_a))
+    discordant = only_a + only_b
+    if discordant == 0:
+        return only_a, only_b, 1.0
+    tail = sum(math.comb(discordant, k) for k in range(min(only_a, only_b) + 1)) / 2 ** discordant
+    return only_a, only_b, min(1.0, 2 * tail)
+
+
+def confidence_intervals(long_df: pd.DataFrame, n_resamples: int = N_RESAMPLES, confidence: float = 0.95) -> pd.DataFrame:
+    """
+    Bootstrap confidence intervals for the accuracy of every model x technique combination.
+
+    Returns:
+        A frame with model, technique, accuracy, ci_lower and ci_upper.
+    """
+    matrix = _score_matrix(long_df)
+    ci = bootstrap_ci(matrix.to_numpy(), n_resamples=n_resamples, confidence=confidence)
+    result = matrix.columns.to_frame(index=False)
+    result[["accuracy", "ci_lower", "ci_upper"]] = ci
+    return result
+
+
+def pairwise_tests(long_df: pd.DataFrame, n_permutations: int = N_RESAMPLES) -> pd.DataFrame:
+    """
+    Compares every pair of techniques within each model on the same questions.
+
+    Returns:
+        A frame with model, technique_a, technique_b, mean_diff, permutation_p,
+        only_a_correct, only_b_correct and mcnemar_p.
+    """
+    matrix = _score_matrix(long_df)
+    rows = []
+    for model in matrix.columns.get_level_values("model").unique():
+        block = matrix[model]
+        for tech_a, tech_b in itertools.combinations(block.columns, 2):
+            a, b = block[tech_a].to_numpy(), block[tech_b].to_numpy()
+            only_a, only_b, mcnemar_p = mcnemar_test(a, b)
+            rows.append({
+                "model": model,
+                "technique_a": tech_a,
+                "technique_b": tech_b,
+                "mean_diff": np.nanmean(a - b),
+                "permutation_p": paired_permutation_test(a, b, n_permutations),
+                "only_a_correct": only_a,
+                "only_b_correct": only_b,
+                "mcnemar_p": mcnemar_p,
+            })
+    return pd.DataFrame(rows)
+
+
+def summarize(long_df: pd.DataFrame, n_resamples: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Computes confidence intervals and pairwise tests for one score table. ``n_resamples``
+    defaults to ``performance.bootstrap_resamples``.
+    """
+    n_resamples = n_resamples or get_settings().performance.bootstrap_resamples
+    return {
+        "confidence_intervals": confidence_intervals(long_df, n_resamples),
+        "pairwise_tests": pairwise_tests(long_df, n_resamples),
+    }
+
+
+def summarize_many(
+    datasets: Dict[str, pd.DataFrame],
+    n_resamples: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Runs ``summarize`` for several score tables, one process per table.
+
+    Args:
+        datasets: {name: long-format score table}.
+        n_resamples: The number of bootstrap resamples and permutations. Defaults to
+            ``performance.bootstrap_resamples``.
+        max_workers: The number of worker processes. Defaults to ``performance.process_workers``
+            (the CPU count when unset).
+
+    Returns:
+        {name: summarize(...) result}.
+    """
+    performance = get_settings().performance
+    n_resamples = n_resamples or performance.bootstrap_resamples
+    max_workers = max_workers or performance.process_workers
+    if len(datasets) <= 1:
+        return {name: summarize(df, n_resamples) for name, df in datasets.items()}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(summarize, df, n_resamples) for name, df in datasets.items()}
+        return {name: future.result() for name, future in futures.items()}
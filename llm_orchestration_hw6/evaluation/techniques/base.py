@@ -1,11 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+from llm_orchestration_hw6.llms.router import is_error_response
+from llm_orchestration_hw6.llms.streaming import IncrementalAnswerExtractor, stop_on_answer
+from llm_orchestration_hw6.llms.tokens import MaxTokensEstimator, count_tokens
 
 class BaseEvaluator(ABC):
     """
     Abstract base class for all evaluators.
     """
 
+    # Line prefixes that introduce the final answer in this technique's responses.
+    # An empty prefix treats the first non-empty line as the answer.
+    answer_prefixes: Tuple[str, ...] = ("Answer:",)
+
+    def __init__(self, stream: bool = False, max_tokens_estimator: Optional[MaxTokensEstimator] = None):
+        """
+        Initializes the evaluator.
+
+        Args:
+            stream: Whether to stream responses and cancel generation once the answer is complete.
+            max_tokens_estimator: Sizes ``max_tokens`` from this technique's observed output
+                lengths, for clients that accept a per-request ``max_tokens``.
+        """
+        self.stream = stream
+        self.max_tokens_estimator = max_tokens_estimator
+
     @abstractmethod
     def evaluate(self, question: str, llm_client: Optional[Any] = None) -> Dict:
         """
@@ -19,3 +39,55 @@ class BaseEvaluator(ABC):
             A dictionary containing the evaluation results.
         """
         pass
+
+    def should_stop(self, extractor: IncrementalAnswerExtractor) -> bool:
+        """
+        Technique-specific stop condition used when streaming responses.
+        """
+        return stop_on_answer(extractor)
+
+    def _query(
+        self,
+        prompt: str,
+        llm_client: Optional[Any],
+        cache_prefix: Optional[str] = None,
+        question: Optional[str] = None,
+    ) -> str:
+        """
+        Sends the prompt to the LLM client, streaming if enabled and supported by the client.
+
+        Args:
+            prompt: The full prompt.
+            llm_client: The LLM client to use, or None to skip the query.
+            cache_prefix: The static leading part of the prompt, passed on to clients that
+                support prompt caching.
+            question: The question the prompt asks; semantic caches look responses up by
+                it rather than by the whole prompt.
+        """
+        if not llm_client:
+            return ""
+        kwargs = {}
+        if cache_prefix and getattr(llm_client, "supports_prompt_cache", False):
+            kwargs["cache_prefix"] = cache_prefix
+        technique = type(self).__name__
+        if self.max_tokens_estimator and getattr(llm_client, "supports_max_tokens", False):
+            kwargs["max_tokens"] = self.max_tokens_estimator.estimate(technique, llm_client.max_tokens)
+        if self.stream and hasattr(llm_client, "stream_query"):
+            response = llm_client.stream_query(
+                prompt,
+                stop_condition=self.should_stop,
+                extractor=IncrementalAnswerExtractor(self.answer_prefixes),
+                **kwargs,
+            )
+        else:
+            if question and getattr(llm_client, "supports_semantic_cache", False):
+                kwargs["cache_key"] = question
+                kwargs["cache_namespace"] = technique
+            response = llm_client.query(prompt, **kwargs)
+        if self.max_tokens_estimator and not is_error_response(response):
+            output_tokens = count_tokens(response, getattr(llm_client, "model", None))
+            # A response as long as the cap was most likely cut off by it.
+            cap = kwargs.get("max_tokens") or getattr(llm_client, "max_tokens", None)
+            truncated = bool(cap) and output_tokens >= cap
+            self.max_tokens_estimator.observe(technique, output_tokens, truncated=truncated)
+        return response
@@ -7,6 +7,9 @@ class BaselineEvaluator(BaseEvaluator):
     Evaluator for the baseline prompt engineering technique.
     """
 
+    # The prompt ends with "Answer:", so the first non-empty line is the answer.
+    answer_prefixes = ("",)
+
     def evaluate(self, question: str, llm_client: Optional[Any] = None) -> Dict:
         """
         Evaluates a question using the baseline prompt engineering technique.
@@ -20,10 +23,7 @@ class BaselineEvaluator(BaseEvaluator):
         """
         prompt = f"Question: {question}\nAnswer:"
         
-        if llm_client:
-            response = llm_client.query(prompt)
-        else:
-            response = ""
+        response = self._query(prompt, llm_client, question=question)
 
         return {
             "prompt": prompt,
@@ -25,10 +25,7 @@ Step 1: ...
 Step 2: ...
 Answer:"""
         
-        if llm_client:
-            response = llm_client.query(prompt)
-        else:
-            response = ""
+        response = self._query(prompt, llm_client, question=question)
 
         return {
             "prompt": prompt,
@@ -0,0 +1,125 @@
+import collections
+import threading
+from typing import Any, Dict, List, Optional, OrderedDict, Sequence, Tuple
+
+import numpy as np
+
+from llm_orchestration_hw6.data.loader import question_text
+from llm_orchestration_hw6.evaluation.metrics.encoders import get_encoder
+
+
+class ExampleSelector:
+    """
+    Picks the few-shot examples most similar to each question from a pool of solved
+    examples.
+
+    The pool is embedded once into a matrix of unit vectors; questions are embedded in
+    batches and scored against the whole pool with one matrix product (a brute-force
+    cosine index, which is exact and fast for pools up to ~100k examples). Selections
+    are cached per question text, so repeated questions cost a dictionary lookup.
+    """
+
+    def __init__(
+        self,
+        examples: Sequence[Tuple[str, str]],
+        k: int = 2,
+        encoder: Optional[Any] = None,
+        cache_size: int = 100_000,
+        batch_size: int = 1024,
+    ):
+        """
+        Initializes the selector and embeds the example pool.
+
+        Args:
+            examples: The pool of (question, answer) examples.
+            k: The examples selected per question.
+            encoder: Turns texts into unit vectors via ``encode(texts)``. Defaults to the
+                shared sentence-transformer encoder.
+            cache_size: Selections kept in the per-question LRU cache.
+            batch_size: Questions embedded and scored per matrix product.
+        """
+        if not examples:
+            raise ValueError("ExampleSelector needs at least one example")
+        self.examples = [(str(q), str(a)) for q, a in examples]
+        self.k = min(k, len(self.examples))
+        self.encoder = encoder or get_encoder()
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._keys = [question_text(q) for q, _ in self.examples]
+        self.index = np.asarray(self.encoder.encode([q for q, _ in self.examples]), dtype=np.float32)
+        self._cache: OrderedDict[str, Tuple[int, ...]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Dict],
+        question_key: str = "question",
+        answer_key: str = "ground_truth_answer",
+        **kwargs,
+    ) -> "ExampleSelector":
+        """
+        Builds a selector from dataset rows, e.g. the output of ``load_dataset``.
+        """
+        return cls([(row[question_key], row[answer_key]) for row in records], **kwargs)
+
+    def select(self, question: str) -> List[Tuple[str, str]]:
+        """
+        Returns the examples for one question, most similar first.
+        """
+        return self.select_many([question])[0]
+
+    def select_many(self, questions: Sequence[str]) -> List[List[Tuple[str, str]]]:
+        """
+        Returns the examples for each question, most similar first.
+
+        Uncached questions are embedded and scored together, so warming the cache with
+        the whole dataset up front costs a few batched matrix products.
+        """
+        keys = [question_text(q) for q in questions]
+        with self._lock:
+            missing = list(dict.fromkeys(key for key in keys if key not in self._cache))
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            selections = self._search(batch)
+            with self._lock:
+                for key, selection in zip(batch, selections):
+                    self._cache[key] = selection
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        results = []
+        with self._lock:
+            for key in keys:
+                selection = self._cache.get(key)
+                if selection is None:  # evicted by a larger batch in the meantime
+                    selection = self._search([key])[0]
+                else:
+                    self._cache.move_to_end(key)
+                results.append([self.examples[i] for i in selection])
+        return results
+
+    def _search(self, keys: List[str]) -> List[Tuple[int, ...]]:
+        """
+        Returns the indices of the top-k examples for each question.
+
+        One extra candidate is retrieved so that an example whose question is the query
+        itself can be dropped without leaking its answer into the prompt.
+        """
+        queries = np.asarray(self.encoder.encode(keys), dtype=np.float32)
+        scores = queries @ self.index.T
+        candidates = min(self.k + 1, len(self.examples))
+        if candidates < len(self.examples):
+            top = np.argpartition(-scores, candidates - 1, axis=1)[:, :candidates]
+        else:
+            top = np.tile(np.arange(len(self.examples)), (len(keys), 1))
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1, kind="stable")[:, ::-1]
+        top = np.take_along_axis(top, order, axis=1)
+        return [
+            tuple([int(i) for i in row if self._keys[i] != key][:self.k])
+            for key, row in zip(keys, top)
+        ]
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._cache), "max_size": self.cache_size}
@@ -1,12 +1,99 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
 from llm_orchestration_hw6.evaluation.techniques.base import BaseEvaluator
+from llm_orchestration_hw6.evaluation.techniques.example_selector import ExampleSelector
+from llm_orchestration_hw6.llms.tokens import MaxTokensEstimator, count_tokens, fit_examples
+
+# Default (question, answer) examples, most useful first.
+EXAMPLES: List[Tuple[str, str]] = [
+    ("What is 2+2?", "4"),
+    ("What is capital of France?", "Paris"),
+]
+
+EXAMPLES_HEADER = "\nExamples:\n"
+
+
+def format_example(question: str, answer: str) -> str:
+    return f"Q: {question}\nA: {answer}\n\n"
+
+
+def format_examples(examples: Sequence[Tuple[str, str]]) -> str:
+    """
+    Formats (question, answer) pairs as the few-shot preamble.
+    """
+    return EXAMPLES_HEADER + "".join(format_example(q, a) for q, a in examples)
+
 
 class FewShotEvaluator(BaseEvaluator):
     """
     Evaluator for the few-shot prompt engineering technique.
     """
 
+    # The prompt ends with "Answer:", so the first non-empty line is the answer.
+    answer_prefixes = ("",)
+
+    # Static preamble shared by every question. It comes first so providers can cache it.
+    PROMPT_PREFIX = format_examples(EXAMPLES)
+
+    def __init__(
+        self,
+        examples: Optional[Sequence[Tuple[str, str]]] = None,
+        max_prompt_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        stream: bool = False,
+        max_tokens_estimator: Optional[MaxTokensEstimator] = None,
+        selector: Optional[ExampleSelector] = None,
+    ):
+        """
+        Initializes the evaluator.
+
+        Args:
+            examples: (question, answer) examples, most useful first. Defaults to ``EXAMPLES``.
+            max_prompt_tokens: The prompt token budget. Examples that do not fit next to the
+                question are dropped from the end; None keeps every example.
+            model: The model whose tokenizer counts the budget.
+            stream: Whether to stream responses.
+            max_tokens_estimator: Sizes ``max_tokens`` from observed output lengths.
+            selector: Picks the examples most similar to each question instead of using
+                ``examples`` for every question.
+        """
+        super().__init__(stream=stream, max_tokens_estimator=max_tokens_estimator)
+        self.examples = list(EXAMPLES if examples is None else examples)
+        self.max_prompt_tokens = max_prompt_tokens
+        self.model = model
+        self.selector = selector
+        self._blocks = [format_example(q, a) for q, a in self.examples]
+
+    def warm(self, questions: Sequence[str]):
+        """
+        Selects the examples for many questions in one batch, so later ``evaluate`` calls
+        hit the selector's cache.
+        """
+        if self.selector is not None:
+            self.selector.select_many(questions)
+
+    def prompt_prefix(self, question: str) -> str:
+        """
+        Returns the examples preamble for a question, trimmed to the prompt budget.
+
+        Without a selector the preamble is the same for every question that fits the
+        budget, so it stays a cacheable prompt prefix.
+        """
+        if self.selector is not None:
+            examples = self.selector.select(question)
+            blocks = [format_example(q, a) for q, a in examples]
+        else:
+            examples, blocks = self.examples, self._blocks
+        if self.max_prompt_tokens is None:
+            return format_examples(examples)
+        fixed = count_tokens(EXAMPLES_HEADER, self.model) + count_tokens(self._question_part(question), self.model)
+        kept = fit_examples(blocks, self.max_prompt_tokens - fixed, self.model)
+        return format_examples(examples[:len(kept)])
+
+    @staticmethod
+    def _question_part(question: str) -> str:
+        return f"Question: {question}\nAnswer:"
+
     def evaluate(self, question: str, llm_client: Optional[Any] = None) -> Dict:
         """
         Evaluates a question using the few-shot prompt engineering technique.
@@ -18,21 +105,12 @@ class FewShotEvaluator(BaseEvaluator):
         Returns:
             A dictionary containing the evaluation results.
         """
-        prompt = f"""
-Examples:
-Q: What is 2+2?
-A: 4
-
-Q: What is capital of France?
-A: Paris
+        prefix = self.prompt_prefix(question)
+        prompt = prefix + self._question_part(question)
 
-Question: {question}
-Answer:"""
-        
-        if llm_client:
-            response = llm_client.query(prompt)
-        else:
-            response = ""
+        # Selected examples differ per question, so there is no shared prefix to cache.
+        cache_prefix = prefix if self.selector is None else None
+        response = self._query(prompt, llm_client, cache_prefix=cache_prefix, question=question)
 
         return {
             "prompt": prompt,
@@ -7,6 +7,17 @@ class ReActEvaluator(BaseEvaluator):
     Evaluator for the ReAct prompt engineering technique.
     """
 
+    answer_prefixes = ("Final Answer:", "Answer:")
+
+    # Static preamble shared by every question. It comes first so providers can cache it.
+    PROMPT_PREFIX = """
+You can:
+- Think: reason about the problem
+- Act: perform an action
+- Observe: see the result
+
+"""
+
     def evaluate(self, question: str, llm_client: Optional[Any] = None) -> Dict:
         """
         Evaluates a question using the ReAct prompt engineering technique.
@@ -18,23 +29,14 @@ class ReActEvaluator(BaseEvaluator):
         Returns:
             A dictionary containing the evaluation results.
         """
-        prompt = f"""
-You can:
-- Think: reason about the problem
-- Act: perform an action
-- Observe: see the result
-
-Question: {question}
+        prompt = self.PROMPT_PREFIX + f"""Question: {question}
 
 Think: ...
 Act: ...
 Observe: ...
 Answer:"""
         
-        if llm_client:
-            response = llm_client.query(prompt)
-        else:
-            response = ""
+        response = self._query(prompt, llm_client, cache_prefix=self.PROMPT_PREFIX, question=question)
 
         return {
             "prompt": prompt,
@@ -0,0 +1,148 @@
+import concurrent.futures
+import re
+import time
+from typing import Dict, Any, List, Optional
+
+from llm_orchestration_hw6.config.settings import get_settings
+from llm_orchestration_hw6.data.loader import dedupe_questions
+from llm_orchestration_hw6.evaluation.packing import estimate_tokens
+from llm_orchestration_hw6.evaluation.techniques.base import BaseEvaluator
+from llm_orchestration_hw6.evaluation.tools import ToolRegistry, default_registry
+from llm_orchestration_hw6.llms.streaming import IncrementalAnswerExtractor
+
+# Accepts "tool[arg]", "tool(arg)" and "tool: arg".
+_ACTION = re.compile(r"^\s*(\w+)\s*(?:\[(.*)\]|\((.*)\)|:\s*(.*))\s*$", re.DOTALL)
+
+class ReActAgentEvaluator(BaseEvaluator):
+    """
+    Evaluator that runs a real ReAct loop: the model thinks, calls tools, observes their
+    results and eventually answers.
+    """
+
+    answer_prefixes = ("Action:", "Final Answer:", "Answer:")
+
+    PROMPT_PREFIX = """
+Solve the question by interleaving Thought, Action and Observation steps.
+Write one "Action: tool[input]" line per step and wait for its Observation.
+When you know the answer, write "Answer: <answer>".
+
+Available tools:
+{tools}
+
+"""
+
+    def __init__(
+        self,
+        tools: Optional[ToolRegistry] = None,
+        max_steps: int = 5,
+        max_seconds: float = 60.0,
+        max_tokens: int = 2000,
+        stream: bool = True,
+    ):
+        """
+        Initializes the agent.
+
+        Args:
+            tools: The tool registry. Defaults to the calculator only.
+            max_steps: The maximum number of model calls per question.
+            max_seconds: The wall-clock budget per question.
+            max_tokens: The (estimated) prompt plus output token budget per question.
+            stream: Stream model output so generation stops right after each Action line.
+        """
+        super().__init__(stream=stream)
+        self.tools = tools or default_registry()
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.max_tokens = max_tokens
+
+    def evaluate(self, question: str, llm_client: Optional[Any] = None) -> Dict:
+        """
+        Evaluates a question by running the ReAct loop until an answer or a budget is reached.
+
+        Args:
+            question: The question to evaluate.
+            llm_client: The LLM client to use for the evaluation.
+
+        Returns:
+            A dictionary with the initial prompt, the answer, the full trace, the number of
+            steps taken and the reason the loop stopped.
+        """
+        prefix = self.PROMPT_PREFIX.format(tools=self.tools.describe())
+        prompt = prefix + f"Question: {question}\n"
+        result = {"prompt": prompt, "response": "", "trace": prompt, "steps": 0, "stop_reason": "no_client"}
+        if not llm_client:
+            return result
+
+        trace = prompt
+        tokens_used = 0
+        started = time.monotonic()
+        for step in range(1, self.max_steps + 1):
+            if time.monotonic() - started > self.max_seconds:
+                return {**result, "trace": trace, "steps": step - 1, "stop_reason": "time_budget"}
+            if tokens_used + estimate_tokens(trace) > self.max_tokens:
+                return {**result, "trace": trace, "steps": step - 1, "stop_reason": "token_budget"}
+
+            extractor = IncrementalAnswerExtractor(self.answer_prefixes)
+            output = self._step(trace, llm_client, extractor)
+            tokens_used += estimate_tokens(trace) + estimate_tokens(output)
+            step_text = _cut_after_first_match(output, extractor)
+
+            if extractor.label is None or extractor.label.lower() != "action:":
+                answer = extractor.answer if extractor.done else _last_line(output)
+                trace += step_text + "\n"
+                return {**result, "response": answer, "trace": trace, "steps": step, "stop_reason": "answer"}
+
+            observation = self._run_action(extractor.answer)
+            trace += f"{step_text}\nObservation: {observation}\n"
+
+        return {**result, "trace": trace, "steps": self.max_steps, "stop_reason": "max_steps"}
+
+    def evaluate_many(self, questions: List[str], llm_client: Optional[Any] = None, max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Runs the agent for several independent questions concurrently.
+
+        Args:
+            questions: The questions to evaluate.
+            llm_client: The LLM client to use for the evaluation.
+            max_workers: The number of questions processed at once. Defaults to the
+                ``evaluation.batch_size`` setting.
+
+        Returns:
+            One result dictionary per question, in input order. Repeated questions are
+            run once and share the result.
+        """
+        unique, positions = dedupe_questions(questions)
+        max_workers = max_workers or get_settings().evaluation.batch_size
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda q: self.evaluate(q, llm_client), unique))
+        return [dict(results[i]) for i in positions]
+
+    def _step(self, trace: str, llm_client: Any, extractor: IncrementalAnswerExtractor) -> str:
+        if self.stream and hasattr(llm_client, "stream_query"):
+            return llm_client.stream_query(trace, stop_condition=self.should_stop, extractor=extractor)
+        output = llm_client.query(trace)
+        extractor.feed(output)
+        extractor.finish()
+        return output
+
+    def _run_action(self, action: str) -> str:
+        match = _ACTION.match(action)
+        if not match:
+            return f"Could not parse action '{action}'. Use the form tool[input]."
+        name = match.group(1)
+        argument = next(g for g in match.groups()[1:] if g is not None)
+        return self.tools.run(name, argument.strip())
+
+def _cut_after_first_match(output: str, extractor: IncrementalAnswerExtractor) -> str:
+    # Drop anything the model wrote after its Action line, such as an invented Observation.
+    if not extractor.done:
+        return output.rstrip()
+    lines = output.splitlines()
+    for i, line in enumerate(lines):
+        if line.strip().lower().startswith(extractor.label.lower()):
+            return "\n".join(lines[: i + 1]).rstrip()
+    return output.rstrip()
+
+def _last_line(text: str) -> str:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return lines[-1] if lines else ""
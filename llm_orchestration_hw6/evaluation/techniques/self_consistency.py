@@ -0,0 +1,142 @@
+import concurrent.futures
+import re
+import threading
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+from llm_orchestration_hw6.evaluation.techniques.base import BaseEvaluator
+from llm_orchestration_hw6.evaluation.techniques.cot import CoTEvaluator
+from llm_orchestration_hw6.llms.streaming import IncrementalAnswerExtractor
+
+def normalize_answer(text: str) -> str:
+    """
+    Normalizes an answer for voting: lowercase, collapsed whitespace, no trailing
+    punctuation, and integral numbers without a decimal part ("38.0" -> "38").
+    """
+    answer = re.sub(r"\s+", " ", str(text)).strip().lower().rstrip(".!")
+    try:
+        number = float(answer.replace(",", ""))
+    except ValueError:
+        return answer
+    return str(int(number)) if number.is_integer() else str(number)
+
+def is_decided(counts: Counter, remaining: int) -> bool:
+    """
+    Returns True once no outcome of the remaining samples can change the majority answer.
+    """
+    if not counts:
+        return False
+    ranked = counts.most_common(2)
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0
+    return ranked[0][1] > runner_up + remaining
+
+class SelfConsistencyEvaluator(BaseEvaluator):
+    """
+    Evaluator that samples several Chain-of-Thought responses and returns the majority answer.
+    """
+
+    answer_prefixes = CoTEvaluator.answer_prefixes
+
+    def __init__(
+        self,
+        samples: int = 5,
+        max_workers: Optional[int] = None,
+        use_provider_n: bool = False,
+        stream: bool = False,
+        temperature: float = 0.7,
+    ):
+        """
+        Initializes the evaluator.
+
+        Args:
+            samples: The number of samples (k) to draw per question.
+            max_workers: The number of samples in flight at once. Defaults to ``samples``.
+            use_provider_n: Request all samples in one call through the client's
+                ``query_samples`` method, when the client provides it.
+            stream: Stream samples so in-flight ones can be cancelled once the vote is decided.
+            temperature: The sampling temperature, passed to clients that accept a
+                per-request ``temperature``. Samples drawn near-greedily would mostly repeat
+                one reasoning path and make the vote meaningless.
+        """
+        super().__init__(stream=stream)
+        self.samples = samples
+        self.max_workers = max_workers or samples
+        self.use_provider_n = use_provider_n
+        self.temperature = temperature
+        self.cot = CoTEvaluator()
+
+    def evaluate(self, question: str, llm_client: Optional[Any] = None) -> Dict:
+        """
+        Evaluates a question using self-consistency over Chain-of-Thought samples.
+
+        Args:
+            question: The question to evaluate.
+            llm_client: The LLM client to use for the evaluation.
+
+        Returns:
+            A dictionary containing the prompt, the majority answer, the sampled answers and
+            the vote counts.
+        """
+        prompt = self.cot.evaluate(question, None)["prompt"]
+        if not llm_client:
+            return {"prompt": prompt, "response": "", "samples": [], "votes": {}}
+
+        kwargs = {"temperature": self.temperature} if getattr(llm_client, "supports_temperature", False) else {}
+        if self.use_provider_n and hasattr(llm_client, "query_samples"):
+            texts = llm_client.query_samples(prompt, self.samples, **kwargs)
+            answers = [self._extract(text) for text in texts]
+            counts = Counter(normalize_answer(a) for a in answers if a)
+        else:
+            answers, counts = self._sample_concurrently(prompt, llm_client, kwargs)
+
+        majority = counts.most_common(1)[0][0] if counts else ""
+        # Report the first raw answer that voted for the winner rather than its normalized form.
+        response = next((a for a in answers if a and normalize_answer(a) == majority), majority)
+        return {
+            "prompt": prompt,
+            "response": response,
+            "samples": answers,
+            "votes": dict(counts),
+        }
+
+    def _sample_concurrently(self, prompt: str, llm_client: Any, kwargs: Dict[str, Any]):
+        decided = threading.Event()
+        answers: List[str] = []
+        counts: Counter = Counter()
+
+        def sample() -> str:
+            if self.stream and hasattr(llm_client, "stream_query"):
+                # In-flight streams are closed as soon as the vote is decided.
+                return llm_client.stream_query(
+                    prompt,
+                    stop_condition=lambda ex: decided.is_set() or self.should_stop(ex),
+                    extractor=IncrementalAnswerExtractor(self.answer_prefixes),
+                    **kwargs,
+                )
+            return llm_client.query(prompt, **kwargs)
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = [executor.submit(sample) for _ in range(self.samples)]
+        try:
+            for completed, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                answer = self._extract(future.result())
+                answers.append(answer)
+                if answer:
+                    counts[normalize_answer(answer)] += 1
+                if is_decided(counts, self.samples - completed):
+                    decided.set()
+                    break
+        finally:
+            # Queued samples are dropped; running ones are not waited for.
+            executor.shutdown(wait=False, cancel_futures=True)
+        return answers, counts
+
+    def _extract(self, text: str) -> str:
+        extractor = IncrementalAnswerExtractor(self.answer_prefixes)
+        extractor.feed(text)
+        answer = extractor.finish()
+        if answer is None:
+            # Fall back to the last non-empty line when the model skipped the "Answer:" label.
+            lines = [line.strip() for line in str(text).splitlines() if line.strip()]
+            answer = lines[-1] if lines else ""
+        return answer
@@ -0,0 +1,174 @@
+import ast
+import json
+import operator
+import re
+from typing import Callable, Dict, List, Optional
+
+_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+_MAX_EXPONENT = 100
+# Largest integer result (in bits, about 3000 digits) that Pow and Mult may produce.
+# Big-integer arithmetic runs in the agent's worker thread and cannot be interrupted.
+_MAX_RESULT_BITS = 10_000
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _check_size(op: ast.operator, left, right):
+    """
+    Rejects a Pow or Mult whose integer result would exceed ``_MAX_RESULT_BITS``, before
+    it is computed.
+    """
+    if isinstance(op, ast.Pow):
+        if abs(right) > _MAX_EXPONENT:
+            raise ValueError("exponent too large")
+        if isinstance(left, int) and isinstance(right, int) and left.bit_length() * abs(right) > _MAX_RESULT_BITS:
+            raise ValueError("result too large")
+    elif isinstance(op, ast.Mult) and isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > _MAX_RESULT_BITS:
+            raise ValueError("result too large")
+
+
+def calculator(expression: str) -> str:
+    """
+    Evaluates an arithmetic expression without executing arbitrary code.
+
+    Only numbers, parentheses and the operators + - * / // % ** are accepted; the
+    Unicode signs used in the dataset (× ÷ −) are mapped to their ASCII forms.
+
+    Args:
+        expression: The expression to evaluate, e.g. "144 ÷ 12".
+
+    Returns:
+        The result as a string, with integral results printed without a decimal part.
+    """
+    expression = expression.replace("×", "*").replace("÷", "/").replace("−", "-").replace("^", "**")
+
+    def _eval(node):
+        if isinstance(node, ast.Expression):
+            return _eval(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _OPERATORS:
+            return _OPERATORS[type(node.op)](_eval(node.operand))
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+            left, right = _eval(node.left), _eval(node.right)
+            _check_size(node.op, left, right)
+            return _OPERATORS[type(node.op)](left, right)
+        raise ValueError(f"unsupported expression: {ast.dump(node)}")
+
+    result = _eval(ast.parse(expression.strip(), mode="eval"))
+    if isinstance(result, float) and result.is_integer():
+        result = int(result)
+    return str(result)
+
+
+class KnowledgeBase:
+    """
+    Keyword lookup over a ``ground_truth_dataset.json``-style list of question records.
+    """
+
+    def __init__(self, records: List[Dict]):
+        """
+        Initializes the knowledge base and indexes every record by its words.
+
+        Args:
+            records: Dictionaries with at least ``question`` and ``ground_truth_answer``.
+        """
+        self.records = records
+        self._index: Dict[str, List[int]] = {}
+        for i, record in enumerate(records):
+            text = " ".join([record.get("question", "")] + list(record.get("tags", [])))
+            for word in set(_WORD.findall(text.lower())):
+                self._index.setdefault(word, []).append(i)
+
+    @classmethod
+    def from_json(cls, file_path: str) -> "KnowledgeBase":
+        with open(file_path, "r") as f:
+            return cls(json.load(f))
+
+    def lookup(self, query: str) -> str:
+        """
+        Returns the record that shares the most words with the query.
+
+        Args:
+            query: Free-text search query.
+
+        Returns:
+            "<question> -> <answer>" for the best match, or a not-found message.
+        """
+        scores: Dict[int, int] = {}
+        for word in set(_WORD.findall(query.lower())):
+            for i in self._index.get(word, []):
+                scores[i] = scores.get(i, 0) + 1
+        if not scores:
+            return "No matching entry found."
+        best = max(scores, key=lambda i: (scores[i], -i))
+        record = self.records[best]
+        return f"{record['question']} -> {record['ground_truth_answer']}"
+
+
+class ToolRegistry:
+    """
+    Named tools that a ReAct agent can call with a single string argument.
+    """
+
+    def __init__(self):
+        self._tools: Dict[str, Callable[[str], str]] = {}
+        self._descriptions: Dict[str, str] = {}
+
+    def register(self, name: str, func: Callable[[str], str], description: str):
+        """
+        Registers a tool.
+
+        Args:
+            name: The name the model uses to call the tool.
+            func: Callable that receives the argument string and returns an observation.
+            description: One-line description shown to the model.
+        """
+        self._tools[name.lower()] = func
+        self._descriptions[name.lower()] = description
+
+    def describe(self) -> str:
+        return "\n".join(f"- {name}[input]: {desc}" for name, desc in self._descriptions.items())
+
+    def run(self, name: str, argument: str) -> str:
+        """
+        Runs a tool and turns any failure into an observation the model can react to.
+        """
+        func = self._tools.get(name.lower())
+        if func is None:
+            return f"Unknown tool '{name}'. Available tools: {', '.join(self._tools)}."
+        try:
+            return str(func(argument))
+        except Exception as e:
+            return f"Tool '{name}' failed: {e}"
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._tools
+
+
+def default_registry(knowledge_path: Optional[str] = None) -> ToolRegistry:
+    """
+    Builds a registry with the calculator and, if a dataset path is given, the lookup tool.
+
+    Args:
+        knowledge_path: Path to a ``ground_truth_dataset.json``-style file.
+
+    Returns:
+        The tool registry.
+    """
+    registry = ToolRegistry()
+    registry.register("calculator", calculator, "evaluate an arithmetic expression, e.g. calculator[7 * 8]")
+    if knowledge_path:
+        knowledge = KnowledgeBase.from_json(knowledge_path)
+        registry.register("lookup", knowledge.lookup, "search the local knowledge base for a fact")
+    return registry
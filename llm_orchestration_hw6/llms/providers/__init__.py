@@ -1,2 +1,3 @@
 from .openai_client import OpenAIClient
 from .gemini_client import GeminiClient
+from .ollama_client import OllamaClient, OpenAICompatibleClient
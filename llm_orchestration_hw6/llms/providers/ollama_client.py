@@ -0,0 +1,315 @@
+import concurrent.futures
+import os
+import threading
+import time
+import types
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from llm_orchestration_hw6.config.settings import ProviderSettings, get_settings
+from llm_orchestration_hw6.llms.tokens import fit_max_tokens
+from llm_orchestration_hw6.llms.usage import UsageTracker
+
+
+class ConcurrencyTuner:
+    """
+    Limits the requests in flight and tunes the limit from measured throughput.
+
+    Local servers (Ollama, llama.cpp, vLLM) batch the requests they have in flight, so
+    throughput grows with concurrency until the GPU or the server's parallel slots are
+    saturated and then flattens or drops. The tuner hill-climbs on that curve: after every
+    window of completions it compares the window's throughput with the previous one,
+    keeps moving the limit in the same direction while throughput improves and turns
+    around when it drops.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64, tolerance: float = 0.05):
+        """
+        Initializes the tuner.
+
+        Args:
+            initial: The starting limit.
+            minimum: The lowest limit.
+            maximum: The highest limit.
+            tolerance: Relative throughput changes smaller than this count as no change.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(max(initial, minimum), maximum)
+        self.tolerance = tolerance
+        self.history: List[Tuple[int, float]] = []
+        self._direction = 1
+        self._last_throughput: Optional[float] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._window_start = time.perf_counter()
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._completed += 1
+            if self._completed >= max(self.limit, 4):
+                self._adjust()
+            self._cond.notify_all()
+
+    def _adjust(self):
+        now = time.perf_counter()
+        throughput = self._completed / max(now - self._window_start, 1e-9)
+        self.history.append((self.limit, throughput))
+        last = self._last_throughput
+        if last is not None and throughput < last * (1 - self.tolerance):
+            self._direction = -self._direction
+        if last is None or abs(throughput - last) > last * self.tolerance:
+            if self._direction > 0:
+                self.limit = min(self.maximum, self.limit * 2)
+            else:
+                self.limit = max(self.minimum, self.limit * 3 // 4)
+        self._last_throughput = throughput
+        self._completed = 0
+        self._window_start = now
+
+
+class _LocalServerClient(ABC):
+    """
+    Shared HTTP plumbing of the local-server clients: a pooled keep-alive connection,
+    error handling in the style of the other providers and concurrent ``query_many``.
+    """
+
+    # ``query`` accepts a per-request ``max_tokens`` and ``temperature``.
+    supports_max_tokens = True
+    supports_temperature = True
+
+    def __init__(self, base_url: str, model: str, temperature: float, max_tokens: int, timeout: float,
+                 max_concurrency: int, headers: Optional[Dict[str, str]] = None, raise_errors: bool = False):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_concurrency = max_concurrency
+        self.raise_errors = raise_errors
+        self.usage = UsageTracker()
+        # One pooled client shared by every thread; connections stay open between requests.
+        self.http = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+
+    @abstractmethod
+    def _request(self, prompt: str, max_tokens: int, temperature: float) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns the endpoint path and JSON payload of a completion request.
+        """
+
+    @abstractmethod
+    def _parse(self, data: Dict[str, Any]) -> Tuple[str, Any]:
+        """
+        Returns the generated text and the usage of a response body.
+        """
+
+    def query(
+        self,
+        prompt: str,
+        cache_prefix: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """
+        Sends a query to the server.
+
+        Args:
+            prompt: The prompt to send.
+            cache_prefix: Accepted for interface compatibility; local servers reuse the KV
+                cache of a shared prompt prefix on their own.
+            max_tokens: Overrides the client's output token cap for this request.
+            temperature: Overrides the client's sampling temperature for this request.
+
+        Returns:
+            The response text.
+        """
+        try:
+            path, payload = self._request(
+                prompt,
+                fit_max_tokens(prompt, max_tokens or self.max_tokens, self.model),
+                self.temperature if temperature is None else temperature,
+            )
+            response = self.http.post(path, json=payload)
+            response.raise_for_status()
+            text, usage = self._parse(response.json())
+            self.usage.record(usage)
+            return text.strip()
+        except Exception as e:
+            if self.raise_errors:
+                raise
+            return f"An error occurred: {e}"
+
+    def query_many(self, prompts: List[str], tuner: Optional[ConcurrencyTuner] = None, **kwargs) -> List[str]:
+        """
+        Sends many queries, keeping enough of them in flight for the server to batch.
+
+        Args:
+            prompts: The prompts to send.
+            tuner: Limits and tunes the requests in flight. Defaults to a tuner bounded by
+                ``max_concurrency``.
+            **kwargs: Passed to ``query``.
+
+        Returns:
+            The responses, in the order of ``prompts``.
+        """
+        tuner = tuner or ConcurrencyTuner(initial=min(4, self.max_concurrency), maximum=self.max_concurrency)
+
+        def run(prompt: str) -> str:
+            tuner.acquire()
+            try:
+                return self.query(prompt, **kwargs)
+            finally:
+                tuner.release()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=tuner.maximum) as executor:
+            return list(executor.map(run, prompts))
+
+    def close(self):
+        self.http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OllamaClient(_LocalServerClient):
+    """
+    A client for a local Ollama server (``/api/generate``).
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        keep_alive: Optional[str] = None,
+        preload: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        raise_errors: bool = False,
+    ):
+        """
+        Initializes the Ollama client. Unset arguments come from the ``ollama`` settings.
+
+        Args:
+            model: The model name, e.g. "llama3".
+            base_url: The server URL, e.g. "http://localhost:11434".
+            max_tokens: The maximum number of tokens to generate per request.
+            keep_alive: How long the server keeps the model loaded after a request, e.g. "30m".
+            preload: Load the model now, so the first request does not pay the load time.
+            max_concurrency: The most requests kept in flight by ``query_many``. The server
+                only runs ``OLLAMA_NUM_PARALLEL`` of them at once and queues the rest.
+            timeout: The request timeout in seconds.
+            raise_errors: Raise request failures instead of returning them as text.
+        """
+        settings = get_settings().ollama
+        super().__init__(
+            base_url=base_url or settings.base_url,
+            model=model or settings.default_model,
+            temperature=settings.default_temperature,
+            max_tokens=max_tokens or settings.default_max_tokens,
+            timeout=timeout or settings.timeout_seconds,
+            max_concurrency=max_concurrency or settings.max_concurrency,
+            raise_errors=raise_errors,
+        )
+        self.keep_alive = keep_alive or settings.keep_alive
+        if settings.preload if preload is None else preload:
+            self.preload()
+
+    def preload(self):
+        """
+        Loads the model into memory (a generate request without a prompt) and keeps it
+        loaded for ``keep_alive``.
+        """
+        response = self.http.post("/api/generate", json={"model": self.model, "keep_alive": self.keep_alive})
+        response.raise_for_status()
+
+    def _request(self, prompt: str, max_tokens: int, temperature: float) -> Tuple[str, Dict[str, Any]]:
+        return "/api/generate", {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": temperature, "num_predict": max_tokens},
+        }
+
+    def _parse(self, data: Dict[str, Any]) -> Tuple[str, Any]:
+        usage = types.SimpleNamespace(
+            prompt_tokens=data.get("prompt_eval_count", 0),
+            completion_tokens=data.get("eval_count", 0),
+        )
+        return data.get("response", ""), usage
+
+
+class OpenAICompatibleClient(_LocalServerClient):
+    """
+    A client for a local server with an OpenAI-compatible ``/chat/completions`` endpoint
+    (llama.cpp server, vLLM, LM Studio).
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        settings: Optional[ProviderSettings] = None,
+        raise_errors: bool = False,
+    ):
+        """
+        Initializes the client. Unset arguments come from the ``openai_compatible`` settings.
+
+        Args:
+            model: The served model name.
+            base_url: The API base URL, e.g. "http://localhost:8080/v1".
+            api_key: The API key, if the server requires one. Defaults to the environment
+                variable named by ``api_key_env_var``.
+            max_tokens: The maximum number of tokens to generate per request.
+            max_concurrency: The most requests kept in flight by ``query_many``.
+            timeout: The request timeout in seconds.
+            settings: The provider settings to default from.
+            raise_errors: Raise request failures instead of returning them as text.
+        """
+        settings = settings or get_settings().openai_compatible
+        if api_key is None and settings.api_key_env_var:
+            api_key = os.environ.get(settings.api_key_env_var)
+        super().__init__(
+            base_url=base_url or settings.base_url,
+            model=model or settings.default_model,
+            temperature=settings.default_temperature,
+            max_tokens=max_tokens or settings.default_max_tokens,
+            timeout=timeout or settings.timeout_seconds,
+            max_concurrency=max_concurrency or settings.max_concurrency,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+            raise_errors=raise_errors,
+        )
+
+    def _request(self, prompt: str, max_tokens: int, temperature: float) -> Tuple[str, Dict[str, Any]]:
+        return "/chat/completions", {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+    def _parse(self, data: Dict[str, Any]) -> Tuple[str, Any]:
+        usage = data.get("usage") or {}
+        return data["choices"][0]["message"]["content"] or "", types.SimpleNamespace(**usage)
@@ -1,41 +1,182 @@
+import hashlib
 import os
+from typing import Any, Dict, List, Optional
+
 from openai import OpenAI
 
+from llm_orchestration_hw6.config.settings import get_settings
+from llm_orchestration_hw6.llms.streaming import (
+    IncrementalAnswerExtractor,
+    StopCondition,
+    consume_stream,
+)
+from llm_orchestration_hw6.llms.tokens import fit_max_tokens
+from llm_orchestration_hw6.llms.usage import UsageTracker
+
 class OpenAIClient:
     """
     A simple client for the OpenAI API.
     """
 
-    def __init__(self, api_key: str = None):
+    # OpenAI caches prompt prefixes automatically; a cache key routes requests that share
+    # a prefix to the same cache.
+    supports_prompt_cache = True
+    # ``query`` accepts a per-request ``max_tokens``.
+    supports_max_tokens = True
+    # ``query``, ``query_samples`` and ``stream_query`` accept a per-request ``temperature``.
+    supports_temperature = True
+
+    def __init__(
+        self,
+        api_key: str = None,
+        max_tokens: Optional[int] = None,
+        raise_errors: bool = False,
+        model: Optional[str] = None,
+    ):
         """
-        Initializes the OpenAI client.
+        Initializes the OpenAI client. Unset arguments come from the ``openai`` settings.
 
         Args:
             api_key: The OpenAI API key. If not provided, it will be read from the OPENAI_API_KEY environment variable.
+            max_tokens: The maximum number of tokens to generate per request.
+            raise_errors: Raise request failures instead of returning them as
+                "An error occurred: ..." text.
+            model: The completion model.
         """
         if api_key is None:
             api_key = os.environ.get("OPENAI_API_KEY")
         if api_key is None:
             raise ValueError("OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
-        
-        self.client = OpenAI(api_key=api_key)
 
-    def query(self, prompt: str) -> str:
+        settings = get_settings()
+        self.client = OpenAI(
+            api_key=api_key,
+            timeout=settings.openai.timeout_seconds,
+            max_retries=settings.evaluation.num_retries,
+        )
+        self.max_tokens = max_tokens or settings.openai.default_max_tokens
+        self.model = model or settings.openai.default_model
+        self.temperature = settings.openai.default_temperature
+        self.raise_errors = raise_errors
+        self.usage = UsageTracker()
+
+    def query(
+        self,
+        prompt: str,
+        cache_prefix: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
         """
         Sends a query to the OpenAI API.
 
         Args:
             prompt: The prompt to send to the API.
+            cache_prefix: The static leading part of the prompt, marked for prompt caching.
+            max_tokens: Overrides the client's output token cap for this request.
+            temperature: Overrides the client's sampling temperature for this request.
 
         Returns:
             The response from the API.
         """
         try:
             response = self.client.completions.create(
-                model="text-davinci-003",
+                model=self.model,
                 prompt=prompt,
-                max_tokens=150,
+                temperature=self.temperature if temperature is None else temperature,
+                max_tokens=fit_max_tokens(prompt, max_tokens or self.max_tokens, self.model),
+                **self._cache_kwargs(cache_prefix),
             )
+            self.usage.record(getattr(response, "usage", None))
             return response.choices[0].text.strip()
         except Exception as e:
+            if self.raise_errors:
+                raise
+            return f"An error occurred: {e}"
+
+    def query_samples(self, prompt: str, n: int, temperature: Optional[float] = None) -> List[str]:
+        """
+        Draws several completions for one prompt in a single request using the ``n`` parameter.
+
+        Args:
+            prompt: The prompt to send to the API.
+            n: The number of completions to generate.
+            temperature: Overrides the client's sampling temperature for this request.
+
+        Returns:
+            The generated completions, or a single error message if the request failed.
+        """
+        try:
+            response = self.client.completions.create(
+                model=self.model,
+                prompt=prompt,
+                temperature=self.temperature if temperature is None else temperature,
+                max_tokens=fit_max_tokens(prompt, self.max_tokens, self.model),
+                n=n,
+            )
+            self.usage.record(getattr(response, "usage", None))
+            return [choice.text.strip() for choice in response.choices]
+        except Exception as e:
+            if self.raise_errors:
+                raise
+            return [f"An error occurred: {e}"]
+
+    def stream_query(
+        self,
+        prompt: str,
+        stop_condition: Optional[StopCondition] = None,
+        extractor: Optional[IncrementalAnswerExtractor] = None,
+        max_tokens: Optional[int] = None,
+        cache_prefix: Optional[str] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """
+        Streams a query to the OpenAI API and cancels generation once the stop condition is met.
+
+        Args:
+            prompt: The prompt to send to the API.
+            stop_condition: Called after every streamed chunk; returning True closes the stream.
+            extractor: The extractor that receives the streamed tokens.
+            max_tokens: Overrides the client's output token cap for this request.
+            cache_prefix: The static leading part of the prompt, marked for prompt caching.
+            temperature: Overrides the client's sampling temperature for this request.
+
+        Returns:
+            The text generated up to the point the stream ended or was cancelled.
+        """
+        if extractor is None:
+            extractor = IncrementalAnswerExtractor()
+        try:
+            stream = self.client.completions.create(
+                model=self.model,
+                prompt=prompt,
+                temperature=self.temperature if temperature is None else temperature,
+                max_tokens=fit_max_tokens(prompt, max_tokens or self.max_tokens, self.model),
+                stream=True,
+                stream_options={"include_usage": True},
+                **self._cache_kwargs(cache_prefix),
+            )
+            try:
+                consume_stream(self._stream_tokens(stream), extractor, stop_condition)
+            finally:
+                # Closing the response aborts the HTTP stream, so the server stops generating.
+                stream.close()
+            return extractor.text.strip()
+        except Exception as e:
+            if self.raise_errors:
+                raise
             return f"An error occurred: {e}"
+
+    def _stream_tokens(self, stream):
+        for chunk in stream:
+            # The final chunk carries the usage and has no choices.
+            self.usage.record(getattr(chunk, "usage", None))
+            if chunk.choices:
+                yield chunk.choices[0].text
+
+    @staticmethod
+    def _cache_kwargs(cache_prefix: Optional[str]) -> Dict[str, Any]:
+        if not cache_prefix:
+            return {}
+        key = hashlib.sha256(cache_prefix.encode("utf-8")).hexdigest()[:32]
+        return {"extra_body": {"prompt_cache_key": key}}
@@ -0,0 +1,268 @@
+import collections
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from llm_orchestration_hw6.config.settings import get_settings
+from llm_orchestration_hw6.llms.router import is_error_response
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class ProviderError(RuntimeError):
+    """
+    A provider request failed (an exception or an error response).
+    """
+
+
+class CircuitOpenError(ProviderError):
+    """
+    The provider's circuit is open, so the request was not sent.
+    """
+
+
+class BulkheadFullError(ProviderError):
+    """
+    The provider already has its maximum number of requests in flight.
+    """
+
+
+class CircuitBreaker:
+    """
+    Tracks the rolling error rate of one provider and stops calling it while it is failing.
+
+    The circuit opens once at least ``min_requests`` of the last ``window`` requests were
+    recorded and the share of failures among them reaches ``error_threshold``. While open,
+    requests are rejected without being sent. After ``reset_timeout`` seconds the circuit
+    becomes half-open and lets ``half_open_requests`` trial requests through: one success
+    closes it, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        error_threshold: Optional[float] = None,
+        window: Optional[int] = None,
+        min_requests: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+        half_open_requests: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the breaker. Unset arguments come from the ``resilience`` settings.
+
+        Args:
+            error_threshold: The failure share that opens the circuit.
+            window: The number of recent outcomes considered.
+            min_requests: Outcomes needed before the circuit can open.
+            reset_timeout: Seconds the circuit stays open before a trial request.
+            half_open_requests: Trial requests allowed while half-open.
+            clock: The time source.
+        """
+        settings = get_settings().resilience
+        self.error_threshold = error_threshold or settings.error_threshold
+        self.min_requests = min_requests or settings.min_requests
+        self.reset_timeout = settings.reset_timeout_seconds if reset_timeout is None else reset_timeout
+        self.half_open_requests = half_open_requests
+        self.clock = clock
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window or settings.window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _refresh(self):
+        if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state, self._trials = HALF_OPEN, 0
+
+    def allow(self) -> bool:
+        """
+        Returns True if a request may be sent now (and counts it as a trial when half-open).
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._trials < self.half_open_requests:
+                self._trials += 1
+                return True
+            return False
+
+    def cancel(self):
+        """
+        Gives back the trial slot of a request that ``allow`` let through but that was
+        never sent.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record(self, success: bool):
+        """
+        Records the outcome of a request that ``allow`` let through.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if success:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._state, self._opened_at = OPEN, self.clock()
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.error_threshold:
+                self._state, self._opened_at = OPEN, self.clock()
+
+
+class Bulkhead:
+    """
+    Caps the requests one provider has in flight, so a slow provider cannot occupy every
+    shared worker thread.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_wait: Optional[float] = None):
+        """
+        Initializes the bulkhead. Unset arguments come from the ``resilience`` settings.
+
+        Args:
+            max_concurrent: The most requests in flight at once.
+            max_wait: Seconds to wait for a free slot before rejecting the request; 0
+                rejects at once.
+        """
+        settings = get_settings().resilience
+        self.max_concurrent = max_concurrent or settings.bulkhead_size
+        self.max_wait = settings.bulkhead_wait_seconds if max_wait is None else max_wait
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+
+    def __enter__(self):
+        if self.max_wait > 0:
+            acquired = self._slots.acquire(timeout=self.max_wait)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            raise BulkheadFullError(f"{self.max_concurrent} requests already in flight")
+        return self
+
+    def __exit__(self, *exc):
+        self._slots.release()
+
+
+class ResilientClient:
+    """
+    Wraps a provider client with a circuit breaker and a bulkhead.
+
+    Failed requests raise ``ProviderError`` instead of returning an error string that
+    would be graded as an answer. ``query_many`` does not raise; it queues the prompts it
+    could not answer so they can be retried later with ``retry_skipped``.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        name: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        bulkhead: Optional[Bulkhead] = None,
+        is_error: Callable[[Any], bool] = is_error_response,
+    ):
+        """
+        Initializes the wrapper.
+
+        Args:
+            client: The provider client; it must implement ``query(prompt, ...)``.
+            name: The provider name used in error messages. Defaults to the client class.
+            breaker: The provider's circuit breaker.
+            bulkhead: The provider's bulkhead.
+            is_error: Decides whether a returned response is a failure.
+        """
+        self.client = client
+        self.name = name or type(client).__name__
+        self.breaker = breaker or CircuitBreaker()
+        self.bulkhead = bulkhead or Bulkhead()
+        self.is_error = is_error
+        self.skipped: Deque[Tuple[int, str, str]] = collections.deque()
+
+    @property
+    def supports_prompt_cache(self) -> bool:
+        return getattr(self.client, "supports_prompt_cache", False)
+
+    @property
+    def supports_temperature(self) -> bool:
+        return getattr(self.client, "supports_temperature", False)
+
+    def query(self, prompt: str, **kwargs) -> str:
+        """
+        Sends a query through the breaker and bulkhead.
+
+        Raises:
+            CircuitOpenError: The circuit is open.
+            BulkheadFullError: The provider has no free slot.
+            ProviderError: The request failed.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name}: circuit open")
+        try:
+            with self.bulkhead:
+                try:
+                    response = self.client.query(prompt, **kwargs)
+                except Exception as e:
+                    self.breaker.record(False)
+                    raise ProviderError(f"{self.name}: {e}") from e
+        except BulkheadFullError as e:
+            self.breaker.cancel()
+            raise BulkheadFullError(f"{self.name}: {e}") from None
+        if self.is_error(response):
+            self.breaker.record(False)
+            raise ProviderError(f"{self.name}: {response}")
+        self.breaker.record(True)
+        return response
+
+    def query_many(self, prompts: List[str], **kwargs) -> List[Optional[str]]:
+        """
+        Queries every prompt, at most ``bulkhead.max_concurrent`` at once.
+
+        Returns:
+            The responses in input order; None for prompts that failed or were rejected.
+            Those are appended to ``skipped`` as (index, prompt, reason).
+        """
+        def run(item: Tuple[int, str]) -> Optional[str]:
+            index, prompt = item
+            try:
+                return self.query(prompt, **kwargs)
+            except ProviderError as e:
+                self.skipped.append((index, prompt, str(e)))
+                return None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.bulkhead.max_concurrent) as executor:
+            return list(executor.map(run, enumerate(prompts)))
+
+    def retry_skipped(self, results: List[Optional[str]], **kwargs) -> List[Optional[str]]:
+        """
+        Retries the queued prompts once and fills their answers into ``results``.
+
+        Prompts that fail again are queued again.
+
+        Returns:
+            ``results``, updated in place.
+        """
+        pending = [self.skipped.popleft() for _ in range(len(self.skipped))]
+        if not pending:
+            return results
+        answers = self.query_many([prompt for _, prompt, _ in pending], **kwargs)
+        requeued = [self.skipped.popleft() for _ in range(len(self.skipped))]
+        self.skipped.extend((pending[i][0], prompt, reason) for i, prompt, reason in requeued)
+        for (index, _, _), answer in zip(pending, answers):
+            if answer is not None:
+                results[index] = answer
+        return results
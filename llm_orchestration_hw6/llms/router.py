@@ -0,0 +1,262 @@
+import collections
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from llm_orchestration_hw6.config.settings import get_settings
+
+# The provider clients return failed requests as text starting with this prefix.
+ERROR_PREFIX = "An error occurred:"
+
+
+def is_error_response(response: Any) -> bool:
+    """
+    Returns True if a client response is an error message rather than an answer.
+    """
+    return isinstance(response, str) and response.startswith(ERROR_PREFIX)
+
+
+class BackendStats:
+    """
+    Live statistics of one backend: latency EWMA, error-rate EWMA, a window of recent
+    latencies (for the hedge delay) and the number of requests in flight.
+    """
+
+    def __init__(self, alpha: float, window: int):
+        self.alpha = alpha
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.latencies = collections.deque(maxlen=window)
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0
+
+    def record(self, latency: float, failed: bool):
+        self.requests += 1
+        self.errors += failed
+        self.error_rate += self.alpha * (float(failed) - self.error_rate)
+        if not failed:
+            self.latencies.append(latency)
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma += self.alpha * (latency - self.latency_ewma)
+
+    def as_dict(self) -> Dict[str, Any]:
+        p95 = float(np.percentile(self.latencies, 95)) if self.latencies else None
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "latency_ewma_s": self.latency_ewma,
+            "latency_p95_s": p95,
+            "in_flight": self.in_flight,
+            "hedges": self.hedges,
+        }
+
+
+class ProviderRouter:
+    """
+    Routes each request to one of several equivalent backends (e.g. OpenAI-compatible
+    endpoints serving the same model) and optionally hedges slow requests.
+
+    Every backend is scored by its expected time to a successful answer, its latency
+    EWMA divided by its success rate and scaled by the requests it already has in
+    flight, plus a weighted cost; the lowest score wins. A backend without a successful
+    request is assumed as fast as the best backend that has one (``prior_latency`` while
+    none has), so each one is tried early, but its errors and in-flight requests still
+    count against it; ties go to the backend with fewer requests. With hedging on, a request still running after the
+    chosen backend's p95 latency is duplicated on the next-best backend and the first
+    successful answer is returned. A failed request is retried once on the next-best
+    backend.
+
+    The router exposes ``query`` like the provider clients, so it can be used wherever a
+    single client is expected.
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, Any],
+        costs: Optional[Dict[str, float]] = None,
+        cost_weight: float = 1.0,
+        hedge: bool = False,
+        failover: bool = True,
+        hedge_quantile: float = 95,
+        min_samples: int = 20,
+        alpha: float = 0.2,
+        window: int = 200,
+        max_workers: Optional[int] = None,
+        is_error: Callable[[Any], bool] = is_error_response,
+        prior_latency: float = 1.0,
+    ):
+        """
+        Initializes the router.
+
+        Args:
+            backends: {name: client}; every client must implement ``query(prompt, ...)``.
+            costs: {name: cost per request}, in seconds-equivalent units. Defaults to 0.
+            cost_weight: How much a unit of cost counts against a second of latency.
+            hedge: Send a duplicate request when the first one is slower than usual.
+            failover: Retry a failed request once on the next-best backend.
+            hedge_quantile: The latency percentile after which a request is hedged.
+            min_samples: Successful requests a backend needs before its requests are hedged.
+            alpha: The smoothing factor of the latency and error-rate EWMAs.
+            window: The number of recent latencies kept per backend.
+            max_workers: Threads that run backend requests. Defaults to
+                ``performance.max_workers`` (32 when unset).
+            is_error: Decides whether a returned response is a failure.
+            prior_latency: The latency, in seconds, assumed for every backend while none
+                has answered successfully.
+        """
+        if not backends:
+            raise ValueError("ProviderRouter needs at least one backend.")
+        self.backends = dict(backends)
+        self.costs = {name: (costs or {}).get(name, 0.0) for name in self.backends}
+        self.cost_weight = cost_weight
+        self.hedge = hedge
+        self.failover = failover
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.is_error = is_error
+        self.prior_latency = prior_latency
+        self._stats = {name: BackendStats(alpha, window) for name in self.backends}
+        self._lock = threading.Lock()
+        max_workers = max_workers or get_settings().performance.max_workers or 32
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="router")
+
+    @property
+    def supports_prompt_cache(self) -> bool:
+        return all(getattr(client, "supports_prompt_cache", False) for client in self.backends.values())
+
+    @property
+    def supports_temperature(self) -> bool:
+        return all(getattr(client, "supports_temperature", False) for client in self.backends.values())
+
+    def score(self, name: str) -> float:
+        """
+        Returns the routing score of a backend; lower is better.
+        """
+        stats = self._stats[name]
+        latency = stats.latency_ewma
+        if latency is None:
+            known = [s.latency_ewma for s in self._stats.values() if s.latency_ewma is not None]
+            latency = min(known) if known else self.prior_latency
+        expected = latency / max(1.0 - stats.error_rate, 0.05)
+        return expected * (1 + stats.in_flight) + self.cost_weight * self.costs[name]
+
+    def _best(self, exclude: Iterable[str]) -> Optional[str]:
+        exclude = set(exclude)
+        candidates = [name for name in self.backends if name not in exclude]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda name: (self.score(name), self._stats[name].requests))
+
+    def select(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Returns the best-scoring backend not in ``exclude``, or None if none is left.
+        """
+        with self._lock:
+            return self._best(exclude)
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """
+        Returns how long to wait on ``name`` before hedging, or None while it has too few
+        samples.
+        """
+        with self._lock:
+            latencies = list(self._stats[name].latencies)
+        if len(latencies) < self.min_samples:
+            return None
+        return float(np.percentile(latencies, self.hedge_quantile))
+
+    def _call(self, name: str, prompt: str, kwargs: Dict[str, Any]) -> Tuple[bool, Any]:
+        start = time.perf_counter()
+        try:
+            response = self.backends[name].query(prompt, **kwargs)
+            failed = self.is_error(response)
+        except Exception as e:  # pylint: disable=broad-except
+            response, failed = e, True
+        with self._lock:
+            stats = self._stats[name]
+            stats.in_flight -= 1
+            stats.record(time.perf_counter() - start, failed)
+        return not failed, response
+
+    def _submit(
+        self, prompt: str, kwargs: Dict[str, Any], exclude: Iterable[str] = ()
+    ) -> Tuple[Optional[concurrent.futures.Future], Optional[str]]:
+        # Selecting and counting the request as in flight under one lock keeps concurrent
+        # queries from all picking the same backend.
+        with self._lock:
+            name = self._best(exclude)
+            if name is None:
+                return None, None
+            self._stats[name].in_flight += 1
+        return self._executor.submit(self._call, name, prompt, kwargs), name
+
+    def query(self, prompt: str, **kwargs) -> str:
+        """
+        Sends a query to the best backend, hedging it if enabled.
+
+        Args:
+            prompt: The prompt to send.
+            **kwargs: Passed to the backend's ``query`` (e.g. ``cache_prefix``).
+
+        Returns:
+            The first successful response, or the last failure (an error response is
+            returned as is and an exception is re-raised) when every attempt failed.
+        """
+        future, primary = self._submit(prompt, kwargs)
+        futures = {future: primary}
+        delay = self.hedge_delay(primary) if self.hedge and len(self.backends) > 1 else None
+        if delay is not None:
+            done, _ = concurrent.futures.wait(futures, timeout=delay)
+            if not done:
+                with self._lock:
+                    self._stats[primary].hedges += 1
+                future, secondary = self._submit(prompt, kwargs, exclude=[primary])
+                futures[future] = secondary
+
+        failure: Any = None
+        pending = set(futures)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ok, response = future.result()
+                if ok:
+                    # The losing request, if any, finishes in the background and still
+                    # updates its backend's statistics.
+                    return response
+                failure = response
+            if not pending and self.failover and len(futures) == 1:
+                future, fallback = self._submit(prompt, kwargs, exclude=futures.values())
+                if future is not None:
+                    futures[future] = fallback
+                    pending = {future}
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the live statistics and current score of every backend.
+        """
+        with self._lock:
+            return {name: {**stats.as_dict(), "score": self.score(name)} for name, stats in self._stats.items()}
+
+    def close(self):
+        """
+        Waits for outstanding requests and stops the worker threads.
+        """
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
@@ -0,0 +1,276 @@
+import collections
+import itertools
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, OrderedDict, Tuple
+
+import numpy as np
+
+from llm_orchestration_hw6.config.settings import get_settings
+from llm_orchestration_hw6.llms.router import is_error_response
+from llm_orchestration_hw6.llms.singleflight import PARAM_ATTRIBUTES
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def numbers_in(text: str) -> Tuple[str, ...]:
+    """
+    Returns the numbers of a text in order. Paraphrases only match when these agree, so
+    "What is 7 times 8?" never reuses the answer to "What is 7 times 9?".
+    """
+    return tuple(_NUMBER.findall(text))
+
+
+def same_answer(cached: str, fresh: str) -> bool:
+    """
+    Compares two responses ignoring case and whitespace.
+    """
+    return " ".join(cached.lower().split()) == " ".join(fresh.lower().split())
+
+
+class CacheHit:
+    def __init__(self, prompt: str, response: str, similarity: float):
+        self.prompt = prompt
+        self.response = response
+        self.similarity = similarity
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"cached_prompt": self.prompt, "similarity": self.similarity}
+
+
+class VectorIndex:
+    """
+    In-memory cosine index over unit vectors with a fixed capacity; once full, the oldest
+    entries are overwritten.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.vectors: Optional[np.ndarray] = None
+        self.entries: List[Tuple[str, str, Tuple[str, ...]]] = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, vector: np.ndarray, entry: Tuple[str, str, Tuple[str, ...]]):
+        if self.vectors is None:
+            self.vectors = np.zeros((min(self.max_entries, 1024), vector.shape[0]), dtype=np.float32)
+        elif self._next == len(self.vectors) and len(self.vectors) < self.max_entries:
+            grown = np.zeros((min(self.max_entries, 2 * len(self.vectors)), vector.shape[0]), dtype=np.float32)
+            grown[:len(self.vectors)] = self.vectors
+            self.vectors = grown
+        self.vectors[self._next] = vector
+        if self._next < len(self.entries):
+            self.entries[self._next] = entry
+        else:
+            self.entries.append(entry)
+        self._next = (self._next + 1) % self.max_entries
+
+    def search(self, vector: np.ndarray, threshold: float) -> List[Tuple[float, int]]:
+        """
+        Returns (similarity, position) of the entries at or above ``threshold``, most
+        similar first.
+        """
+        if not self.entries:
+            return []
+        scores = self.vectors[:len(self.entries)] @ vector
+        positions = np.flatnonzero(scores >= threshold)
+        return sorted(((float(scores[i]), int(i)) for i in positions), reverse=True)
+
+
+class SemanticCacheClient:
+    """
+    Wraps a provider client and answers prompts that are near-duplicates of a prompt it
+    has already answered from the stored response.
+
+    Each request is looked up by its ``cache_key``, the question the evaluators pass, or
+    by the whole prompt without one; keying on the question keeps a long shared prompt
+    template (e.g. few-shot examples) from making different questions look alike. Keys
+    are embedded and searched in a vector index per client configuration (class and
+    ``PARAM_ATTRIBUTES``) and ``cache_namespace`` (the technique). A stored response is
+    reused when its key has cosine similarity of at least ``threshold`` and the same
+    numbers. Only responses that pass ``verify`` (by default: not a provider error) are
+    stored.
+
+    The wrapper has no ``stream_query``, so streaming evaluators send their requests
+    through ``query`` and the cache.
+
+    An ``audit_rate`` fraction of hits is still sent to the provider and compared with the
+    cached response; the disagreement rate estimates the accuracy cost of the cache.
+    """
+
+    # ``query`` accepts ``cache_key`` and ``cache_namespace``.
+    supports_semantic_cache = True
+
+    def __init__(
+        self,
+        client: Any,
+        encoder: Optional[Any] = None,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        audit_rate: Optional[float] = None,
+        verify: Callable[[str, str], bool] = lambda prompt, response: not is_error_response(response),
+        agree: Callable[[str, str], bool] = same_answer,
+    ):
+        """
+        Initializes the wrapper. Unset arguments come from the ``semantic_cache`` settings.
+
+        Args:
+            client: The provider client.
+            encoder: Turns texts into unit vectors via ``encode(texts)``. Defaults to the
+                shared encoder of the configured model, which must load: the hashing
+                fallback matches texts by shared words and would reuse wrong answers.
+            threshold: The cosine similarity at which a stored response is reused.
+            max_entries: Responses kept per client configuration.
+            audit_rate: The fraction of hits also sent to the provider, between 0 and 1.
+            verify: Decides whether a (prompt, response) pair may be stored.
+            agree: Decides whether an audited cached response matches the fresh one.
+        """
+        settings = get_settings().semantic_cache
+        if encoder is None:
+            from llm_orchestration_hw6.evaluation.metrics.encoders import get_encoder
+
+            encoder = get_encoder(settings.encoder, fallback=False)
+        self.client = client
+        self.encoder = encoder
+        self.threshold = settings.threshold if threshold is None else threshold
+        self.max_entries = max_entries or settings.max_entries
+        self.audit_rate = min(max(settings.audit_rate if audit_rate is None else audit_rate, 0.0), 1.0)
+        self.verify = verify
+        self.agree = agree
+        self.hits: OrderedDict[str, CacheHit] = collections.OrderedDict()
+        self._indexes: Dict[Hashable, VectorIndex] = {}
+        self._lock = threading.Lock()
+        self._hit_counter = itertools.count(1)
+        self.lookups = 0
+        self.hit_count = 0
+        self.audits = 0
+        self.disagreements = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # ``stream_query`` is not passed through: it would bypass the cache. Without it,
+        # streaming evaluators fall back to ``query``.
+        if name in ("client", "stream_query"):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def _partition(self, namespace: Optional[str] = None) -> Hashable:
+        params = {name: getattr(self.client, name, None) for name in PARAM_ATTRIBUTES}
+        return type(self.client).__qualname__, json.dumps(params, sort_keys=True, default=str), namespace
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        return np.asarray(self.encoder.encode([prompt]), dtype=np.float32)[0]
+
+    def lookup(
+        self, prompt: str, vector: Optional[np.ndarray] = None, namespace: Optional[str] = None
+    ) -> Optional[CacheHit]:
+        """
+        Returns the stored response for a near-duplicate of ``prompt``, if there is one.
+        """
+        vector = self._embed(prompt) if vector is None else vector
+        numbers = numbers_in(prompt)
+        with self._lock:
+            index = self._indexes.get(self._partition(namespace))
+            if index is None:
+                return None
+            for similarity, position in index.search(vector, self.threshold):
+                cached_prompt, response, cached_numbers = index.entries[position]
+                if cached_numbers == numbers:
+                    return CacheHit(cached_prompt, response, similarity)
+        return None
+
+    def store(
+        self, prompt: str, response: str, vector: Optional[np.ndarray] = None, namespace: Optional[str] = None
+    ):
+        """
+        Stores a response if ``verify`` accepts it.
+        """
+        if not self.verify(prompt, response):
+            return
+        vector = self._embed(prompt) if vector is None else vector
+        with self._lock:
+            index = self._indexes.setdefault(self._partition(namespace), VectorIndex(self.max_entries))
+            index.add(vector, (prompt, response, numbers_in(prompt)))
+
+    def _audit_due(self) -> bool:
+        n = next(self._hit_counter)
+        return int(n * self.audit_rate) != int((n - 1) * self.audit_rate)
+
+    def query(
+        self, prompt: str, cache_key: Optional[str] = None, cache_namespace: Optional[str] = None, **kwargs
+    ) -> str:
+        """
+        Returns a stored response for a near-duplicate request, or queries the client and
+        stores its response.
+
+        Args:
+            prompt: The prompt to send to the client.
+            cache_key: The text the request is looked up by, usually the question.
+                Defaults to the prompt.
+            cache_namespace: Keeps requests apart whose keys match but whose prompts
+                ask for different responses, e.g. the technique.
+            **kwargs: Passed to the client's ``query``.
+
+        Hits are recorded in ``hits`` under their key.
+        """
+        key = prompt if cache_key is None else cache_key
+        vector = self._embed(key)
+        hit = self.lookup(key, vector, cache_namespace)
+        with self._lock:
+            self.lookups += 1
+            if hit is not None:
+                self.hit_count += 1
+                self.hits[key] = hit
+                while len(self.hits) > self.max_entries:
+                    self.hits.popitem(last=False)
+        if hit is None:
+            response = self.client.query(prompt, **kwargs)
+            self.store(key, response, vector, cache_namespace)
+            return response
+        if self.audit_rate and self._audit_due():
+            fresh = self.client.query(prompt, **kwargs)
+            if self.verify(prompt, fresh):
+                with self._lock:
+                    self.audits += 1
+                    self.disagreements += not self.agree(hit.response, fresh)
+        return hit.response
+
+    def is_hit(self, key: str) -> bool:
+        with self._lock:
+            return key in self.hits
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit rate and, from audited hits, the estimated share of cached responses
+        that differ from what the provider would have answered.
+        """
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hit_count,
+                "hit_rate": self.hit_count / self.lookups if self.lookups else 0.0,
+                "entries": sum(len(index) for index in self._indexes.values()),
+                "audits": self.audits,
+                "disagreement_rate": self.disagreements / self.audits if self.audits else None,
+            }
+
+    def accuracy_impact(self, graded: Iterable[Tuple[str, bool]]) -> Dict[str, Optional[float]]:
+        """
+        Compares the accuracy of cached and provider answers once results are graded.
+
+        Args:
+            graded: (key, is_correct) pairs, the key being the question or prompt the
+                request was looked up by.
+
+        Returns:
+            The accuracy of prompts answered from the cache and of the others.
+        """
+        outcomes: Dict[bool, List[bool]] = {True: [], False: []}
+        for key, correct in graded:
+            outcomes[self.is_hit(key)].append(bool(correct))
+        return {
+            "hit_accuracy": float(np.mean(outcomes[True])) if outcomes[True] else None,
+            "miss_accuracy": float(np.mean(outcomes[False])) if outcomes[False] else None,
+        }
@@ -0,0 +1,102 @@
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Client attributes that change the response to a prompt and so belong in the request key.
+PARAM_ATTRIBUTES = ("base_url", "model", "max_tokens", "temperature")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the function and
+    every caller that arrives while it is running waits for and shares its result (or
+    exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Runs ``fn`` unless a call with ``key`` is already in flight, and returns its result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class SingleFlightClient:
+    """
+    Wraps a provider client so that concurrent identical requests (same provider, model,
+    parameters, prompt and keyword arguments) are sent once and the response is shared.
+
+    Only ``query`` is coalesced; every other attribute, e.g. ``usage`` or
+    ``query_samples`` (whose samples must stay independent), goes to the wrapped client.
+    ``stream_query`` is not exposed: a streamed request could not be shared, so streaming
+    evaluators fall back to the coalesced ``query``.
+    """
+
+    def __init__(self, client: Any, flight: Optional[SingleFlight] = None):
+        """
+        Initializes the wrapper.
+
+        Args:
+            client: The provider client.
+            flight: The coalescer. Share one between wrappers of the same client to
+                coalesce across them.
+        """
+        self.client = client
+        self.flight = flight or SingleFlight()
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("client", "stream_query"):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def request_key(self, prompt: str, kwargs: Dict[str, Any]) -> Hashable:
+        """
+        Returns the key identifying a request to the wrapped client.
+        """
+        params = {name: getattr(self.client, name, None) for name in PARAM_ATTRIBUTES}
+        return (
+            type(self.client).__qualname__,
+            json.dumps(params, sort_keys=True, default=str),
+            json.dumps(kwargs, sort_keys=True, default=str),
+            prompt,
+        )
+
+    def query(self, prompt: str, **kwargs) -> str:
+        """
+        Sends a query, joining an identical request already in flight if there is one.
+        """
+        return self.flight.do(self.request_key(prompt, kwargs), lambda: self.client.query(prompt, **kwargs))
@@ -0,0 +1,108 @@
+import re
+from typing import Callable, Iterable, Optional, Tuple
+
+# A stop condition receives the extractor after every token and decides whether
+# generation can be cancelled.
+StopCondition = Callable[["IncrementalAnswerExtractor"], bool]
+
+
+class IncrementalAnswerExtractor:
+    """
+    Consumes streamed tokens and pulls out the final answer line as soon as it is complete.
+
+    Only newly completed lines are scanned on each call to ``feed``, so the cost of
+    extraction stays linear in the length of the response.
+    """
+
+    def __init__(self, prefixes: Tuple[str, ...] = ("Answer:",)):
+        """
+        Initializes the extractor.
+
+        Args:
+            prefixes: Line prefixes (case-insensitive) that introduce the final answer.
+        """
+        self._pattern = re.compile(
+            r"^\s*(" + "|".join(re.escape(p) for p in prefixes) + r")\s*(.*)$",
+            re.IGNORECASE,
+        )
+        self._buffer = ""
+        self._scanned = 0
+        self.text = ""
+        self.answer: Optional[str] = None
+        # The prefix that introduced the answer, as it appeared in the text.
+        self.label: Optional[str] = None
+
+    def feed(self, token: str) -> Optional[str]:
+        """
+        Adds a token to the buffer and scans any newly completed lines.
+
+        Args:
+            token: The next chunk of streamed text.
+
+        Returns:
+            The extracted answer once a complete, non-empty answer line has been seen.
+        """
+        self.text += token
+        self._buffer += token
+        while self.answer is None:
+            newline = self._buffer.find("\n", self._scanned)
+            if newline == -1:
+                break
+            self._match_line(self._buffer[:newline])
+            self._buffer = self._buffer[newline + 1:]
+            self._scanned = 0
+        if self.answer is None:
+            self._scanned = len(self._buffer)
+        return self.answer
+
+    def finish(self) -> Optional[str]:
+        """
+        Flushes the trailing partial line once the stream has ended.
+
+        Returns:
+            The extracted answer, or None if no answer line was produced.
+        """
+        if self.answer is None and self._buffer:
+            self._match_line(self._buffer)
+        return self.answer
+
+    @property
+    def done(self) -> bool:
+        return self.answer is not None
+
+    def _match_line(self, line: str):
+        match = self._pattern.match(line)
+        if match and match.group(2).strip():
+            self.label = match.group(1)
+            self.answer = match.group(2).strip()
+
+
+def stop_on_answer(extractor: IncrementalAnswerExtractor) -> bool:
+    """
+    Stop condition that cancels generation once the answer line is complete.
+    """
+    return extractor.done
+
+
+def consume_stream(
+    tokens: Iterable[str],
+    extractor: IncrementalAnswerExtractor,
+    stop_condition: Optional[StopCondition] = None,
+) -> bool:
+    """
+    Feeds a token stream into an extractor until the stream ends or the stop condition fires.
+
+    Args:
+        tokens: An iterable of text chunks.
+        extractor: The extractor to feed.
+        stop_condition: Called after every chunk; returning True stops consumption early.
+
+    Returns:
+        True if consumption was stopped early by the stop condition.
+    """
+    for token in tokens:
+        extractor.feed(token)
+        if stop_condition is not None and stop_condition(extractor):
+            return True
+    extractor.finish()
+    return False
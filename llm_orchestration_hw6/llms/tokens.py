@@ -0,0 +1,172 @@
+import collections
+import functools
+import math
+import threading
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised only without tiktoken installed
+    tiktoken = None
+
+# Context windows (prompt plus output tokens) by model name prefix; the longest match wins.
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+    "gpt-3.5-turbo-instruct": 4_096,
+    "text-davinci-003": 4_097,
+    "llama3": 8_192,
+    "llama3.1": 131_072,
+    "gemini-pro": 32_760,
+}
+DEFAULT_CONTEXT_WINDOW = 4_096
+FALLBACK_ENCODING = "cl100k_base"
+
+
+def context_window(model: Optional[str]) -> int:
+    """
+    Returns the context window of a model, or ``DEFAULT_CONTEXT_WINDOW`` if it is unknown.
+    """
+    matches = [prefix for prefix in CONTEXT_WINDOWS if model and str(model).startswith(prefix)]
+    return CONTEXT_WINDOWS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_WINDOW
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoding(model: Optional[str] = None) -> Optional[Any]:
+    """
+    Returns the tiktoken encoding for a model, loaded once per model.
+
+    Unknown models use ``cl100k_base``. Returns None when tiktoken is not installed or its
+    encoding files cannot be loaded (e.g. offline), in which case counts are estimated.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(FALLBACK_ENCODING)
+    except KeyError:
+        return get_encoding(None) if model else None
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+@functools.lru_cache(maxsize=8192)
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Counts the tokens of a text for a model.
+
+    Counts are cached, so the static parts of prompts (few-shot examples, instructions)
+    are tokenized once. Without a tokenizer the count is estimated at four characters
+    per token.
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def fit_max_tokens(prompt: str, max_tokens: int, model: Optional[str] = None) -> int:
+    """
+    Caps the output tokens of a request so prompt plus output fit the context window.
+
+    Raises:
+        ValueError: The prompt alone fills the context window.
+    """
+    window = context_window(model)
+    available = window - count_tokens(prompt, model)
+    if available <= 0:
+        raise ValueError(f"Prompt of {window - available} tokens exceeds the {window}-token context window of {model}")
+    return min(max_tokens, available)
+
+
+def fit_examples(examples: List[str], budget: int, model: Optional[str] = None) -> List[str]:
+    """
+    Returns the leading examples whose combined token count fits in ``budget``.
+
+    Args:
+        examples: Formatted examples, most useful first.
+        budget: The tokens available for examples.
+        model: The model whose tokenizer is used.
+    """
+    kept, used = [], 0
+    for example in examples:
+        used += count_tokens(example, model)
+        if used > budget:
+            break
+        kept.append(example)
+    return kept
+
+
+class MaxTokensEstimator:
+    """
+    Sizes ``max_tokens`` per technique from the output lengths observed so far.
+
+    Until a technique has ``min_samples`` observations its default is used; after that
+    the estimate is the ``quantile`` of the recent output lengths times ``margin``, so
+    short-answer techniques stop reserving hundreds of unused tokens while long CoT or
+    ReAct outputs are not cut off.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 95,
+        margin: float = 1.2,
+        min_samples: int = 20,
+        minimum: int = 16,
+        maximum: Optional[int] = None,
+        window: int = 500,
+    ):
+        """
+        Initializes the estimator.
+
+        Args:
+            quantile: The percentile of observed output lengths to cover.
+            margin: The headroom multiplied onto that percentile.
+            min_samples: Observations needed before the estimate replaces the default.
+            minimum: The smallest estimate.
+            maximum: The largest estimate.
+            window: Recent observations kept per technique.
+        """
+        self.quantile = quantile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self._lengths: Dict[str, Deque[int]] = collections.defaultdict(lambda: collections.deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def observe(self, technique: str, output_tokens: int, truncated: bool = False):
+        """
+        Records the length of one response.
+
+        Args:
+            technique: The technique that produced it.
+            output_tokens: The response length in tokens.
+            truncated: The response hit the token cap, so the true length is unknown; it
+                is recorded at twice the cap to grow the estimate.
+        """
+        with self._lock:
+            self._lengths[technique].append(output_tokens * 2 if truncated else output_tokens)
+
+    def estimate(self, technique: str, default: int) -> int:
+        """
+        Returns the ``max_tokens`` to request for a technique.
+        """
+        with self._lock:
+            lengths = list(self._lengths.get(technique, ()))
+        if len(lengths) < self.min_samples:
+            return default
+        estimate = max(self.minimum, math.ceil(np.percentile(lengths, self.quantile) * self.margin))
+        return min(estimate, self.maximum) if self.maximum else estimate
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                technique: {"samples": len(lengths), "p95": float(np.percentile(lengths, 95))}
+                for technique, lengths in self._lengths.items()
+                if lengths
+            }
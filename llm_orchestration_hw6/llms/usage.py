@@ -0,0 +1,48 @@
+import threading
+from typing import Any, Dict
+
+
+class UsageTracker:
+    """
+    Thread-safe accumulator for the token usage reported by a provider.
+
+    Cached tokens are the prompt tokens the provider served from its prompt cache,
+    so ``cache_hit_rate`` shows how much of the static prompt prefixes were reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, usage: Any):
+        """
+        Adds a provider usage object (or None, which is ignored) to the totals.
+
+        Args:
+            usage: The ``usage`` field of a provider response.
+        """
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+            self.cached_tokens += cached
+
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_hit_rate": self.cache_hit_rate,
+        }
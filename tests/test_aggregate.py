@@ -0,0 +1,47 @@
+import pandas as pd
+
+from llm_orchestration_hw6.evaluation.aggregate import aggregate, assign_domains, to_long
+
+
+def make_scores():
+    return pd.DataFrame({
+        "question_id": [1, 2, 16, 17],
+        "domain": [None, None, None, None],
+        "GPT_Baseline": [1.0, 0.0, 1.0, 1.0],
+        "GPT_CoT": [1.0, 1.0, 0.0, 0.0],
+        "Grok_Baseline": [0.0, 0.0, 1.0, 0.0],
+    })
+
+
+def test_to_long_splits_model_and_technique():
+    long_df = to_long(make_scores())
+    assert len(long_df) == 12
+    assert set(long_df["model"]) == {"GPT", "Grok"}
+    assert set(long_df["technique"]) == {"Baseline", "CoT"}
+
+
+def test_assign_domains_leaves_gaps_empty():
+    domains = assign_domains(pd.Series([1, 7, 8, 16, 100]))
+    assert domains.tolist()[:2] == ["Arithmetic", "Arithmetic"]
+    assert pd.isna(domains[2])
+    assert domains.tolist()[3:] == ["Logic", "Applied_Integration"]
+
+
+def test_aggregate_rollups():
+    metadata = pd.DataFrame({"question_id": [1, 2, 16, 17], "difficulty": ["easy", "hard", "easy", "hard"]})
+    results = aggregate(to_long(make_scores()), metadata)
+
+    by_model = results["by_model"].set_index("model")["accuracy"]
+    assert by_model["GPT"] == 5 / 8
+    assert by_model["Grok"] == 1 / 4
+
+    by_domain = results["by_domain"].set_index("domain")["accuracy"]
+    assert by_domain["Arithmetic"] == 3 / 6
+    assert by_domain["Logic"] == 3 / 6
+
+    by_difficulty = results["by_difficulty"].set_index("difficulty")["accuracy"]
+    assert by_difficulty["easy"] == 4 / 6
+
+    detailed = results["detailed"].set_index(["model", "technique"])
+    assert detailed.loc[("GPT", "CoT"), "accuracy"] == 0.5
+    assert detailed.loc[("GPT", "CoT"), "questions"] == 4
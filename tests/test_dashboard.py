@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from llm_orchestration_hw6.cli.main import generate_plot
+from llm_orchestration_hw6.data.store import read_results, write_results
+from llm_orchestration_hw6.evaluation.aggregate import to_long
+from llm_orchestration_hw6.evaluation.dashboard import columnar_payload, load_dashboard_frame, render_dashboard
+
+
+def test_columnar_payload_dictionary_encodes_labels():
+    df = pd.DataFrame({
+        "model": ["GPT", "Grok", "GPT"],
+        "score": [1.0, np.nan, 0.5],
+    })
+    payload = columnar_payload(df)
+
+    assert payload["rows"] == 3
+    assert payload["columns"]["model"] == {"type": "dict", "dict": ["GPT", "Grok"], "codes": [0, 1, 0]}
+    assert payload["columns"]["score"] == {"type": "number", "values": [1.0, None, 0.5]}
+
+
+def test_render_dashboard_embeds_escaped_data():
+    df = pd.DataFrame({"model": ["GPT"], "technique": ["CoT"], "score": [1.0], "extracted": ["</script>"]})
+    html = render_dashboard(df, title="Sweep")
+
+    assert "<title>Sweep</title>" in html
+    assert "<title>A &lt;b&gt; &amp; C</title>" in render_dashboard(df, title="A <b> & C")
+    data = html.split('<script type="application/json" id="data">')[1].split("</script>")[0]
+    assert json.loads(data)["columns"]["extracted"]["dict"] == ["</script>"]
+
+
+def test_load_dashboard_frame_adds_domains(tmp_path):
+    path = tmp_path / "graded_scores.csv"
+    pd.DataFrame({"question_id": [1, 16], "GPT_Baseline": [1.0, 0.0]}).to_csv(path, index=False)
+
+    df = load_dashboard_frame(str(path))
+    assert df.columns.tolist() == ["question_id", "domain", "model", "technique", "score"]
+    assert df["domain"].astype(str).tolist() == ["Arithmetic", "Logic"]
+
+
+def test_dashboard_defaults_next_to_a_results_store(tmp_path):
+    store = write_results(to_long(pd.DataFrame({"question_id": [1, 2], "GPT_CoT": [1.0, 0.0]})), str(tmp_path / "store"))
+    for _ in range(2):
+        # Called directly: invoking the app would install the packaged logging config.
+        generate_plot(results_path=store, output_dir="", workers=0, force=False, dashboard=True)
+        assert len(read_results(store)) == 2
+    assert (tmp_path / "dashboard.html").exists()
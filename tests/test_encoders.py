@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pytest
+
+from llm_orchestration_hw6.config.settings import configure
+from llm_orchestration_hw6.evaluation.metrics import calculate_accuracy, calculate_f1_score, encoders
+from llm_orchestration_hw6.evaluation.metrics.encoders import (
+    BucketedEncoder,
+    HashingEncoder,
+    OnnxEncoder,
+    compare_encoders,
+    get_encoder,
+    token_batches,
+)
+
+TEXTS = ["The answer is 4", "4", "Paris", "The capital of France is Paris", "William Shakespeare"]
+
+
+class NoisyEncoder(HashingEncoder):
+    def encode(self, texts, batch_size=256):
+        vectors = super().encode(texts, batch_size)
+        noise = np.random.default_rng(0).normal(scale=0.01, size=vectors.shape)
+        return encoders._normalize_rows((vectors + noise).astype(np.float32))
+
+
+def test_compare_identical_encoders():
+    report = compare_encoders(HashingEncoder(), HashingEncoder(), TEXTS)
+    assert report["mean_cosine"] == pytest.approx(1.0)
+    assert report["max_similarity_error"] == pytest.approx(0.0, abs=1e-6)
+    assert report["decision_agreement"] == 1.0
+
+
+def test_compare_detects_small_differences():
+    report = compare_encoders(HashingEncoder(), NoisyEncoder(), TEXTS)
+    assert 0.9 < report["min_cosine"] < 1.0
+    assert 0 < report["max_similarity_error"] < 0.1
+
+
+def test_get_encoder_backends():
+    assert isinstance(get_encoder("hashing"), HashingEncoder)
+    with pytest.raises(ValueError):
+        get_encoder("all-MiniLM-L6-v2", backend="tensorflow")
+
+
+def test_onnx_encoder_defaults_come_from_settings():
+    encoder = OnnxEncoder()
+    assert encoder.name == "all-MiniLM-L6-v2"
+    assert encoder.model_dir == os.path.join("cache/onnx", "all-MiniLM-L6-v2")
+    assert encoder.quantize is True
+    assert OnnxEncoder("org/model", intra_op_threads=2).model_dir.endswith("org__model")
+
+
+@pytest.mark.skipif(encoders.onnxruntime is not None, reason="onnxruntime is installed")
+def test_onnx_encoder_requires_onnxruntime():
+    with pytest.raises(ImportError):
+        OnnxEncoder().load()
+
+
+def tiny_sentence_transformer(path):
+    transformers = pytest.importorskip("transformers")
+    st_models = pytest.importorskip("sentence_transformers.models")
+    from sentence_transformers import SentenceTransformer
+
+    words = " ".join(TEXTS).lower().split()
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *sorted(set(words))]
+    hf_dir = path / "hf"
+    hf_dir.mkdir()
+    (hf_dir / "vocab.txt").write_text("\n".join(vocab))
+    transformers.BertTokenizerFast(vocab_file=str(hf_dir / "vocab.txt")).save_pretrained(hf_dir)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2, intermediate_size=64
+    )
+    transformers.BertModel(config).save_pretrained(hf_dir)
+    modules = [st_models.Transformer(str(hf_dir)), st_models.Pooling(32, "mean"), st_models.Normalize()]
+    SentenceTransformer(modules=modules, device="cpu").save(str(path / "model"))
+    return str(path / "model")
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_exported_onnx_model_agrees_with_pytorch(tmp_path, quantize):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    model = tiny_sentence_transformer(tmp_path)
+    onnx_encoder = OnnxEncoder(model, model_dir=str(tmp_path / "onnx"), quantize=quantize)
+    report = compare_encoders(encoders.SentenceTransformerEncoder(model), onnx_encoder, TEXTS)
+    assert report["min_cosine"] > 0.99
+    assert report["decision_agreement"] == 1.0
+
+
+class RecordingEncoder(HashingEncoder):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def encode(self, texts, batch_size=256):
+        self.batches.append(list(texts))
+        return super().encode(texts, batch_size)
+
+
+def test_token_batches_respect_the_budget():
+    lengths = [1, 50, 2, 3, 40, 200, 1]
+    batches = token_batches(lengths, max_batch_tokens=100, max_batch_size=3)
+    assert sorted(np.concatenate(batches).tolist()) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= 100
+    assert [5] in [batch.tolist() for batch in batches]
+    assert token_batches([], 100, 3) == []
+
+
+def test_bucketed_encoder_restores_input_order():
+    texts = ["word " * 30, "4", "Paris", "the capital of France is Paris " * 5, "56"]
+    inner = RecordingEncoder()
+    bucketed = BucketedEncoder(inner, max_batch_tokens=40, max_batch_size=8)
+    vectors = bucketed.encode(texts)
+    assert np.allclose(vectors, HashingEncoder().encode(texts))
+    assert inner.batches[0] == ["4", "Paris", "56"]
+    stats = bucketed.last_stats
+    assert stats["texts"] == 5 and stats["tokens"] == sum(inner.token_lengths(texts))
+    assert stats["tokens_per_second"] > 0
+    assert bucketed.stats()["padded_tokens"] >= stats["tokens"]
+    assert bucketed.encode([]).shape[0] == 0
+
+
+def test_metrics_with_configured_encoder():
+    configure(overrides={"encoder.model": "hashing"})
+    try:
+        ground_truth = [{"ground_truth_answer": "4"}, {"ground_truth_answer": "Paris or paris"}, {"ground_truth_answer": "56"}]
+        assert calculate_accuracy(ground_truth, ["4", "paris", "55"]) == pytest.approx(2 / 3)
+        assert calculate_accuracy(ground_truth, ["4"]) == pytest.approx(1 / 3)
+        assert calculate_f1_score(ground_truth, ["4", "paris", "55"]) == pytest.approx(2 / 3)
+    finally:
+        configure()
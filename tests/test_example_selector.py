@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from llm_orchestration_hw6.evaluation.metrics.encoders import HashingEncoder
+from llm_orchestration_hw6.evaluation.techniques.example_selector import ExampleSelector
+from llm_orchestration_hw6.evaluation.techniques.few_shot import FewShotEvaluator
+
+POOL = [
+    ("What is 7 times 8?", "56"),
+    ("What is the capital of Italy?", "Rome"),
+    ("Who wrote Hamlet?", "William Shakespeare"),
+    ("What is 12 times 12?", "144"),
+    ("What is the capital of Spain?", "Madrid"),
+]
+
+
+class CountingEncoder(HashingEncoder):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def encode(self, texts, batch_size=256):
+        self.calls.append(list(texts))
+        return super().encode(texts, batch_size)
+
+
+def test_hashing_encoder_returns_unit_vectors():
+    vectors = HashingEncoder(dim=64).encode(["What is 2+2?", "capital of France", ""])
+    assert vectors.shape == (3, 64)
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0)
+    assert not vectors[2].any()
+
+
+def test_selects_most_similar_examples_first():
+    selector = ExampleSelector(POOL, k=2, encoder=HashingEncoder())
+    capitals = selector.select("What is the capital of France?")
+    assert {q for q, _ in capitals} == {"What is the capital of Italy?", "What is the capital of Spain?"}
+    assert selector.select("What is 9 times 8?")[0] == ("What is 7 times 8?", "56")
+
+
+def test_excludes_the_question_itself():
+    selector = ExampleSelector(POOL, k=2, encoder=HashingEncoder())
+    assert ("Who wrote Hamlet?", "William Shakespeare") not in selector.select("Who  wrote Hamlet?")
+    assert len(selector.select("Who wrote Hamlet?")) == 2
+
+
+def test_select_many_embeds_uncached_questions_in_one_batch():
+    encoder = CountingEncoder()
+    selector = ExampleSelector(POOL, k=1, encoder=encoder, batch_size=10)
+    questions = ["What is 9 times 8?", "Capital of Portugal?", "What is 9 times 8?"]
+    results = selector.select_many(questions)
+    assert results[0] == results[2]
+    assert encoder.calls[1:] == [["What is 9 times 8?", "Capital of Portugal?"]]
+    selector.select_many(questions)
+    assert len(encoder.calls) == 2
+    assert selector.cache_info()["size"] == 2
+
+
+def test_cache_is_bounded():
+    selector = ExampleSelector(POOL, k=1, encoder=HashingEncoder(), cache_size=2, batch_size=2)
+    results = selector.select_many(["a b c", "d e f", "g h i"])
+    assert len(results) == 3
+    assert selector.cache_info()["size"] == 2
+
+
+def test_empty_pool_is_rejected():
+    with pytest.raises(ValueError):
+        ExampleSelector([], encoder=HashingEncoder())
+
+
+def test_few_shot_uses_selected_examples():
+    selector = ExampleSelector.from_records(
+        [{"question": q, "ground_truth_answer": a} for q, a in POOL], k=2, encoder=HashingEncoder()
+    )
+    evaluator = FewShotEvaluator(selector=selector)
+    evaluator.warm(["What is the capital of France?"])
+    prompt = evaluator.evaluate("What is the capital of France?")["prompt"]
+    assert "Q: What is the capital of Italy?\nA: Rome" in prompt
+    assert "Hamlet" not in prompt
+    assert prompt.endswith("Question: What is the capital of France?\nAnswer:")
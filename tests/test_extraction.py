@@ -0,0 +1,42 @@
+from llm_orchestration_hw6.evaluation.extraction import (
+    extract,
+    extract_many,
+    normalize_numeric,
+    rules_for,
+    split_numbered,
+)
+
+
+def test_extract_records_the_rule_that_fired():
+    assert extract("Think: add\nAct: 15 + 23\nAnswer: 38.") == ("38", "answer_line")
+    assert extract("Q1: What is 15 + 23?\nA1: 38", "react") == ("38", "a_label")
+    assert extract("12.  x = 4", "baseline") == ("4", "numbered")
+    assert extract("- Q6: 2x + 5 = 13 ⇒ x = 4.", "CoT", "Perplexity") == ("4", "equation")
+    assert extract("Step 1: add the tens\nSo the answer is 38", "cot") == ("38", "conclusion")
+    assert extract("Paris") == ("Paris", "last_line")
+    assert extract("   ") == ("", "empty")
+
+
+def test_normalize_numeric():
+    assert normalize_numeric("1,200.50 USD") == "$1200.5"
+    assert normalize_numeric("5 hrs") == "5 hours"
+    assert normalize_numeric("**Yes**") == "Yes"
+    assert normalize_numeric("−2.0") == "-2"
+    assert normalize_numeric("y = 2x") == "y = 2x"
+
+
+def test_rules_are_shared_across_name_spellings():
+    assert rules_for("few_shot", "GPT") is rules_for("FewShot", "gpt")
+    assert rules_for("cot", "peplexity")[0][0] == "equation"
+
+
+def test_split_numbered_keeps_numeric_answers():
+    text = "Answers: 1. 38 2. 55 3. 56 4. 3.5 5. 2. 6. Yes"
+    assert split_numbered(text) == ["38", "55", "56", "3.5", "2.", "Yes"]
+
+
+def test_extract_many_matches_single_extraction():
+    texts = ["Answer: 38", "1. 55", None, "A3: 56", "Paris"] * 3
+    result = extract_many(texts, "react", max_workers=2, chunk_size=2)
+    assert result["answer"].tolist() == [extract(t, "react")[0] for t in texts]
+    assert result["rule"].tolist()[:5] == ["answer_line", "numbered", "empty", "a_label", "last_line"]
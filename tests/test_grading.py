@@ -0,0 +1,56 @@
+import os
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from llm_orchestration_hw6.evaluation.grading import fuzzy_ratios, grade_matrix
+
+
+@pytest.fixture
+def results():
+    return pd.DataFrame({
+        "question_id": [1, 2, 3],
+        "domain": ["Arithmetic", "Arithmetic", "Logic"],
+        "GPT_Baseline": [" 38 ", "55", None],
+        "Grok_Baseline": ["38", "paris is nice", "Yes"],
+    })
+
+
+def test_exact_grading(results):
+    scores = grade_matrix(results, {1: "38", 2: "55", 3: "yes"}, method="exact")
+    assert list(scores.columns) == ["question_id", "domain", "GPT_Baseline", "Grok_Baseline"]
+    assert scores["GPT_Baseline"].tolist() == [1.0, 1.0, 0.0]
+    assert scores["Grok_Baseline"].tolist() == [1.0, 0.0, 1.0]
+
+
+def test_fuzzy_grading_gives_partial_credit(results):
+    scores = grade_matrix(results, {1: "38", 2: "paris", 3: "no"}, method="fuzzy")
+    assert scores.loc[0, "Grok_Baseline"] == 1.0
+    assert 0.0 < scores.loc[1, "Grok_Baseline"] < 1.0
+    assert scores.loc[2, "Grok_Baseline"] == 0.0
+
+
+def test_containment_grading_by_position(results):
+    scores = grade_matrix(results, ["38", "paris", "yes indeed"], method="containment")
+    assert scores["Grok_Baseline"].tolist() == [1.0, 0.8, 0.8]
+
+
+def test_fuzzy_ratios_bounds():
+    ratios = fuzzy_ratios(np.array(["abc", "abc"]), np.array(["abc", "xyz"]))
+    assert ratios.tolist() == [1.0, 0.0]
+
+
+def test_fuzzy_ratios_match_sequence_matcher_on_repo_results():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = pd.read_csv(os.path.join(root, "results.csv"))
+    truth = pd.read_csv(os.path.join(root, "ground_truth.csv"))["ground_truth_answer"]
+    columns = [c for c in results.columns if c not in ("question_id", "domain")]
+    t = np.repeat(truth.astype(str).str.strip().str.lower().to_numpy()[:len(results)], len(columns))
+    p = results[columns].fillna("").astype(str).apply(lambda col: col.str.strip().str.lower()).to_numpy().ravel()
+
+    expected = np.array([SequenceMatcher(None, a, b).ratio() for a, b in zip(t, p)])
+    assert np.allclose(fuzzy_ratios(t, p), expected)
+    floored = fuzzy_ratios(t, p, floor=0.425)
+    assert np.allclose(floored, np.where(expected >= 0.425, expected, 0.0))
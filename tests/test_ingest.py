@@ -0,0 +1,90 @@
+import json
+
+import pandas as pd
+import pytest
+
+from llm_orchestration_hw6.data.ingest import extract_answer, ingest, read_file, to_wide, validate
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_extract_answer_prefers_answer_lines():
+    assert extract_answer("Think: add\nAct: 15 + 23\nAnswer: 38") == "38"
+    assert extract_answer("Step 1\nStep 2\nFinal Answer: Paris") == "Paris"
+    assert extract_answer("12. The answer is 12") == "The answer is 12"
+
+
+def test_read_text_handles_numbered_and_block_layouts(tmp_path):
+    numbered = write(tmp_path / "GPT" / "baseline_prompts_GPT.txt", "1. 38\n2. 55\n3) Paris\n")
+    blocks = write(
+        tmp_path / "GPT" / "react_prompts_GPT.txt",
+        "----- Prompt for Question 1 -----\nQuestion: 15 + 23?\n1. add\nAnswer: 38\n\n"
+        "----- Prompt for Question 2 -----\nQuestion: 100 - 45?\nAnswer: 55\n",
+    )
+
+    df = read_file(str(numbered))
+    assert df["extracted"].tolist() == ["38", "55", "Paris"]
+    assert set(df["model"]) == {"GPT"} and set(df["technique"]) == {"baseline"}
+
+    df = read_file(str(blocks))
+    assert df["question_id"].tolist() == [1, 2]
+    assert df["extracted"].tolist() == ["38", "55"]
+
+
+def test_read_text_handles_qa_pairs_and_labeled_lines(tmp_path):
+    pairs = write(tmp_path / "Grok" / "cot_prompts_grok.txt", "Q1: 15 + 23?\nA1: 38\nQ2: 100 - 45?\nA2: 55\n")
+    labeled = write(tmp_path / "Grok" / "answers.txt", "Q1_Baseline: 38\nQ1_CoT: 38\nQ2_Baseline: 54\n")
+
+    assert read_file(str(pairs))["extracted"].tolist() == ["38", "55"]
+
+    df = read_file(str(labeled))
+    assert df["technique"].tolist() == ["Baseline", "CoT", "Baseline"]
+    assert df["extracted"].tolist() == ["38", "38", "54"]
+
+
+def test_csv_and_json_readers(tmp_path):
+    csv_path = tmp_path / "Perplexity" / "answers.csv"
+    csv_path.parent.mkdir()
+    pd.DataFrame({"question_id": [1, 2], "baseline": ["38", "55"], "cot": ["38", "56"]}).to_csv(csv_path, index=False)
+    json_path = write(tmp_path / "Perplexity" / "few_shot_prompts_perplexity.json", json.dumps({"Q1": "38", "Q2": "55"}))
+
+    df = validate(read_file(str(csv_path)))
+    assert df["technique"].astype(str).tolist() == ["Baseline", "Baseline", "CoT", "CoT"]
+    assert df["extracted"].tolist() == ["38", "55", "38", "56"]
+
+    df = validate(read_file(str(json_path)))
+    assert set(df["technique"]) == {"FewShot"}
+    assert df["extracted"].tolist() == ["38", "55"]
+
+
+def test_validate_rejects_unlabeled_rows_and_dedupes():
+    df = pd.DataFrame({
+        "question_id": [1, 1, 2],
+        "model": ["GPT", "GPT", "GPT"],
+        "technique": ["baseline", "Baseline", "Baseline"],
+        "raw": ["38", "39", "55"],
+        "extracted": ["38", "39", "55"],
+    })
+    validated = validate(df)
+    assert validated["extracted"].tolist() == ["38", "55"]
+    assert validated["model"].dtype == "category"
+
+    with pytest.raises(ValueError):
+        validate(df.assign(model=None))
+
+
+def test_ingest_and_to_wide(tmp_path):
+    write(tmp_path / "GPT" / "baseline_prompts_GPT.txt", "1. 38\n2. 55\n")
+    write(tmp_path / "Grok" / "baseline_prompts_grok.txt", "1. 38\n")
+
+    store = ingest(str(tmp_path))
+    assert len(store) == 3
+
+    wide = to_wide(store, question_ids=range(1, 4))
+    assert wide.columns.tolist() == ["question_id", "domain", "GPT_Baseline", "Grok_Baseline"]
+    assert wide["GPT_Baseline"].tolist()[:2] == ["38", "55"]
+    assert wide["Grok_Baseline"].isna().tolist() == [False, True, True]
@@ -1,6 +1,6 @@
 import os
 import pandas as pd
-from llm_orchestration_hw6.data.loader import load_dataset
+from llm_orchestration_hw6.data.loader import dedupe_questions, load_dataset
 
 def test_load_dataset():
     # Create a dummy CSV file for testing
@@ -28,3 +28,17 @@ def test_load_dataset():
 
     # Clean up the dummy CSV file
     os.remove(test_csv_path)
+
+def test_dedupe_questions():
+    rows = [
+        {'id': 1, 'question': 'What is 2+2?'},
+        {'id': 2, 'question': 'Capital of France?'},
+        {'id': 3, 'question': ' What is  2+2? '},
+    ]
+    unique, positions = dedupe_questions(rows)
+    assert [row['id'] for row in unique] == [1, 2]
+    assert positions == [0, 1, 0]
+
+    unique, positions = dedupe_questions(['a', 'b', 'a', 'a'])
+    assert unique == ['a', 'b']
+    assert positions == [0, 1, 0, 0]
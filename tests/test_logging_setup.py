@@ -0,0 +1,84 @@
+import json
+import logging
+import logging.handlers
+
+import pytest
+
+from llm_orchestration_hw6.config.logging_setup import (
+    REQUEST_LOGGER,
+    JsonFormatter,
+    SamplingFilter,
+    setup_logging,
+    stop_logging,
+)
+
+
+@pytest.fixture
+def restore_logging():
+    """
+    Restores the loggers setup_logging configures, so no handler (e.g. the app.log file
+    handler of the packaged config) outlives the test.
+    """
+    names = ["", "llm_orchestration_hw6", REQUEST_LOGGER]
+    saved = {}
+    for name in names:
+        logger = logging.getLogger(name)
+        saved[name] = (list(logger.handlers), list(logger.filters), logger.level, logger.propagate, logger.disabled)
+    yield
+    stop_logging()
+    for name, (handlers, filters, level, propagate, disabled) in saved.items():
+        logger = logging.getLogger(name)
+        for handler in logger.handlers:
+            if handler not in handlers:
+                handler.close()
+        logger.handlers[:] = handlers
+        logger.filters[:] = filters
+        logger.setLevel(level)
+        logger.propagate = propagate
+        logger.disabled = disabled
+
+
+class ListHandler(logging.Handler):
+    records = []
+
+    def emit(self, record):
+        ListHandler.records.append(record)
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.makeLogRecord({"name": "x", "levelno": logging.INFO, "levelname": "INFO", "msg": "done %s", "args": (1,)})
+    record.llm = "GPT"
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "done 1"
+    assert payload["llm"] == "GPT"
+    assert payload["level"] == "INFO"
+
+
+def test_sampling_filter_keeps_fraction_and_all_warnings():
+    sampler = SamplingFilter(rate=0.1)
+    info = logging.makeLogRecord({"levelno": logging.INFO})
+    warning = logging.makeLogRecord({"levelno": logging.WARNING})
+    assert sum(sampler.filter(info) for _ in range(100)) == 10
+    assert all(sampler.filter(warning) for _ in range(5))
+
+
+def test_setup_logging_writes_through_queue(restore_logging):
+    ListHandler.records = []
+    config = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {"memory": {"()": ListHandler}},
+        "loggers": {"llm_orchestration_hw6": {"level": "INFO", "handlers": ["memory"], "propagate": False}},
+    }
+    listener = setup_logging(config, request_sample_rate=0.5)
+    try:
+        package_logger = logging.getLogger("llm_orchestration_hw6")
+        assert [type(h) for h in package_logger.handlers] == [logging.handlers.QueueHandler]
+        for i in range(4):
+            logging.getLogger(REQUEST_LOGGER).info("request %d", i, extra={"request": i})
+        package_logger.warning("slow backend")
+    finally:
+        stop_logging()
+    assert listener is not None
+    assert [r.getMessage() for r in ListHandler.records] == ["request 1", "request 3", "slow backend"]
+    assert ListHandler.records[0].request == 1
@@ -0,0 +1,68 @@
+import json
+import threading
+import time
+
+import httpx
+
+from llm_orchestration_hw6.llms.providers import OllamaClient, OpenAICompatibleClient
+from llm_orchestration_hw6.llms.providers.ollama_client import ConcurrencyTuner
+
+
+def use_transport(client, handler):
+    client.http = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_ollama_query_sends_keep_alive_and_records_usage():
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"response": " 42 \n", "prompt_eval_count": 10, "eval_count": 2})
+
+    client = use_transport(OllamaClient(model="llama3", keep_alive="1h", max_tokens=64), handler)
+    assert client.query("What is 6 x 7?") == "42"
+    assert requests[0]["keep_alive"] == "1h"
+    assert requests[0]["options"]["num_predict"] == 64
+    assert requests[0]["stream"] is False
+    assert client.usage.as_dict()["prompt_tokens"] == 10
+
+    client.preload()
+    assert requests[1] == {"model": "llama3", "keep_alive": "1h"}
+
+
+def test_errors_are_returned_as_text():
+    client = use_transport(OllamaClient(), lambda request: httpx.Response(500, json={"error": "model not found"}))
+    assert client.query("q").startswith("An error occurred:")
+
+
+def test_openai_compatible_query():
+    def handler(request):
+        body = json.loads(request.content)
+        assert request.url.path.endswith("/chat/completions")
+        assert request.headers["Authorization"] == "Bearer secret"
+        content = body["messages"][0]["content"].upper()
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}], "usage": {"prompt_tokens": 3}})
+
+    client = OpenAICompatibleClient(model="qwen", base_url="http://localhost:8080/v1", api_key="secret")
+    client.http = httpx.Client(
+        base_url=client.base_url, headers=client.http.headers, transport=httpx.MockTransport(handler)
+    )
+    assert client.query_many(["a", "b", "c"]) == ["A", "B", "C"]
+    assert client.usage.prompt_tokens == 9
+
+
+def test_query_many_tunes_concurrency_up_to_server_capacity():
+    slots = threading.Semaphore(8)  # the server batches up to 8 requests at once
+
+    def handler(request):
+        with slots:
+            time.sleep(0.01)
+        return httpx.Response(200, json={"response": json.loads(request.content)["prompt"]})
+
+    client = use_transport(OllamaClient(max_concurrency=32), handler)
+    tuner = ConcurrencyTuner(initial=1, maximum=32)
+    prompts = [str(i) for i in range(200)]
+    assert client.query_many(prompts, tuner=tuner) == prompts
+    assert max(limit for limit, _ in tuner.history) >= 8
+    assert tuner.history[-1][1] > tuner.history[0][1] * 3
@@ -0,0 +1,63 @@
+from llm_orchestration_hw6.evaluation.packing import (
+    PackedEvaluator,
+    build_packed_prompt,
+    plan_packs,
+    unpack_answers,
+)
+
+
+class PackedClient:
+    def __init__(self):
+        self.prompts = []
+
+    def query(self, prompt):
+        self.prompts.append(prompt)
+        if "Answers:" in prompt:
+            # Answers question 1 and 3 but drops question 2.
+            return "1. 38\nsome chatter\nA3: Paris\n"
+        return "55"
+
+
+def test_unpack_answers_handles_numbering_styles():
+    text = "1. 38\n2) 55\nQ3: 56\n3. ignored duplicate\n5. out of range"
+    assert unpack_answers(text, 4) == ["38", "55", "56", None]
+
+
+def test_plan_packs_respects_context_window():
+    questions = ["x" * 400] * 10
+    packs = plan_packs(questions, context_window=500, answer_tokens=10)
+    assert all(len(pack) <= 4 for pack in packs)
+    assert [i for pack in packs for i in pack] == list(range(10))
+
+
+def test_packed_evaluator_falls_back_for_unparsed_items():
+    client = PackedClient()
+    questions = ["What is 15 + 23?", "What is 100 - 45?", "What is the capital of France?"]
+    results = PackedEvaluator().evaluate_many(questions, client)
+
+    assert [r["response"] for r in results] == ["38", "55", "Paris"]
+    assert [r["packed"] for r in results] == [True, False, True]
+    assert len(client.prompts) == 2
+    assert client.prompts[0] == build_packed_prompt(questions)
+
+
+class CappedClient:
+    supports_max_tokens = True
+    max_tokens = 150
+
+    def __init__(self):
+        self.max_tokens_seen = []
+
+    def query(self, prompt, max_tokens=None):
+        self.max_tokens_seen.append(max_tokens)
+        count = prompt.count("\n") - 4
+        return "\n".join(f"{i}. {i}" for i in range(1, count + 1))
+
+
+def test_packed_evaluator_requests_room_for_every_answer():
+    client = CappedClient()
+    questions = [f"What is {i} + {i}?" for i in range(40)]
+    results = PackedEvaluator(answer_tokens=16).evaluate_many(questions, client)
+
+    assert client.max_tokens_seen == [40 * 16]
+    assert all(r["packed"] for r in results)
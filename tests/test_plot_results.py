@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+import pytest
+
+from llm_orchestration_hw6.data.store import read_results, write_results
+from llm_orchestration_hw6.evaluation.aggregate import aggregate, to_long
+from llm_orchestration_hw6.evaluation.plot_results import figure_specs, plot_results_function, render_figures
+
+
+def make_long():
+    wide = pd.DataFrame({
+        "question_id": [1, 2, 16, 17],
+        "GPT_Baseline": [1.0, 0.0, 1.0, 1.0],
+        "GPT_CoT": [1.0, 1.0, 0.0, 1.0],
+        "Grok_Baseline": [0.0, 0.0, 1.0, 0.5],
+    })
+    return to_long(wide)
+
+
+def test_figure_specs_follow_the_requested_order():
+    specs = figure_specs(aggregate(make_long()), models=["Grok", "GPT"], techniques=["CoT", "Baseline"])
+
+    assert set(specs) == {
+        "accuracy_by_technique.png", "accuracy_by_model.png", "model_technique_heatmap.png",
+        "domain_performance.png", "domain_aggregate.png",
+    }
+    assert specs["accuracy_by_model.png"]["data"]["labels"] == ["Grok", "GPT"]
+    assert specs["model_technique_heatmap.png"]["data"]["values"][0] == [None, 0.375]
+
+
+def test_render_figures_skips_unchanged_figures(tmp_path):
+    specs = figure_specs(aggregate(make_long()))
+    first = render_figures(specs, str(tmp_path), dpi=50, max_workers=1)
+    assert set(first.values()) == {"rendered"}
+
+    second = render_figures(specs, str(tmp_path), dpi=50, max_workers=1)
+    assert set(second.values()) == {"unchanged"}
+
+    os.remove(tmp_path / "accuracy_by_model.png")
+    third = render_figures(specs, str(tmp_path), dpi=50, max_workers=1)
+    assert third[str(tmp_path / "accuracy_by_model.png")] == "rendered"
+    assert third[str(tmp_path / "accuracy_by_technique.png")] == "unchanged"
+
+
+def test_plot_results_function_reads_a_results_store(tmp_path):
+    store = write_results(make_long(), str(tmp_path / "store"))
+    plot_results_function(store, output_dir=str(tmp_path / "plots"), max_workers=2)
+
+    assert os.path.exists(tmp_path / "plots" / "model_technique_heatmap.png")
+    assert os.path.exists(tmp_path / "plots" / "domain_aggregate.png")
+
+
+def test_plotting_a_store_twice_leaves_the_store_readable(tmp_path):
+    store = write_results(make_long(), str(tmp_path / "store"))
+    for _ in range(2):
+        plot_results_function(store, max_workers=1)
+        assert len(read_results(store)) == len(make_long())
+
+    assert os.path.exists(tmp_path / "accuracy_by_model.png")
+    assert all(name.startswith("model=") for name in os.listdir(store))
+    with pytest.raises(ValueError):
+        plot_results_function(store, output_dir=store, max_workers=1)
@@ -0,0 +1,93 @@
+import concurrent.futures
+import json
+import time
+
+import pytest
+
+from llm_orchestration_hw6.evaluation.techniques.react_agent import ReActAgentEvaluator
+from llm_orchestration_hw6.evaluation.tools import KnowledgeBase, calculator, default_registry
+
+
+class ScriptedClient:
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.prompts = []
+
+    def query(self, prompt):
+        self.prompts.append(prompt)
+        return self.outputs.pop(0)
+
+
+def test_calculator_is_sandboxed():
+    assert calculator("144 ÷ 12") == "12"
+    assert calculator("(15 + 23) * 2") == "76"
+    with pytest.raises(ValueError):
+        calculator("__import__('os').system('ls')")
+    with pytest.raises(ValueError):
+        calculator("9 ** 9999")
+
+
+def test_calculator_rejects_huge_intermediate_results():
+    assert calculator("2 ** 100 % 7") == str(2 ** 100 % 7)
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        calculator("(((9**99)**99)**99)**99 % 7")
+    with pytest.raises(ValueError):
+        calculator("(9**99) * (9**99) * (9**99) ** 40")
+    assert time.perf_counter() - start < 1
+
+
+def test_knowledge_base_lookup(tmp_path):
+    path = tmp_path / "kb.json"
+    path.write_text(json.dumps([
+        {"question": "What is the capital of France?", "ground_truth_answer": "Paris", "tags": ["geography"]},
+        {"question": "What is 7 × 8?", "ground_truth_answer": "56", "tags": ["arithmetic"]},
+    ]))
+    kb = KnowledgeBase.from_json(str(path))
+    assert kb.lookup("capital France") == "What is the capital of France? -> Paris"
+    assert kb.lookup("zzz") == "No matching entry found."
+
+
+def test_agent_runs_tool_and_answers():
+    client = ScriptedClient([
+        "Thought: I should compute it.\nAction: calculator[15 + 23]\nObservation: 99",
+        "Thought: done.\nAnswer: 38",
+    ])
+    result = ReActAgentEvaluator(stream=False).evaluate("What is 15 + 23?", client)
+
+    assert result["response"] == "38"
+    assert result["steps"] == 2
+    assert result["stop_reason"] == "answer"
+    # The model's invented observation is dropped in favour of the real tool output.
+    assert "Observation: 38" in client.prompts[1]
+    assert "Observation: 99" not in client.prompts[1]
+
+
+def test_agent_stops_at_step_budget():
+    client = ScriptedClient(["Action: calculator[1 + 1]"] * 3)
+    result = ReActAgentEvaluator(max_steps=3, stream=False).evaluate("Loop forever?", client)
+    assert result["stop_reason"] == "max_steps"
+    assert len(client.prompts) == 3
+
+
+def test_evaluate_many_preserves_order():
+    class EchoClient:
+        def query(self, prompt):
+            return "Answer: " + prompt.rsplit("Question: ", 1)[1].strip()
+
+    agent = ReActAgentEvaluator(tools=default_registry(), stream=False)
+    results = agent.evaluate_many(["a", "b", "c"], EchoClient(), max_workers=3)
+    assert [r["response"] for r in results] == ["a", "b", "c"]
+
+
+def test_evaluate_many_defaults_to_batch_size(monkeypatch):
+    seen = []
+
+    class RecordingExecutor(concurrent.futures.ThreadPoolExecutor):
+        def __init__(self, max_workers=None):
+            seen.append(max_workers)
+            super().__init__(max_workers=max_workers)
+
+    monkeypatch.setattr(concurrent.futures, "ThreadPoolExecutor", RecordingExecutor)
+    ReActAgentEvaluator(stream=False).evaluate_many(["a"], ScriptedClient(["Answer: a"]))
+    assert seen == [10]
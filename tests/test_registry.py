@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from llm_orchestration_hw6.evaluation.registry import RunRegistry, config_hash, file_hash, parse_versions
+
+
+def aggregates(gpt_accuracy, latency=None):
+    return pd.DataFrame({
+        "model": ["GPT", "Grok"],
+        "technique": ["CoT", "CoT"],
+        "accuracy": [gpt_accuracy, 0.5],
+        "questions": [100, 100],
+        "latency_ms": [latency, None],
+    })
+
+
+def test_record_and_compare_runs(tmp_path):
+    registry = RunRegistry(str(tmp_path / "runs.sqlite"))
+    old = registry.record_run(aggregates(0.8, 100.0), created_at="2026-10-01T00:00:00+00:00", versions={"GPT": "gpt-4o"})
+    new = registry.record_run(aggregates(0.7, 150.0), created_at="2026-10-10T00:00:00+00:00")
+
+    assert registry.latest_run() == new
+    assert registry.latest_run(before="2026-10-05T00:00:00+00:00") == old
+    assert registry.latest_run(exclude=new) == old
+    assert registry.list_runs()["run_id"].tolist() == [new, old]
+
+    comparison = registry.compare(old, new, accuracy_tolerance=0.05, latency_tolerance=1.0).set_index("model")
+    assert comparison.loc["GPT", "accuracy_delta"] == pytest.approx(-0.1)
+    assert bool(comparison.loc["GPT", "regressed"])
+    assert not bool(comparison.loc["Grok", "regressed"])
+
+    # 50% slower is within a 100% latency tolerance but not within 10%.
+    assert not registry.compare(old, new, accuracy_tolerance=0.2, latency_tolerance=1.0)["regressed"].any()
+    assert registry.compare(old, new, accuracy_tolerance=0.2, latency_tolerance=0.1)["regressed"].any()
+
+    assert registry.history("GPT", "CoT")["accuracy"].tolist() == [0.7, 0.8]
+
+
+def test_hash_helpers(tmp_path):
+    path = tmp_path / "settings.yaml"
+    path.write_text("a: 1\n")
+    assert file_hash(str(path)) == file_hash(str(path))
+    assert file_hash(str(tmp_path / "missing.yaml")) is None
+    assert config_hash({"a": 1, "b": 2}) == config_hash({"b": 2, "a": 1})
+    assert parse_versions("GPT=gpt-4o, Grok=grok-2") == {"GPT": "gpt-4o", "Grok": "grok-2"}
+
+
+def test_file_hash_of_directory(tmp_path):
+    store = tmp_path / "store"
+    (store / "model=GPT").mkdir(parents=True)
+    (store / "model=GPT" / "part-0.parquet").write_bytes(b"abc")
+    (store / "model=Grok").mkdir()
+    (store / "model=Grok" / "part-0.parquet").write_bytes(b"def")
+    first = file_hash(str(store))
+    assert first == file_hash(str(store))
+    (store / "model=Grok" / "part-0.parquet").write_bytes(b"xyz")
+    assert file_hash(str(store)) != first
+    (store / "model=Grok" / "part-0.parquet").rename(store / "model=Grok" / "part-1.parquet")
+    assert file_hash(str(store)) not in (first, None)
@@ -0,0 +1,126 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from llm_orchestration_hw6.llms.providers.openai_client import OpenAIClient
+from llm_orchestration_hw6.llms.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    Bulkhead,
+    BulkheadFullError,
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderError,
+    ResilientClient,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyClient:
+    def __init__(self, failing=True, delay=0.0):
+        self.failing = failing
+        self.delay = delay
+        self.calls = 0
+
+    def query(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            return "An error occurred: 503 Service Unavailable"
+        return prompt.upper()
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = Clock()
+    breaker = CircuitBreaker(error_threshold=0.5, window=10, min_requests=4, reset_timeout=30, clock=clock)
+    for success in (True, False, True):
+        breaker.record(success)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = 31
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial request
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+    clock.now = 62
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.error_rate == 0.0
+
+
+def test_bulkhead_rejects_when_full():
+    bulkhead = Bulkhead(max_concurrent=1, max_wait=0)
+    with bulkhead:
+        with pytest.raises(BulkheadFullError):
+            with bulkhead:
+                pass
+    with bulkhead:
+        pass
+
+
+def test_resilient_client_raises_and_fails_fast():
+    client = FlakyClient()
+    resilient = ResilientClient(client, name="grok", breaker=CircuitBreaker(min_requests=2, window=4, reset_timeout=60))
+    for _ in range(2):
+        with pytest.raises(ProviderError, match="grok: An error occurred"):
+            resilient.query("q")
+    with pytest.raises(CircuitOpenError):
+        resilient.query("q")
+    assert client.calls == 2
+
+
+def test_bulkhead_isolates_slow_provider():
+    slow = ResilientClient(FlakyClient(failing=False, delay=0.2), bulkhead=Bulkhead(max_concurrent=1, max_wait=0))
+    thread = threading.Thread(target=slow.query, args=("a",))
+    thread.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    with pytest.raises(BulkheadFullError):
+        slow.query("b")
+    assert time.perf_counter() - start < 0.1
+    thread.join()
+
+
+def test_query_many_queues_skipped_items_for_retry():
+    clock = Clock()
+    client = FlakyClient()
+    resilient = ResilientClient(
+        client,
+        breaker=CircuitBreaker(min_requests=3, window=5, reset_timeout=10, clock=clock),
+        bulkhead=Bulkhead(max_concurrent=1),
+    )
+    prompts = [f"q{i}" for i in range(6)]
+    results = resilient.query_many(prompts)
+    assert results == [None] * 6
+    assert client.calls == 3  # the rest were rejected by the open circuit
+    assert sorted(index for index, _, _ in resilient.skipped) == list(range(6))
+
+    client.failing = False
+    clock.now = 11
+    resilient.retry_skipped(results)
+    assert results == [p.upper() for p in prompts]
+    assert not resilient.skipped
+
+
+def test_openai_client_can_raise_errors():
+    with mock.patch("llm_orchestration_hw6.llms.providers.openai_client.OpenAI") as openai:
+        openai.return_value.completions.create.side_effect = TimeoutError("timed out")
+        assert OpenAIClient(api_key="key").query("q") == "An error occurred: timed out"
+        with pytest.raises(TimeoutError):
+            OpenAIClient(api_key="key", raise_errors=True).query("q")
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from llm_orchestration_hw6.llms.router import ProviderRouter, is_error_response
+
+
+class FakeBackend:
+    def __init__(self, delay, response="42", fail=False):
+        self.delay = delay
+        self.response = response
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def query(self, prompt, **kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            return "An error occurred: 503 Service Unavailable"
+        return self.response
+
+
+def test_is_error_response():
+    assert is_error_response("An error occurred: timeout")
+    assert not is_error_response("42")
+
+
+def test_routes_to_faster_backend():
+    fast, slow = FakeBackend(0.001, "fast"), FakeBackend(0.03, "slow")
+    with ProviderRouter({"fast": fast, "slow": slow}, max_workers=4) as router:
+        answers = [router.query("q") for _ in range(10)]
+        stats = router.stats()
+    assert slow.calls == 1  # tried once while it had no history
+    assert answers.count("fast") == 9
+    assert stats["fast"]["latency_ewma_s"] < stats["slow"]["latency_ewma_s"]
+
+
+def test_cost_breaks_ties():
+    cheap, expensive = FakeBackend(0.0, "cheap"), FakeBackend(0.0, "expensive")
+    with ProviderRouter({"expensive": expensive, "cheap": cheap}, costs={"expensive": 1.0}) as router:
+        assert router.query("q") == "cheap"
+
+
+def test_failover_on_error_and_error_rate():
+    broken, healthy = FakeBackend(0.0, fail=True), FakeBackend(0.005, "ok")
+    with ProviderRouter({"broken": broken, "healthy": healthy}, costs={"healthy": 0.01}) as router:
+        assert router.query("q") == "ok"
+        assert router.stats()["broken"]["error_rate"] > 0
+    with ProviderRouter({"broken": broken}, failover=True) as router:
+        assert is_error_response(router.query("q"))
+
+
+def test_hedges_slow_request():
+    backends = {"a": FakeBackend(0.01, "a"), "b": FakeBackend(0.01, "b")}
+    with ProviderRouter(backends, hedge=True, min_samples=1) as router:
+        for _ in range(6):
+            router.query("q")
+        primary = router.select()
+        backends[primary].delay = 0.5
+        start = time.perf_counter()
+        answer = router.query("q")
+        elapsed = time.perf_counter() - start
+        assert router.stats()[primary]["hedges"] == 1
+    assert answer != primary
+    assert elapsed < 0.3
+
+
+def test_requires_backends():
+    with pytest.raises(ValueError):
+        ProviderRouter({})
+
+
+def test_backend_failing_from_the_start_is_avoided():
+    dead, healthy = FakeBackend(0.0, fail=True), FakeBackend(0.001, "ok")
+    with ProviderRouter({"dead": dead, "healthy": healthy}) as router:
+        answers = [router.query("q") for _ in range(20)]
+    assert answers == ["ok"] * 20
+    assert dead.calls == 1
+
+
+def test_concurrent_requests_spread_over_fresh_backends():
+    backends = {name: FakeBackend(0.05, name) for name in "abc"}
+    with ProviderRouter(backends, max_workers=30) as router:
+        threads = [threading.Thread(target=router.query, args=("q",)) for _ in range(30)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    calls = [backend.calls for backend in backends.values()]
+    assert sum(calls) == 30
+    assert min(calls) >= 8
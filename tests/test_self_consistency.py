@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+from unittest import mock
+
+from llm_orchestration_hw6.evaluation.techniques.self_consistency import (
+    SelfConsistencyEvaluator,
+    is_decided,
+    normalize_answer,
+)
+from llm_orchestration_hw6.llms.providers.openai_client import OpenAIClient
+
+
+class ScriptedClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def query(self, prompt):
+        time.sleep(0.05)
+        with self.lock:
+            self.calls += 1
+            return self.responses.pop(0)
+
+
+def test_normalize_answer():
+    assert normalize_answer(" 38.0 ") == "38"
+    assert normalize_answer("Paris.") == "paris"
+    assert normalize_answer("1,000") == "1000"
+
+
+def test_is_decided():
+    assert is_decided(Counter({"38": 3}), remaining=2)
+    assert not is_decided(Counter({"38": 2, "39": 1}), remaining=2)
+
+
+def test_majority_vote_stops_early():
+    client = ScriptedClient(["Step 1\nAnswer: 38", "Answer: 38.0", "Answer: 38", "Answer: 12", "Answer: 12"])
+    evaluator = SelfConsistencyEvaluator(samples=5, max_workers=1)
+    result = evaluator.evaluate("What is 15 + 23?", client)
+
+    assert result["response"] == "38"
+    assert result["votes"] == {"38": 3}
+    # The fourth sample may already be running when the vote is decided; the fifth never starts.
+    assert client.calls <= 4
+
+
+def test_provider_n_sampling():
+    class NClient:
+        def query_samples(self, prompt, n):
+            return ["Answer: Paris", "Answer: paris", "Answer: Lyon"][:n]
+
+    result = SelfConsistencyEvaluator(samples=3, use_provider_n=True).evaluate("Capital of France?", NClient())
+    assert result["response"] == "Paris"
+    assert result["votes"] == {"paris": 2, "lyon": 1}
+
+
+class RecordingCompletions:
+    def __init__(self):
+        self.temperatures = []
+
+    def create(self, **kwargs):
+        self.temperatures.append(kwargs["temperature"])
+        choices = [SimpleNamespace(text="Answer: 38")] * kwargs.get("n", 1)
+        if kwargs.get("stream"):
+            return mock.MagicMock(__iter__=lambda self: iter([SimpleNamespace(choices=choices, usage=None)]))
+        return SimpleNamespace(choices=choices, usage=None)
+
+
+def test_sampling_temperature_reaches_the_client():
+    client = OpenAIClient(api_key="key")
+    completions = RecordingCompletions()
+    client.client = SimpleNamespace(completions=completions)
+
+    SelfConsistencyEvaluator(samples=3).evaluate("What is 15 + 23?", client)
+    SelfConsistencyEvaluator(samples=3, stream=True).evaluate("What is 15 + 23?", client)
+    assert set(completions.temperatures) == {0.7}
+
+    completions.temperatures.clear()
+    SelfConsistencyEvaluator(samples=3, use_provider_n=True, temperature=0.9).evaluate("What is 15 + 23?", client)
+    client.query("What is 15 + 23?")
+    assert completions.temperatures == [0.9, client.temperature]
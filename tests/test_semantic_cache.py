@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from llm_orchestration_hw6.evaluation.metrics import encoders
+from llm_orchestration_hw6.evaluation.metrics.encoders import HashingEncoder
+from llm_orchestration_hw6.evaluation.techniques.baseline import BaselineEvaluator
+from llm_orchestration_hw6.evaluation.techniques.few_shot import FewShotEvaluator
+from llm_orchestration_hw6.llms.semantic_cache import SemanticCacheClient, VectorIndex, numbers_in
+
+
+class EchoClient:
+    model = "echo"
+
+    def __init__(self, prefix="answer to "):
+        self.prefix = prefix
+        self.prompts = []
+
+    def query(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.prefix + prompt
+
+
+def make_cache(client, **kwargs):
+    kwargs.setdefault("audit_rate", 0)
+    return SemanticCacheClient(client, encoder=HashingEncoder(), threshold=0.8, **kwargs)
+
+
+def test_near_duplicate_is_answered_from_cache():
+    client = EchoClient()
+    cache = make_cache(client)
+    first = cache.query("Question: What is the capital of France?\nAnswer:")
+    second = cache.query("Question: what is the capital of  France ?\nAnswer:")
+    assert second == first
+    assert len(client.prompts) == 1
+    assert cache.is_hit("Question: what is the capital of  France ?\nAnswer:")
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_different_numbers_never_match():
+    client = EchoClient()
+    cache = make_cache(client)
+    cache.query("Question: What is 7 times 8?\nAnswer:")
+    assert cache.query("Question: What is 7 times 9?\nAnswer:").endswith("7 times 9?\nAnswer:")
+    assert len(client.prompts) == 2
+    assert numbers_in("7 times 8.5") == ("7", "8.5")
+
+
+def test_dissimilar_prompts_miss():
+    client = EchoClient()
+    cache = make_cache(client)
+    cache.query("Who wrote Hamlet?")
+    cache.query("What is the boiling point of water in Kelvin?")
+    assert len(client.prompts) == 2
+    assert cache.stats()["hits"] == 0
+
+
+def test_error_responses_are_not_stored():
+    cache = make_cache(EchoClient(prefix="An error occurred: "))
+    cache.query("Who wrote Hamlet?")
+    cache.query("Who wrote Hamlet?")
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_is_partitioned_by_model():
+    client = EchoClient()
+    cache = make_cache(client)
+    cache.query("Who wrote Hamlet?")
+    client.model = "other"
+    cache.query("Who wrote Hamlet?")
+    assert len(client.prompts) == 2
+
+
+def test_audits_measure_disagreement():
+    client = EchoClient()
+    cache = make_cache(client, audit_rate=1.0)
+    cache.query("Who wrote Hamlet?")
+    client.prefix = "changed "
+    assert cache.query("Who wrote Hamlet?") == "answer to Who wrote Hamlet?"
+    stats = cache.stats()
+    assert stats["audits"] == 1
+    assert stats["disagreement_rate"] == 1.0
+
+
+def test_accuracy_impact_splits_hits_and_misses():
+    cache = make_cache(EchoClient())
+    cache.query("Who wrote Hamlet?")
+    cache.query("Who wrote Hamlet?")
+    cache.query("What is the boiling point of water?")
+    impact = cache.accuracy_impact([("Who wrote Hamlet?", True), ("What is the boiling point of water?", False)])
+    assert impact == {"hit_accuracy": 1.0, "miss_accuracy": 0.0}
+
+
+def test_shared_prompt_prefix_does_not_make_questions_match():
+    client = EchoClient()
+    cache = make_cache(client)
+    evaluator = FewShotEvaluator()
+    france = evaluator.evaluate("What is the capital of France?", cache)
+    spain = evaluator.evaluate("What is the capital of Spain?", cache)
+    assert len(client.prompts) == 2
+    assert spain["response"] != france["response"]
+    assert evaluator.evaluate("what is the capital of  France ?", cache)["response"] == france["response"]
+    assert cache.is_hit("what is the capital of  France ?")
+
+
+def test_same_question_is_cached_per_technique():
+    client = EchoClient()
+    cache = make_cache(client)
+    FewShotEvaluator().evaluate("Who wrote Hamlet?", cache)
+    BaselineEvaluator().evaluate("Who wrote Hamlet?", cache)
+    assert len(client.prompts) == 2
+
+
+def test_streaming_evaluators_go_through_the_cache():
+    class StreamingClient(EchoClient):
+        def stream_query(self, prompt, **kwargs):
+            raise AssertionError("streamed requests would bypass the cache")
+
+    client = StreamingClient()
+    cache = make_cache(client)
+    evaluator = FewShotEvaluator(stream=True)
+    first = evaluator.evaluate("Who wrote Hamlet?", cache)["response"]
+    assert evaluator.evaluate("Who wrote Hamlet?", cache)["response"] == first
+    assert len(client.prompts) == 1
+    assert not hasattr(cache, "stream_query")
+
+
+def test_hashing_fallback_is_refused(monkeypatch):
+    def fail(self):
+        raise OSError("model not available offline")
+
+    monkeypatch.setattr(encoders.SentenceTransformerEncoder, "load", fail)
+    with pytest.raises(OSError):
+        SemanticCacheClient(EchoClient(), encoder=None)
+
+
+def test_vector_index_overwrites_oldest_when_full():
+    index = VectorIndex(max_entries=2)
+    for i in range(3):
+        vector = np.zeros(4, dtype=np.float32)
+        vector[i] = 1.0
+        index.add(vector, (str(i), str(i), ()))
+    assert len(index) == 2
+    assert index.search(np.array([1, 0, 0, 0], dtype=np.float32), 0.5) == []
+    assert index.search(np.array([0, 0, 1, 0], dtype=np.float32), 0.5) == [(1.0, 0)]
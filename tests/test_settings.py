@@ -0,0 +1,63 @@
+import pytest
+
+from llm_orchestration_hw6.config import settings as settings_module
+from llm_orchestration_hw6.config.settings import configure, get_settings, load_settings, parse_overrides
+
+
+def test_packaged_defaults():
+    settings = load_settings(environ={})
+    assert settings.evaluation.batch_size == 10
+    assert settings.openai.timeout_seconds == 60.0
+    assert settings.plotting.figsize == [12, 8]
+    assert settings.performance.max_workers is None
+    assert settings.performance.grading_chunk_rows == 100_000
+
+
+def test_env_and_explicit_overrides():
+    environ = {"LLM_HW6__EVALUATION__BATCH_SIZE": "20", "LLM_HW6__PERFORMANCE__MAX_WORKERS": "4"}
+    settings = load_settings(environ=environ, overrides={"evaluation.batch_size": "30", "log_level": "DEBUG"})
+    assert settings.evaluation.batch_size == 30
+    assert settings.performance.max_workers == 4
+    assert settings.log_level == "DEBUG"
+
+
+def test_settings_path(tmp_path):
+    path = tmp_path / "settings.yaml"
+    path.write_text("plotting:\n  dpi: 72\n")
+    settings = load_settings(environ={"LLM_HW6_SETTINGS": str(path)})
+    assert settings.plotting.dpi == 72
+    assert settings.evaluation.batch_size == 10
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError, match="evaluation.batch_sise"):
+        load_settings(environ={}, overrides={"evaluation.batch_sise": "20"})
+    with pytest.raises(ValueError, match="evaluation.batch_size"):
+        load_settings(environ={}, overrides={"evaluation.batch_size": "many"})
+    with pytest.raises(ValueError, match="KEY=VALUE"):
+        parse_overrides(["evaluation.batch_size"])
+
+
+def test_get_settings_is_memoized_until_configured(monkeypatch):
+    monkeypatch.setattr(settings_module, "_cli_overrides", {})
+    get_settings.cache_clear()
+    assert get_settings() is get_settings()
+    try:
+        assert configure(overrides={"performance.bootstrap_resamples": "500"}).performance.bootstrap_resamples == 500
+        assert get_settings().performance.bootstrap_resamples == 500
+    finally:
+        configure()
+
+
+def test_clients_and_encoders_read_their_defaults(monkeypatch):
+    from llm_orchestration_hw6.evaluation.metrics.encoders import OnnxEncoder
+    from llm_orchestration_hw6.llms.providers.openai_client import OpenAIClient
+
+    monkeypatch.setattr(settings_module, "_cli_overrides", {})
+    try:
+        configure(overrides={"cache_dir": "/tmp/llm-cache", "openai.default_max_tokens": "64"})
+        client = OpenAIClient(api_key="key")
+        assert (client.model, client.max_tokens) == ("gpt-3.5-turbo-instruct", 64)
+        assert OnnxEncoder("m").model_dir == "/tmp/llm-cache/onnx/m"
+    finally:
+        configure()
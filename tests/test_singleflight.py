@@ -0,0 +1,80 @@
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from llm_orchestration_hw6.evaluation.techniques.cot import CoTEvaluator
+from llm_orchestration_hw6.llms.singleflight import SingleFlight, SingleFlightClient
+
+
+class SlowClient:
+    model = "llama3"
+    max_tokens = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.usage = "usage"
+
+    def query(self, prompt, **kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.1)
+        if prompt == "boom":
+            raise RuntimeError("boom")
+        return prompt.upper()
+
+
+def test_concurrent_identical_requests_are_sent_once():
+    client = SlowClient()
+    single = SingleFlightClient(client)
+    prompts = ["a"] * 8 + ["b"] * 4
+    with concurrent.futures.ThreadPoolExecutor(max_workers=12) as executor:
+        answers = list(executor.map(single.query, prompts))
+    assert answers == [p.upper() for p in prompts]
+    assert client.calls == 2
+    assert single.flight.coalesced == 10
+    assert single.usage == "usage"
+
+
+def test_parameters_are_part_of_the_key():
+    client = SlowClient()
+    single = SingleFlightClient(client)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda kw: single.query("a", **kw), [{}, {"cache_prefix": "x"}]))
+    assert client.calls == 2
+
+
+def test_completed_calls_are_not_cached():
+    client = SlowClient()
+    single = SingleFlightClient(client)
+    single.query("a")
+    single.query("a")
+    assert client.calls == 2
+
+
+def test_errors_are_shared_with_waiters():
+    flight = SingleFlight()
+    client = SlowClient()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(flight.do, "k", lambda: client.query("boom")) for _ in range(3)]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+    assert client.calls == 1
+
+
+def test_streaming_evaluators_are_coalesced():
+    class StreamingClient(SlowClient):
+        def stream_query(self, prompt, **kwargs):
+            raise AssertionError("streamed requests would not be coalesced")
+
+    client = StreamingClient()
+    single = SingleFlightClient(client)
+    evaluator = CoTEvaluator(stream=True)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda q: evaluator.evaluate(q, single), ["What is 2+2?"] * 4))
+    assert len({r["response"] for r in results}) == 1
+    assert client.calls == 1
+    assert not hasattr(single, "stream_query")
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from llm_orchestration_hw6.evaluation.stats import (
+    bootstrap_ci,
+    mcnemar_test,
+    paired_permutation_test,
+    pairwise_tests,
+)
+
+
+def test_bootstrap_ci_brackets_the_mean():
+    scores = np.array([1.0] * 60 + [0.0] * 40)
+    mean, lower, upper = bootstrap_ci(scores, n_resamples=2000)
+    assert mean == 0.6
+    assert 0.45 < lower < 0.6 < upper < 0.75
+
+
+def test_bootstrap_ci_constant_columns():
+    ci = bootstrap_ci(np.column_stack([np.ones(10), np.zeros(10)]), n_resamples=500)
+    assert ci.tolist() == [[1.0, 1.0, 1.0], [0.0, 0.0, 0.0]]
+
+
+def test_permutation_test_detects_large_difference():
+    a = np.ones(50)
+    b = np.zeros(50)
+    assert paired_permutation_test(a, b, n_permutations=2000) < 0.01
+    assert paired_permutation_test(a, a) == 1.0
+
+
+def test_mcnemar_exact_p_value():
+    a = np.array([1, 1, 1, 1, 0, 1])
+    b = np.array([0, 0, 0, 0, 0, 1])
+    only_a, only_b, p = mcnemar_test(a, b)
+    assert (only_a, only_b) == (4, 0)
+    assert p == 2 * (1 / 16)
+
+
+def test_pairwise_tests_covers_every_pair():
+    long_df = pd.DataFrame({
+        "question_id": list(range(4)) * 3,
+        "model": ["GPT"] * 12,
+        "technique": ["Baseline"] * 4 + ["CoT"] * 4 + ["ReACT"] * 4,
+        "score": [1, 1, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0],
+    })
+    tests = pairwise_tests(long_df, n_permutations=200)
+    assert len(tests) == 3
+    row = tests[(tests["technique_a"] == "Baseline") & (tests["technique_b"] == "CoT")].iloc[0]
+    assert row["mean_diff"] == -0.5
+    assert row["only_b_correct"] == 2
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from llm_orchestration_hw6.data.store import iter_combinations, list_combinations, read_results, write_results
+from llm_orchestration_hw6.evaluation.aggregate import load_scores, to_long
+
+
+def make_long():
+    wide = pd.DataFrame({
+        "question_id": [1, 2, 3],
+        "GPT_Baseline": [1.0, 0.0, 1.0],
+        "GPT_CoT": [1.0, 1.0, 1.0],
+        "Grok_Baseline": [0.0, 0.0, 1.0],
+    })
+    return to_long(wide)
+
+
+def test_read_results_prunes_partitions_and_columns(tmp_path):
+    root = write_results(make_long(), str(tmp_path / "store"))
+
+    assert list_combinations(root) == [("GPT", "Baseline"), ("GPT", "CoT"), ("Grok", "Baseline")]
+
+    one = read_results(root, models=["GPT"], techniques=["CoT"], columns=["question_id", "score"])
+    assert one.columns.tolist() == ["question_id", "score"]
+    assert one["score"].tolist() == [1.0, 1.0, 1.0]
+
+    full = read_results(root)
+    assert len(full) == 9
+    assert full["model"].dtype == "category"
+
+
+def test_write_results_replaces_only_written_partitions(tmp_path):
+    root = str(tmp_path / "store")
+    long_df = make_long()
+    write_results(long_df, root)
+    update = long_df[long_df["model"] == "Grok"].assign(score=1.0)
+    write_results(update, root)
+
+    scores = read_results(root).groupby(["model", "technique"], observed=True)["score"].sum()
+    assert scores[("Grok", "Baseline")] == 3.0
+    assert scores[("GPT", "Baseline")] == 2.0
+    assert len(read_results(root)) == 9
+
+
+def test_iter_combinations_and_load_scores(tmp_path):
+    root = write_results(make_long(), str(tmp_path / "store"))
+
+    sizes = {key: len(df) for key, df in iter_combinations(root, columns=["score"])}
+    assert sizes == {("GPT", "Baseline"): 3, ("GPT", "CoT"): 3, ("Grok", "Baseline"): 3}
+    assert len(load_scores(root)) == 9
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from llm_orchestration_hw6.evaluation.techniques.cot import CoTEvaluator
+from llm_orchestration_hw6.llms.providers.openai_client import OpenAIClient
+from llm_orchestration_hw6.llms.streaming import IncrementalAnswerExtractor, consume_stream, stop_on_answer
+
+
+class FakeStream:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for token in self.tokens:
+            self.consumed += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(text=token)])
+
+    def close(self):
+        self.closed = True
+
+
+def test_extractor_waits_for_complete_answer_line():
+    extractor = IncrementalAnswerExtractor()
+    assert extractor.feed("Step 1: 15 + 23\nAnswer: 3") is None
+    assert extractor.feed("8\nmore text") == "38"
+
+
+def test_extractor_finish_flushes_partial_line():
+    extractor = IncrementalAnswerExtractor()
+    stopped = consume_stream(["Step 1\n", "Answer: Paris"], extractor, stop_on_answer)
+    assert not stopped
+    assert extractor.answer == "Paris"
+
+
+def test_stream_query_cancels_after_answer():
+    client = OpenAIClient(api_key="test")
+    stream = FakeStream(["Step 1: add\n", "Answer: 38\n", "Step 3: padding\n", "more\n"])
+    client.client = SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: stream))
+
+    evaluator = CoTEvaluator(stream=True)
+    result = evaluator.evaluate("What is 15 + 23?", client)
+
+    assert result["response"] == "Step 1: add\nAnswer: 38"
+    assert stream.consumed == 2
+    assert stream.closed
@@ -38,3 +38,35 @@ def test_react_evaluator():
     assert "Act: ..." in result["prompt"]
     assert "Observe: ..." in result["prompt"]
     assert "Answer:" in result["prompt"]
+
+class CachingClient:
+    supports_prompt_cache = True
+
+    def __init__(self):
+        self.calls = []
+
+    def query(self, prompt, cache_prefix=None):
+        self.calls.append((prompt, cache_prefix))
+        return "4"
+
+def test_static_prefix_is_marked_for_prompt_caching():
+    client = CachingClient()
+    for evaluator in (FewShotEvaluator(), ReActEvaluator()):
+        evaluator.evaluate("What is 1+3?", client)
+        evaluator.evaluate("What is 2+2?", client)
+    for prompt, cache_prefix in client.calls:
+        assert cache_prefix
+        assert prompt.startswith(cache_prefix)
+    assert client.calls[0][1] == client.calls[1][1]
+    assert client.calls[2][1] == client.calls[3][1]
+
+def test_usage_tracker_counts_cached_tokens():
+    from types import SimpleNamespace
+    from llm_orchestration_hw6.llms.usage import UsageTracker
+
+    tracker = UsageTracker()
+    tracker.record(SimpleNamespace(prompt_tokens=100, completion_tokens=5,
+                                   prompt_tokens_details=SimpleNamespace(cached_tokens=80)))
+    tracker.record(SimpleNamespace(prompt_tokens=100, completion_tokens=5, prompt_tokens_details=None))
+    assert tracker.cached_tokens == 80
+    assert tracker.cache_hit_rate == 0.4
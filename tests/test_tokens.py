@@ -0,0 +1,93 @@
+import pytest
+
+from llm_orchestration_hw6.evaluation.techniques.few_shot import FewShotEvaluator
+from llm_orchestration_hw6.llms.tokens import (
+    MaxTokensEstimator,
+    context_window,
+    count_tokens,
+    fit_examples,
+    fit_max_tokens,
+)
+
+
+def test_context_window_uses_longest_prefix():
+    assert context_window("gpt-4o-mini") == 128_000
+    assert context_window("gpt-4-0613") == 8_192
+    assert context_window("unknown-model") == 4_096
+
+
+def test_count_tokens_is_positive_and_monotonic():
+    short, long = count_tokens("What is 2+2?"), count_tokens("What is 2+2? " * 50)
+    assert 0 < short < long
+
+
+def test_fit_max_tokens_caps_to_context_window():
+    prompt = "word " * 1000
+    available = context_window("text-davinci-003") - count_tokens(prompt, "text-davinci-003")
+    assert fit_max_tokens(prompt, 150, "text-davinci-003") == 150
+    assert fit_max_tokens(prompt, 10_000, "text-davinci-003") == available
+    with pytest.raises(ValueError):
+        fit_max_tokens("word " * 50_000, 150, "text-davinci-003")
+
+
+def test_fit_examples_keeps_leading_examples():
+    examples = ["a " * 10, "b " * 10, "c " * 10]
+    budget = count_tokens(examples[0]) + count_tokens(examples[1])
+    assert fit_examples(examples, budget) == examples[:2]
+    assert fit_examples(examples, 0) == []
+
+
+def test_few_shot_examples_trimmed_to_budget():
+    examples = [(f"Question number {i} about something long?", str(i)) for i in range(20)]
+    full = FewShotEvaluator(examples=examples).evaluate("What is 3+3?")["prompt"]
+    evaluator = FewShotEvaluator(examples=examples, max_prompt_tokens=120)
+    prompt = evaluator.evaluate("What is 3+3?")["prompt"]
+    assert count_tokens(prompt) <= 120 < count_tokens(full)
+    assert "Q: Question number 0" in prompt
+    assert prompt.endswith("Question: What is 3+3?\nAnswer:")
+
+
+def test_max_tokens_estimator():
+    estimator = MaxTokensEstimator(min_samples=10, margin=1.0)
+    assert estimator.estimate("Baseline", 150) == 150
+    for length in range(1, 101):
+        estimator.observe("Baseline", length)
+    assert estimator.estimate("Baseline", 150) == 96
+    assert estimator.estimate("CoT", 500) == 500
+
+
+class SizedClient:
+    supports_max_tokens = True
+    max_tokens = 150
+
+    def __init__(self):
+        self.requested = []
+
+    def query(self, prompt, max_tokens=None):
+        self.requested.append(max_tokens)
+        return "4"
+
+
+def test_evaluator_sizes_max_tokens_from_observed_outputs():
+    client = SizedClient()
+    evaluator = FewShotEvaluator(max_tokens_estimator=MaxTokensEstimator(min_samples=3))
+    for _ in range(5):
+        evaluator.evaluate("What is 2+2?", client)
+    assert client.requested[:3] == [150, 150, 150]
+    assert client.requested[-1] == 16
+
+
+def test_evaluator_grows_estimate_on_truncation_and_skips_errors():
+    class TruncatingClient(SizedClient):
+        def query(self, prompt, max_tokens=None):
+            self.requested.append(max_tokens)
+            if len(self.requested) == 1:
+                return "An error occurred: timeout"
+            return "word " * max_tokens
+
+    client = TruncatingClient()
+    estimator = MaxTokensEstimator(min_samples=1, margin=1.0)
+    evaluator = FewShotEvaluator(max_tokens_estimator=estimator)
+    for _ in range(3):
+        evaluator.evaluate("What is 2+2?", client)
+    assert client.requested == [150, 150, 2 * count_tokens("word " * 150)]